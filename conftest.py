@@ -55,6 +55,13 @@ def pytest_addoption(parser):
         default=['file'],
         help=("Test databases in the list. List items can include: " + db_names +
               ". Note that travis-ci will test all of them by default."))
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        dest="benchmark_save",
+        help="Save the timings of the micro-benchmarks as their new baselines " +
+        "rather than comparing with the stored ones.")
 
 
 def pytest_collection_modifyitems(config, items):
@@ -4,7 +4,9 @@
 from serial.tools.list_ports import comports as list_comports
 
 import sys
+import threading
 
+from pocs.utils import error
 from pocs.utils.database import PanDB
 from pocs.utils.config import load_config
 from pocs.utils.logger import get_root_logger
@@ -17,6 +19,12 @@ class ArduinoSerialMonitor(object):
 
     Checks for the `camera_box` and `computer_box` entries in the config and tries to connect.
     Values are updated in the mongo db.
+
+    Once `start` is called each board is read by its own thread, so boards reporting at
+    different rates don't hold each other up. Each reading is stored in the collection
+    named after the board (e.g. `camera_board`) as it arrives and the latest reading from
+    every board is stored in the `environment` collection every `environment.interval`
+    seconds (see `capture`).
     """
 
     def __init__(self, auto_detect=False, *args, **kwargs):
@@ -29,10 +37,18 @@ class ArduinoSerialMonitor(object):
 
         self.db = None
         self.messaging = None
+        self._messaging_lock = threading.Lock()
 
         # Store each serial reader
         self.serial_readers = dict()
 
+        # Latest reading from each board, filled in by the reader threads.
+        self._latest = dict()
+        self._latest_lock = threading.Lock()
+        self._threads = list()
+        self._stop = threading.Event()
+        self._interval = self.config['environment'].get('interval', 2.)
+
         if auto_detect or self.config['environment'].get('auto_detect', False):
             self.logger.debug('Performing auto-detect')
             for (sensor_name, serial_reader) in auto_detect_arduino_devices(logger=self.logger):
@@ -57,6 +73,11 @@ class ArduinoSerialMonitor(object):
                     'port': port,
                 }
 
+        # Only the newest report from each board is of interest, skip over any backlog.
+        for reader_info in self.serial_readers.values():
+            if reader_info['reader']:
+                reader_info['reader'].latest_only = True
+
     def _connect_serial(self, port):
         self.logger.debug('Attempting to connect to serial port: {}'.format(port))
         serial_reader = SerialData(port=port, baudrate=9600)
@@ -69,26 +90,90 @@ class ArduinoSerialMonitor(object):
             return None
 
     def disconnect(self):
+        self.stop()
         for sensor_name, reader_info in self.serial_readers.items():
             reader = reader_info['reader']
-            reader.stop()
+            if reader:
+                reader.disconnect()
 
     def send_message(self, msg, topic='environment'):
-        if self.messaging is None:
-            self.messaging = PanMessaging.create_publisher(6510)
+        with self._messaging_lock:
+            if self.messaging is None:
+                self.messaging = PanMessaging.create_publisher(6510)
+
+            self.messaging.send_message(topic, msg)
+
+    @property
+    def is_running(self):
+        """ bool: Whether the reader threads have been started. """
+        return len(self._threads) > 0
+
+    @property
+    def latest(self):
+        """ dict: Copy of the latest reading from each board, keyed by sensor name. """
+        with self._latest_lock:
+            return dict(self._latest)
+
+    def start(self, interval=None, store_result=True, send_message=True):
+        """Start a reader thread for each board plus the `environment` aggregator.
+
+        Args:
+            interval (float, optional): Seconds between `environment` entries,
+                defaults to the `environment.interval` config item or 2 seconds.
+            store_result (bool, optional): Store readings in the db, default True.
+            send_message (bool, optional): Publish each reading on the `environment`
+                topic, default True.
+        """
+        if self.is_running:
+            return
+
+        if interval is not None:
+            self._interval = interval
 
-        self.messaging.send_message(topic, msg)
+        if store_result and self.db is None:
+            self.db = PanDB()
+
+        self._stop.clear()
+        for sensor_name, reader_info in self.serial_readers.items():
+            if not reader_info['reader']:
+                continue
+            thread = threading.Thread(target=self._read_board,
+                                      name='ArduinoReader-{}'.format(sensor_name),
+                                      args=(sensor_name, reader_info['reader']),
+                                      kwargs=dict(store_result=store_result,
+                                                  send_message=send_message),
+                                      daemon=True)
+            self._threads.append(thread)
+
+        if store_result:
+            self._threads.append(threading.Thread(target=self._store_environment,
+                                                  name='ArduinoEnvironment',
+                                                  daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """ Stop the reader threads, if running. """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = list()
 
     def capture(self, store_result=True, send_message=True):
         """
         Helper function to return serial sensor info.
 
-        Reads each of the connected sensors. If a value is received, attempts
-        to parse the value as json.
+        If the reader threads are running (see `start`) this returns the latest
+        reading from each board without blocking, they take care of storing and
+        sending the readings. Otherwise reads each of the connected sensors. If a
+        value is received, attempts to parse the value as json.
 
         Returns:
             sensor_data (dict):     Dictionary of sensors keyed by sensor name.
         """
+        if self.is_running:
+            return self.latest
 
         # Read from all the readers; we send messages with sensor data immediately, but accumulate
         # data from all sensors before storing in the db.
@@ -96,40 +181,91 @@ class ArduinoSerialMonitor(object):
         # as the OS or PySerial object may have a backlog, and especially because we are reading
         # these in lock step; if one produces a report every 1.9 seconds, and the other every 2.1
         # seconds, then we will generally wait an extra 0.2 seconds on each loop relative to the
-        # rate at which the fast one is producing output, For this reason, we really need to split
-        # these into two separate threads and probably two seperate Mongo collections (e.g. not
-        # 'environment' but 'camera_board' and 'telemetry_board').
+        # rate at which the fast one is producing output. Use `start` to read each board in its
+        # own thread instead.
+        if store_result and self.db is None:
+            self.db = PanDB()
+
         sensor_data = dict()
         for sensor_name, reader_info in self.serial_readers.items():
             reader = reader_info['reader']
 
             self.logger.debug('ArduinoSerialMonitor.capture reading sensor {}', sensor_name)
             try:
-                reading = reader.get_and_parse_reading()
-                if not reading:
-                    self.logger.debug('Unable to get reading from {}', sensor_name)
+                data = self._get_reading(sensor_name, reader)
+                if data is None:
                     continue
-                self.logger.debug('Got sensor_value from {}', sensor_name)
-                time_stamp, data = reading
-                data['date'] = time_stamp
                 sensor_data[sensor_name] = data
-                if send_message:
-                    self.send_message({'data': data}, topic='environment')
-
-                # Make a separate power entry
-                if 'power' in data:
-                    self.db.insert_current('power', data['power'])
-
+                self._handle_reading(sensor_name, data, store_result=store_result,
+                                     send_message=send_message, store_board=False)
             except Exception as e:
                 self.logger.warning('Exception while reading from sensor {}: {}', sensor_name, e)
 
         if store_result and len(sensor_data) > 0:
-            if self.db is None:
-                self.db = PanDB()
             self.db.insert_current('environment', sensor_data)
 
         return sensor_data
 
+    def _get_reading(self, sensor_name, reader):
+        """ Read a report from the board, returns None if there isn't one. """
+        reading = reader.get_and_parse_reading()
+        if not reading:
+            self.logger.debug('Unable to get reading from {}', sensor_name)
+            return None
+        self.logger.debug('Got sensor_value from {} (lag {:.2f} s, {} lines dropped)',
+                          sensor_name, reader.read_lag, reader.lines_dropped)
+        time_stamp, data = reading
+        data['date'] = time_stamp
+        return data
+
+    def _handle_reading(self, sensor_name, data, store_result=True, send_message=True,
+                        store_board=True):
+        """ Send and store a reading from a board. """
+        if send_message:
+            self.send_message({'data': data}, topic='environment')
+            # Publish power separately too, for the POCS safety monitor.
+            if 'power' in data:
+                self.send_message({'data': data['power']}, topic='power')
+
+        if not store_result:
+            return
+
+        # Make a separate power entry
+        if 'power' in data:
+            self.db.insert_current('power', data['power'])
+
+        if store_board:
+            collection = data.get('name', sensor_name)
+            try:
+                self.db.insert_current(collection, data)
+            except error.InvalidCollection:
+                self.logger.debug('No collection for board {}, not storing', collection)
+
+    def _read_board(self, sensor_name, reader, store_result=True, send_message=True):
+        """ Reader thread for a single board. """
+        while not self._stop.is_set():
+            try:
+                data = self._get_reading(sensor_name, reader)
+                if data is None:
+                    continue
+                with self._latest_lock:
+                    self._latest[sensor_name] = data
+                self._handle_reading(sensor_name, data, store_result=store_result,
+                                     send_message=send_message)
+            except Exception as e:
+                self.logger.warning('Exception while reading from sensor {}: {}', sensor_name, e)
+                self._stop.wait(self._interval)
+
+    def _store_environment(self):
+        """ Store the latest reading from each board in `environment` every interval. """
+        while not self._stop.wait(self._interval):
+            sensor_data = self.latest
+            if len(sensor_data) > 0:
+                try:
+                    self.db.insert_current('environment', sensor_data)
+                except Exception as e:
+                    self.logger.warning('Problem storing environment: {}', e)
+
 
 def auto_detect_arduino_devices(comports=None, logger=None):
     if comports is None:
@@ -3,6 +3,7 @@
 import collections
 import pytest
 import serial
+import time
 
 from peas import sensors as sensors_module
 from pocs.utils import rs232
@@ -134,3 +135,33 @@ def test_auto_detect_arduino_devices(inject_list_comports, serial_handlers):
         assert v[ndx][1].is_connected is True
         v[ndx][1].disconnect()
         assert v[ndx][1].is_connected is False
+
+
+# --------------------------------------------------------------------------------------------------
+
+def test_monitor_reader_threads(inject_list_comports, serial_handlers, memory_db):
+    monitor = sensors_module.ArduinoSerialMonitor(auto_detect=True)
+    assert set(monitor.serial_readers) == {'telemetry_board', 'camera_board'}
+    monitor.db = memory_db
+
+    monitor.start(interval=0.1, send_message=False)
+    assert monitor.is_running
+    try:
+        for _ in range(100):
+            if len(monitor.capture()) == 2 and memory_db.get_current('environment'):
+                break
+            time.sleep(0.1)
+    finally:
+        monitor.disconnect()
+    assert not monitor.is_running
+
+    latest = monitor.latest
+    assert latest['telemetry_board']['name'] == 'telemetry_board'
+    assert latest['camera_board']['name'] == 'camera_board'
+
+    # Each board has its own collection, plus the aggregate.
+    assert memory_db.get_current('telemetry_board')['data']['name'] == 'telemetry_board'
+    assert memory_db.get_current('camera_board')['data']['name'] == 'camera_board'
+    assert memory_db.get_current('power') is not None
+    environment = memory_db.get_current('environment')['data']
+    assert set(environment) <= {'telemetry_board', 'camera_board'}
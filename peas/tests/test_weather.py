@@ -0,0 +1,180 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from datetime import datetime as dt
+from datetime import timedelta
+
+from peas.weather import AAGCloudSensor
+from peas.weather import RollingWindow
+
+
+def test_rolling_window_bad_size():
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+
+def test_rolling_window_empty():
+    window = RollingWindow(5)
+    assert len(window) == 0
+    assert window.count == 0
+    assert window.max is None
+    assert window.min is None
+    assert window.mean is None
+    assert window.last is None
+
+
+def test_rolling_window_matches_lists():
+    random.seed(42)
+    size = 7
+    window = RollingWindow(size)
+    values = list()
+    for i in range(100):
+        value = math.nan if random.random() < 0.2 else random.uniform(-10, 10)
+        window.append(value)
+        values.append(value)
+
+        in_window = [v for v in values[-size:] if not math.isnan(v)]
+        assert len(window) == min(i + 1, size)
+        np.testing.assert_array_equal(window.values, values[-size:])
+        assert window.count == len(in_window)
+        if in_window:
+            assert window.max == max(in_window)
+            assert window.min == min(in_window)
+            assert window.mean == pytest.approx(np.mean(in_window))
+            assert window.last == in_window[-1]
+            last_three = [v for v in values[-3:] if not math.isnan(v)]
+            if last_three:
+                assert window.mean_of_last(3) == pytest.approx(np.mean(last_three))
+        else:
+            assert window.max is None
+            assert window.last is None
+
+
+@pytest.fixture(scope='function')
+def sensor():
+    return AAGCloudSensor(serial_address='', store_result=False)
+
+
+def add_entries(sensor, n, interval=60, **values):
+    start = dt.utcnow() - timedelta(seconds=n * interval)
+    for i in range(n):
+        entry = dict(date=start + timedelta(seconds=i * interval))
+        entry.update(values)
+        sensor._add_entry(entry)
+
+
+def test_safety_window_length(sensor):
+    add_entries(sensor, 100, sky_temp_C=-30, ambient_temp_C=10)
+    assert len(sensor.weather_entries) == int(sensor.safety_delay)
+    assert len(sensor._sky_diff) == int(sensor.safety_delay)
+
+
+def test_safe_conditions(sensor):
+    current = dict(sky_temp_C=-30, ambient_temp_C=10, rain_frequency=2500, wind_speed_KPH=5)
+    add_entries(sensor, 20, **current)
+    decision = sensor.make_safety_decision(current)
+    assert decision == {'Safe': True, 'Sky': 'Clear', 'Wind': 'Calm', 'Gust': 'Calm',
+                        'Rain': 'Dry'}
+
+
+def test_unsafe_history(sensor):
+    current = dict(sky_temp_C=-30, ambient_temp_C=10, rain_frequency=2500, wind_speed_KPH=5)
+    add_entries(sensor, 10, **current)
+    # A single cloudy, wet and very gusty entry makes the window unsafe.
+    add_entries(sensor, 1, sky_temp_C=0, ambient_temp_C=10, rain_frequency=1500,
+                wind_speed_KPH=200)
+    add_entries(sensor, 3, **current)
+    decision = sensor.make_safety_decision(current)
+    assert decision['Safe'] is False
+    assert decision['Sky'] == 'Clear'
+    assert decision['Rain'] == 'Dry'
+    assert sensor._sky_diff.max == -10
+    assert sensor._rain_frequency.min == 1500
+    assert sensor._wind_speed.max == 200
+
+    # Once it has left the window conditions are safe again.
+    add_entries(sensor, int(sensor.safety_delay), **current)
+    assert sensor.make_safety_decision(current)['Safe'] is True
+
+
+def test_missing_values(sensor):
+    add_entries(sensor, 5)
+    decision = sensor.make_safety_decision(dict())
+    assert decision['Safe'] is False
+    assert decision['Sky'] == 'Unknown'
+    assert decision['Wind'] == 'Unknown'
+    assert decision['Rain'] == 'Unknown'
+
+
+class FakeCloudWatcher(object):
+    """Stand in for the CloudWatcher serial port, answers the reading commands.
+
+    Responses are 15 character blocks followed by the handshake block, as
+    described in Rs232_Comms_v100.pdf.
+    """
+
+    responses = {'!S': ['!1', '-2500'],
+                 '!T': ['!2', '1000'],
+                 '!C': ['!6', '100', '!4', '500', '!5', '600'],
+                 '!E': ['!R', '2500'],
+                 '!Q': ['!Q', '512'],
+                 '!D': ['!E1', '0', '!E2', '0', '!E3', '0', '!E4', '0'],
+                 'v!': ['!v', '1'],
+                 'V!': ['!w', '12']}
+
+    def __init__(self):
+        self.output = b''
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        commands = data.decode('utf-8')
+        for i in range(0, len(commands), 2):
+            blocks = self.responses[commands[i:i + 2]]
+            for name, value in zip(blocks[::2], blocks[1::2]):
+                self.output += (name + value.rjust(15 - len(name))).encode('utf-8')
+            self.output += ('!\x11' + ' ' * 12 + '0').encode('utf-8')
+
+    def inWaiting(self):
+        return len(self.output)
+
+    def read(self, size=1):
+        data, self.output = self.output[:size], self.output[size:]
+        return data
+
+
+def test_query_pipelined(sensor):
+    sensor.AAG = FakeCloudWatcher()
+    results = sensor.query_pipelined(['!S', '!C', 'V!', '!D'])
+    assert results == [('-2500',), ('100', '500', '600'), ('12',), ('0', '0', '0', '0')]
+    assert sensor.AAG.writes == 1
+    latencies = sensor.get_command_latencies()
+    assert sorted(latencies) == ['!C', '!D', '!S', 'V!']
+    assert all(summary['count'] == 1 for summary in latencies.values())
+
+
+def test_query_pipelined_missing_response(sensor):
+    sensor.AAG = FakeCloudWatcher()
+    sensor.AAG.responses = dict(FakeCloudWatcher.responses, **{'!T': []})
+    results = sensor.query_pipelined(['!S', '!T'], timeout=0.1)
+    assert results == [('-2500',), None]
+
+
+def test_capture_pipelined(sensor):
+    sensor.AAG = FakeCloudWatcher()
+    sensor.name = 'CloudWatcher'
+    sensor.firmware_version = '5.6'
+    sensor.serial_number = '1234'
+    sensor.pipeline_queries = True
+    sensor.calculate_and_set_PWM = lambda: None
+    data = sensor.capture()
+    assert data['sky_temp_C'] == -25
+    assert data['ambient_temp_C'] == 10
+    assert data['rain_frequency'] == 2500
+    assert data['wind_speed_KPH'] == 12
+    # One write for the whole reading, nothing left over.
+    assert sensor.AAG.writes == 1
+    assert sensor._prefetched == dict()
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 
+import math
 import numpy as np
 import re
 import serial
 import sys
 import time
 
+from collections import defaultdict
+from collections import deque
 from datetime import datetime as dt
 from dateutil.parser import parse as date_parser
 
 import astropy.units as u
 
 from pocs.utils.config import load_config
+from pocs.utils.latency import LatencyHistogram
 from pocs.utils.logger import get_root_logger
 from pocs.utils.messaging import PanMessaging
 
@@ -29,6 +33,121 @@ def movingaverage(interval, window_size):
     return np.convolve(interval, window, 'same')
 
 
+class RollingWindow(object):
+    """Rolling window over the last `size` values of a metric.
+
+    Values are kept in a fixed size ring buffer, with the running max and min kept in
+    monotonic deques and running sums of the values, so appending a value and getting
+    the max, min, mean or the mean of the last n values are all O(1) (amortized), no
+    matter how large the window is.
+
+    NaN marks a missing value (e.g. a reading without wind speed); it takes up a place
+    in the window but is otherwise ignored.
+
+    Args:
+        size (int): Number of values in the window.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError("size should be 1 or greater, got {}!".format(size))
+        self.size = int(size)
+        self._values = np.full(self.size, np.nan)
+        # Cumulative sum and count of the (non-NaN) values, one more than the window
+        # so that the sum over the whole window is a difference of two entries.
+        self._cum_sum = np.zeros(self.size + 1)
+        self._cum_count = np.zeros(self.size + 1, dtype=np.int64)
+        self._n_appended = 0
+        self._max = deque()
+        self._min = deque()
+        self._last = None
+
+    def __len__(self):
+        return min(self._n_appended, self.size)
+
+    @property
+    def count(self):
+        """ int: Number of values (excluding NaN) in the window. """
+        return int(self._cum_count[self._n_appended % (self.size + 1)] -
+                   self._cum_count[(self._n_appended - len(self)) % (self.size + 1)])
+
+    @property
+    def max(self):
+        """ float: Largest value in the window, None if there are none. """
+        return self._max[0][1] if self._max else None
+
+    @property
+    def min(self):
+        """ float: Smallest value in the window, None if there are none. """
+        return self._min[0][1] if self._min else None
+
+    @property
+    def mean(self):
+        """ float: Mean of the values in the window, None if there are none. """
+        return self.mean_of_last(len(self))
+
+    @property
+    def last(self):
+        """ float: Most recent value in the window, None if there are none. """
+        return self._last if self.count > 0 else None
+
+    @property
+    def values(self):
+        """ numpy.ndarray: Copy of the window contents, oldest first, including NaNs. """
+        start = self._n_appended - len(self)
+        return np.array([self._values[i % self.size] for i in range(start, self._n_appended)])
+
+    def mean_of_last(self, n):
+        """Mean of the values among the last n places in the window.
+
+        Args:
+            n (int): Number of places, limited to the current length of the window.
+
+        Returns:
+            float: The mean, None if there are no values in those places.
+        """
+        n = max(0, min(int(n), len(self)))
+        end = self._n_appended % (self.size + 1)
+        start = (self._n_appended - n) % (self.size + 1)
+        count = self._cum_count[end] - self._cum_count[start]
+        if count == 0:
+            return None
+        return float((self._cum_sum[end] - self._cum_sum[start]) / count)
+
+    def append(self, value):
+        """Add a value to the window, dropping the oldest value if the window is full.
+
+        Args:
+            value (float): The value, or NaN if missing.
+        """
+        value = float(value) if value is not None else math.nan
+        index = self._n_appended
+        self._values[index % self.size] = value
+
+        valid = not math.isnan(value)
+        previous = index % (self.size + 1)
+        current = (index + 1) % (self.size + 1)
+        self._cum_sum[current] = self._cum_sum[previous] + (value if valid else 0.)
+        self._cum_count[current] = self._cum_count[previous] + valid
+        self._n_appended += 1
+
+        if valid:
+            self._last = value
+            while self._max and self._max[-1][1] <= value:
+                self._max.pop()
+            self._max.append((index, value))
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((index, value))
+
+        # Drop values that have left the window.
+        oldest = self._n_appended - self.size
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+
+
 # -----------------------------------------------------------------------------
 # AAG Cloud Sensor Class
 # -----------------------------------------------------------------------------
@@ -99,8 +218,17 @@ class AAGCloudSensor(object):
         * get IR errors
         * get SWITCH Status
 
+    If the `pipeline_queries` config item is set, `capture` sends all of the commands
+    for a reading at once and reads the responses in one pass (see `query_pipelined`)
+    rather than waiting a fixed delay for each response in turn. The round trip time
+    of each command is recorded, see `get_command_latencies`.
+
     """
 
+    # Commands (and how many times to send them) for one reading, see `capture`.
+    reading_commands = [('!S', 9), ('!T', 5), ('!C', 5), ('!E', 5), ('!Q', 1), ('!D', 1),
+                        ('v!', 1), ('V!', 3)]
+
     def __init__(self, serial_address=None, store_result=True):
         self.config = load_config(config_files='peas')
         self.logger = get_root_logger()
@@ -109,6 +237,9 @@ class AAGCloudSensor(object):
         self.cfg = self.config['weather']['aag_cloud']
 
         self.safety_delay = self.cfg.get('safety_delay', 15.)
+        self.pipeline_queries = self.cfg.get('pipeline_queries', False)
+        self._command_latencies = defaultdict(LatencyHistogram)
+        self._prefetched = dict()
 
         self.db = None
         if store_result:
@@ -216,7 +347,13 @@ class AAGCloudSensor(object):
             'P\d\d\d\d!': 0.750,
         }
 
-        self.weather_entries = list()
+        # Entries in the safety window, plus rolling windows of the values the safety
+        # decisions are based on. See `_add_entry`.
+        self.weather_entries = deque(maxlen=max(1, int(self.safety_delay)))
+        self._sky_diff = RollingWindow(self.weather_entries.maxlen)
+        self._wind_speed = RollingWindow(self.weather_entries.maxlen)
+        self._wind_mavg = RollingWindow(self.weather_entries.maxlen)
+        self._rain_frequency = RollingWindow(self.weather_entries.maxlen)
 
         if self.AAG:
             # Query Device Name
@@ -278,12 +415,14 @@ class AAGCloudSensor(object):
         if len(cleared) > 0:
             self.logger.debug('  Cleared: "{}"'.format(cleared.decode('utf-8')))
 
+        start_time = time.monotonic()
         self.AAG.write(send.encode('utf-8'))
         time.sleep(delay)
 
         result = None
         try:
             response = self.AAG.read(self.AAG.inWaiting()).decode('utf-8')
+            self._command_latencies[cmd].add(time.monotonic() - start_time)
         except UnicodeDecodeError:
             self.logger.debug("Error reading from serial line")
         else:
@@ -329,6 +468,101 @@ class AAGCloudSensor(object):
                 result = MatchExpect.groups()
         return result
 
+    def query_pipelined(self, sends, timeout=None):
+        """Send several commands at once and read all of the responses in one pass.
+
+        Responses are split on the handshake block that ends each of them, as they
+        arrive, so there is no fixed delay per command. The round trip time of each
+        command is measured from the write to the end of its response.
+
+        Args:
+            sends (list): The commands to send, as for `query`.
+            timeout (float, optional): Seconds to wait for all of the responses,
+                defaults to the sum of the `query` delays plus two seconds.
+
+        Returns:
+            list: For each command the groups matched in its response, as returned by
+                `query`, or None if the response was missing or didn't match.
+        """
+        cmds = list()
+        for send in sends:
+            cmd = next((cmd for cmd in self.commands.keys() if re.match(cmd, send)), None)
+            if cmd not in self.expects:
+                raise ValueError('Unknown command: "{}"'.format(send))
+            cmds.append(cmd)
+
+        if timeout is None:
+            timeout = sum(self.delays.get(cmd, 0.200) for cmd in cmds) + 2.
+
+        cleared = self.AAG.read(self.AAG.inWaiting())
+        if len(cleared) > 0:
+            self.logger.debug('  Cleared: "{}"'.format(cleared.decode('utf-8', 'replace')))
+
+        self.logger.debug('Sending {} commands'.format(len(sends)))
+        start_time = time.monotonic()
+        self.AAG.write(''.join(sends).encode('utf-8'))
+
+        responses = list()
+        buffer = ''
+        handshake = re.compile('\\x11\\s{12}0')
+        while len(responses) < len(sends) and time.monotonic() - start_time < timeout:
+            try:
+                buffer += self.AAG.read(max(1, self.AAG.inWaiting())).decode('utf-8')
+            except UnicodeDecodeError:
+                self.logger.debug("Error reading from serial line")
+                continue
+            match = handshake.search(buffer)
+            while match and len(responses) < len(sends):
+                self._command_latencies[cmds[len(responses)]].add(time.monotonic() - start_time)
+                responses.append(buffer[:match.start()])
+                buffer = buffer[match.end():]
+                match = handshake.search(buffer)
+
+        results = list()
+        for i, cmd in enumerate(cmds):
+            match = re.match(self.expects[cmd], responses[i]) if i < len(responses) else None
+            if not match:
+                self.logger.debug('Did not find {} in response to {}'.format(
+                    self.expects[cmd], sends[i]))
+            results.append(match.groups() if match else None)
+        return results
+
+    def get_command_latencies(self):
+        """Round trip times of the commands sent to the CloudWatcher.
+
+        Returns:
+            dict: A summary of the latency histogram for each command that has been
+                sent, see `pocs.utils.latency.LatencyHistogram.to_dict`.
+        """
+        return {cmd: latencies.to_dict() for cmd, latencies in self._command_latencies.items()}
+
+    def prefetch_reading(self):
+        """Pipeline the queries for one reading, see `reading_commands`.
+
+        The results are kept and used by the next calls to the `get_*` methods
+        (the other queries are sent one at a time as usual).
+        """
+        sends = [send for send, n in self.reading_commands for i in range(n)]
+        results = self.query_pipelined(sends)
+
+        self._prefetched = defaultdict(deque)
+        for send, result in zip(sends, results):
+            self._prefetched[send].append(result)
+
+        n_failed = results.count(None)
+        if n_failed > 0:
+            self.logger.debug('{} of {} pipelined queries failed'.format(n_failed, len(sends)))
+
+    def _query_reading(self, send):
+        """ Result of a prefetched query if there is one, else query the CloudWatcher """
+        try:
+            result = self._prefetched[send].popleft()
+        except (KeyError, IndexError):
+            result = None
+        if result is None:
+            result = self.query(send)
+        return result
+
     def get_ambient_temperature(self, n=5):
         """
         Populates the self.ambient_temp property
@@ -341,7 +575,7 @@ class AAGCloudSensor(object):
 
         for i in range(0, n):
             try:
-                value = float(self.query('!T')[0])
+                value = float(self._query_reading('!T')[0])
                 ambient_temp = value / 100.
 
             except Exception:
@@ -374,7 +608,7 @@ class AAGCloudSensor(object):
         values = []
         for i in range(0, n):
             try:
-                value = float(self.query('!S')[0]) / 100.
+                value = float(self._query_reading('!S')[0]) / 100.
             except Exception:
                 pass
             else:
@@ -407,7 +641,7 @@ class AAGCloudSensor(object):
         LDR_resistances = []
         rain_sensor_temps = []
         for i in range(0, n):
-            responses = self.query('!C')
+            responses = self._query_reading('!C')
             try:
                 internal_voltage = 1023 * ZenerConstant / float(responses[0])
                 internal_voltages.append(internal_voltage)
@@ -452,7 +686,7 @@ class AAGCloudSensor(object):
         values = []
         for i in range(0, n):
             try:
-                value = float(self.query('!E')[0])
+                value = float(self._query_reading('!E')[0])
                 self.logger.debug('  Rain Freq Query = {:.1f}'.format(value))
                 values.append(value)
             except Exception:
@@ -474,7 +708,7 @@ class AAGCloudSensor(object):
         """
         self.logger.debug('Getting PWM value')
         try:
-            value = self.query('!Q')[0]
+            value = self._query_reading('!Q')[0]
             self.PWM = float(value) * 100. / 1023.
             self.logger.debug('  PWM Value = {:.1f}'.format(self.PWM))
         except Exception:
@@ -514,7 +748,7 @@ class AAGCloudSensor(object):
         Populates the self.IR_errors property
         """
         self.logger.debug('Getting errors')
-        response = self.query('!D')
+        response = self._query_reading('!D')
         if response:
             self.errors = {'error_1': str(int(response[0])),
                            'error_2': str(int(response[1])),
@@ -568,7 +802,7 @@ class AAGCloudSensor(object):
         """
         self.logger.debug('Checking if wind speed is enabled')
         try:
-            enabled = bool(self.query('v!')[0])
+            enabled = bool(self._query_reading('v!')[0])
             if enabled:
                 self.logger.debug('  Anemometer enabled')
             else:
@@ -590,7 +824,7 @@ class AAGCloudSensor(object):
         if self.wind_speed_enabled():
             values = []
             for i in range(0, n):
-                result = self.query('V!')
+                result = self._query_reading('V!')
                 if result:
                     value = float(result[0])
                     self.logger.debug('  Wind Speed Query = {:.1f}'.format(value))
@@ -620,6 +854,9 @@ class AAGCloudSensor(object):
         data['weather_sensor_firmware_version'] = self.firmware_version
         data['weather_sensor_serial_number'] = self.serial_number
 
+        if self.pipeline_queries:
+            self.prefetch_reading()
+
         if self.get_sky_temperature():
             data['sky_temp_C'] = self.sky_temp.value
         if self.get_ambient_temperature():
@@ -639,6 +876,7 @@ class AAGCloudSensor(object):
             data['errors'] = self.errors
         if self.get_wind_speed():
             data['wind_speed_KPH'] = self.wind_speed.value
+        self._prefetched = dict()
 
         # Make Safety Decision
         self.safe_dict = self.make_safety_decision(data)
@@ -651,11 +889,7 @@ class AAGCloudSensor(object):
 
         # Store current weather
         data['date'] = dt.utcnow()
-        self.weather_entries.append(data)
-
-        # If we get over a certain amount of entries, trim the earliest
-        if len(self.weather_entries) > int(self.safety_delay):
-            del self.weather_entries[:1]
+        self._add_entry(data)
 
         self.calculate_and_set_PWM()
 
@@ -823,22 +1057,19 @@ class AAGCloudSensor(object):
     def _get_cloud_safety(self, current_values):
         safety_delay = self.safety_delay
 
-        entries = self.weather_entries
         threshold_cloudy = self.cfg.get('threshold_cloudy', -22.5)
         threshold_very_cloudy = self.cfg.get('threshold_very_cloudy', -15.)
 
-        sky_diff = [x['sky_temp_C'] - x['ambient_temp_C']
-                    for x in entries
-                    if ('ambient_temp_C' and 'sky_temp_C') in x.keys()]
+        sky_diff = self._sky_diff
 
-        if len(sky_diff) == 0:
+        if sky_diff.count == 0:
             self.logger.debug('  UNSAFE: no sky temperatures found')
             sky_safe = False
             cloud_condition = 'Unknown'
         else:
-            if max(sky_diff) > threshold_cloudy:
+            if sky_diff.max > threshold_cloudy:
                 self.logger.debug('UNSAFE: Cloudy in last {} min. Max sky diff {:.1f} C'.format(
-                                  safety_delay, max(sky_diff)))
+                                  safety_delay, sky_diff.max))
                 sky_safe = False
             else:
                 sky_safe = True
@@ -851,15 +1082,12 @@ class AAGCloudSensor(object):
             else:
                 cloud_condition = 'Clear'
             self.logger.debug(
-                'Cloud Condition: {} (Sky-Amb={:.1f} C)'.format(cloud_condition, sky_diff[-1]))
+                'Cloud Condition: {} (Sky-Amb={:.1f} C)'.format(cloud_condition, sky_diff.last))
 
         return cloud_condition, sky_safe
 
     def _get_wind_safety(self, current_values):
         safety_delay = self.safety_delay
-        entries = self.weather_entries
-
-        end_time = dt.utcnow()
 
         threshold_windy = self.cfg.get('threshold_windy', 20.)
         threshold_very_windy = self.cfg.get('threshold_very_windy', 30)
@@ -868,47 +1096,37 @@ class AAGCloudSensor(object):
         threshold_very_gusty = self.cfg.get('threshold_very_gusty', 50.)
 
         # Wind (average and gusts)
-        wind_speed = [x['wind_speed_KPH']
-                      for x in entries
-                      if 'wind_speed_KPH' in x.keys()]
+        wind_speed = self._wind_speed
+        wind_mavg = self._wind_mavg
 
-        if len(wind_speed) == 0:
+        if wind_speed.count == 0:
             self.logger.debug('  UNSAFE: no wind speed readings found')
             wind_safe = False
             gust_safe = False
             wind_condition = 'Unknown'
             gust_condition = 'Unknown'
         else:
-            start_time = entries[0]['date']
-            if type(start_time) == str:
-                start_time = date_parser(entries[0]['date'])
-
-            typical_data_interval = (end_time - start_time).total_seconds() / len(entries)
-
-            mavg_count = int(np.ceil(120. / typical_data_interval))  # What is this 120?
-            wind_mavg = movingaverage(wind_speed, mavg_count)
-
             # Windy?
-            if max(wind_mavg) > threshold_very_windy:
+            if wind_mavg.max > threshold_very_windy:
                 self.logger.debug('  UNSAFE:  Very windy in last {:.0f} min. Max wind speed {:.1f} kph'.format(
-                    safety_delay, max(wind_mavg)))
+                    safety_delay, wind_mavg.max))
                 wind_safe = False
             else:
                 wind_safe = True
 
-            if wind_mavg[-1] > threshold_very_windy:
+            if wind_mavg.last > threshold_very_windy:
                 wind_condition = 'Very Windy'
-            elif wind_mavg[-1] > threshold_windy:
+            elif wind_mavg.last > threshold_windy:
                 wind_condition = 'Windy'
             else:
                 wind_condition = 'Calm'
             self.logger.debug(
-                '  Wind Condition: {} ({:.1f} km/h)'.format(wind_condition, wind_mavg[-1]))
+                '  Wind Condition: {} ({:.1f} km/h)'.format(wind_condition, wind_mavg.last))
 
             # Gusty?
-            if max(wind_speed) > threshold_very_gusty:
+            if wind_speed.max > threshold_very_gusty:
                 self.logger.debug('  UNSAFE:  Very gusty in last {:.0f} min. Max gust speed {:.1f} kph'.format(
-                    safety_delay, max(wind_speed)))
+                    safety_delay, wind_speed.max))
                 gust_safe = False
             else:
                 gust_safe = True
@@ -922,20 +1140,19 @@ class AAGCloudSensor(object):
                 gust_condition = 'Calm'
 
             self.logger.debug(
-                '  Gust Condition: {} ({:.1f} km/h)'.format(gust_condition, wind_speed[-1]))
+                '  Gust Condition: {} ({:.1f} km/h)'.format(gust_condition, wind_speed.last))
 
         return (wind_condition, wind_safe), (gust_condition, gust_safe)
 
     def _get_rain_safety(self, current_values):
         safety_delay = self.safety_delay
-        entries = self.weather_entries
         threshold_wet = self.cfg.get('threshold_wet', 2000.)
         threshold_rain = self.cfg.get('threshold_rainy', 1700.)
 
         # Rain
-        rf_value = [x['rain_frequency'] for x in entries if 'rain_frequency' in x.keys()]
+        rf_value = self._rain_frequency
 
-        if len(rf_value) == 0:
+        if rf_value.count == 0:
             rain_safe = False
             rain_condition = 'Unknown'
         else:
@@ -952,10 +1169,10 @@ class AAGCloudSensor(object):
 
             # If safe now, check last 15 minutes
             if rain_safe:
-                if min(rf_value) <= threshold_rain:
+                if rf_value.min <= threshold_rain:
                     self.logger.debug('  UNSAFE:  Rain in last {:.0f} min.'.format(safety_delay))
                     rain_safe = False
-                elif min(rf_value) <= threshold_wet:
+                elif rf_value.min <= threshold_wet:
                     self.logger.debug('  UNSAFE:  Wet in last {:.0f} min.'.format(safety_delay))
                     rain_safe = False
                 else:
@@ -964,3 +1181,38 @@ class AAGCloudSensor(object):
             self.logger.debug('  Rain Condition: {}'.format(rain_condition))
 
         return rain_condition, rain_safe
+
+    def _add_entry(self, data):
+        """Add a weather entry to the safety window.
+
+        Also updates the rolling windows used by the safety decisions, with NaN for
+        values missing from the entry so that the windows line up with the entries.
+        """
+        self.weather_entries.append(data)
+
+        if 'sky_temp_C' in data and 'ambient_temp_C' in data:
+            self._sky_diff.append(data['sky_temp_C'] - data['ambient_temp_C'])
+        else:
+            self._sky_diff.append(math.nan)
+
+        self._rain_frequency.append(data.get('rain_frequency', math.nan))
+
+        # Moving average of the wind speed over about the last two minutes.
+        wind_speed = data.get('wind_speed_KPH', math.nan)
+        self._wind_speed.append(wind_speed)
+        if math.isnan(wind_speed):
+            self._wind_mavg.append(math.nan)
+        else:
+            start_time = self.weather_entries[0]['date']
+            if type(start_time) == str:
+                start_time = date_parser(start_time)
+            end_time = data['date']
+            if type(end_time) == str:
+                end_time = date_parser(end_time)
+            typical_data_interval = (end_time - start_time).total_seconds() / \
+                len(self.weather_entries)
+            if typical_data_interval > 0:
+                mavg_count = int(np.ceil(120. / typical_data_interval))
+            else:
+                mavg_count = 1
+            self._wind_mavg.append(self._wind_speed.mean_of_last(mavg_count))
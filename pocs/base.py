@@ -25,9 +25,21 @@ class PanBase(object):
     """ Base class for other classes within the PANOPTES ecosystem
 
     Defines common properties for each class (e.g. logger, config).
+
+    Objects that are created in large numbers, such as the fields and observations
+    read by the scheduler, can pass a `parent` keyword argument to use the config,
+    logger and db of that (`PanBase`) object rather than set them up again.
     """
 
     def __init__(self, *args, **kwargs):
+        parent = kwargs.get('parent')
+        if parent is not None:
+            self.__version__ = __version__
+            self.config = parent.config
+            self.logger = parent.logger
+            self.db = parent.db
+            return
+
         # Load the default and local config files
         global _config
         if _config is None:
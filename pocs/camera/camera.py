@@ -4,6 +4,7 @@ import re
 import shutil
 import subprocess
 import threading
+import time
 import yaml
 
 from astropy.io import fits
@@ -17,6 +18,8 @@ from pocs.utils import listify
 from pocs.utils import load_module
 from pocs.utils import images as img_utils
 from pocs.utils.images import fits as fits_utils
+from pocs.utils.metrics import get_metrics
+from pocs.utils.profiling import profiled
 from pocs.focuser import AbstractFocuser
 
 
@@ -225,12 +228,14 @@ class AbstractCamera(PanBase):
     def take_exposure(self, *args, **kwargs):
         raise NotImplementedError
 
+    @profiled('camera')
     def process_exposure(self, info, observation_event, exposure_event=None):
         """
         Processes the exposure.
 
         If the camera is a primary camera, extract the jpeg image and save metadata to mongo
         `current` collection. Saves metadata to mongo `observations` collection for all images.
+        The time spent waiting for the exposure and processing it are recorded in `metrics`.
 
         Args:
             info (dict): Header metadata saved for the image
@@ -239,9 +244,16 @@ class AbstractCamera(PanBase):
             exposure_event (threading.Event, optional): An event that should be set
                 when the exposure is complete, triggering the processing.
         """
+        metrics = get_metrics(self.db)
+
         # If passed an Event that signals the end of the exposure wait for it to be set
         if exposure_event is not None:
-            exposure_event.wait()
+            with metrics.timing('camera', 'exposure', camera=self.name,
+                                image_id=info['image_id']):
+                exposure_event.wait()
+
+        processing_start = time.time()
+        processing_counter = time.perf_counter()
 
         image_id = info['image_id']
         seq_id = info['sequence_id']
@@ -286,6 +298,9 @@ class AbstractCamera(PanBase):
             'date': current_time(datetime=True),
             'sequence_id': seq_id,
         })
+        metrics.record('camera', 'processing', processing_start,
+                       time.perf_counter() - processing_counter,
+                       camera=self.name, image_id=image_id)
 
         # Mark the event as done
         observation_event.set()
@@ -5,14 +5,13 @@ from threading import Event
 from threading import Timer
 from threading import Lock
 
-import numpy as np
-
 from astropy import units as u
 
 from pocs.camera.camera import AbstractCamera
 from pocs.camera import libfli
 from pocs.camera import libfliconstants as c
 from pocs.utils.images import fits as fits_utils
+from pocs.utils.images.buffers import BufferRing
 
 # FLI camera serial numbers have pairs of letters followed by a sequence of numbers
 serial_number_pattern = re.compile(r'^(ML|PL|KL|HP)\d+$')
@@ -32,6 +31,7 @@ class Camera(AbstractCamera):
                  set_point=25 * u.Celsius,
                  filter_type='M',
                  library_path=False,
+                 grab_frame=False,
                  *args, **kwargs):
         kwargs['readout_time'] = 1.0
         kwargs['file_extension'] = 'fits'
@@ -43,6 +43,13 @@ class Camera(AbstractCamera):
         # Create an instance of the FLI Driver interface
         self._FLIDriver = libfli.FLIDriver(library_path)
 
+        # Readout with a single FLIGrabFrame call instead of row by row. Not all versions of
+        # the FLI library support this, will fall back to row by row readout if it fails.
+        self._grab_frame = grab_frame
+
+        # Image data arrays, allocated on first readout and reused for subsequent exposures.
+        self._image_buffers = None
+
         if serial_number_pattern.match(self.port):
             # Have been given a serial number instead of a device node
             self.logger.debug('Looking for {} ({})...'.format(self.name, self.port))
@@ -280,21 +287,31 @@ class Camera(AbstractCamera):
         while self._FLIDriver.FLIGetExposureStatus(self._handle) > 0 * u.second:
             time.sleep(self._FLIDriver.FLIGetExposureStatus(self._handle).value)
 
-        # Readout.
-        # Use FLIGrabRow for now at least because I can't get FLIGrabFrame to work.
-        # image_data = self._FLIDriver.FLIGrabFrame(self._handle, width, height)
-        image_data = np.zeros((height, width), dtype=np.uint16)
-        for i in range(image_data.shape[0]):
-            try:
-                image_data[i] = self._FLIDriver.FLIGrabRow(self._handle, image_data.shape[1])
-            except RuntimeError as err:
-                message = 'Readout error: expected {} rows, got {}!'.format(image_data.shape[0], i)
-                self.logger.error(message)
-                self.logger.error(err)
-                warn(message)
-                break
+        # Readout into a reusable image data array. Only one readout can be in progress at
+        # a time (protected by _exposure_lock) and write_fits has finished with the array before
+        # the lock is released, so a single array is enough.
+        if self._image_buffers is None or not self._image_buffers.matches((height, width)):
+            self._image_buffers = BufferRing((height, width), size=1)
+        image_data = self._image_buffers.acquire()
+
+        try:
+            if self._grab_frame:
+                try:
+                    self._FLIDriver.FLIGrabFrame(self._handle, width, height, image_data)
+                except RuntimeError as err:
+                    self.logger.warning('FLIGrabFrame failed on {}, using row by row readout '
+                                        'from now on: {}'.format(self.name, err))
+                    self._grab_frame = False
+                    raise
+            else:
+                self._FLIDriver.FLIGrabRows(self._handle, width, height, image_data)
+        except RuntimeError as err:
+            message = 'Readout error on {}: {}'.format(self.name, err)
+            self.logger.error(message)
+            warn(message)
 
         fits_utils.write_fits(image_data, header, filename, self.logger, exposure_event)
+        self._image_buffers.release(image_data)
         self._exposure_lock.release()
 
     def _fits_header(self, seconds, dark):
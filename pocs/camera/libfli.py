@@ -445,7 +445,7 @@ class FLIDriver(PanBase):
                             handle, ctypes.byref(time_left))
         return (time_left.value * u.ms).to(u.s)
 
-    def FLIGrabRow(self, handle, width):
+    def FLIGrabRow(self, handle, width, row_data=None):
         """
         Grabs a row of image data from a given camera.
 
@@ -458,18 +458,72 @@ class FLIDriver(PanBase):
         Args:
             handle (ctypes.c_long): handle of the camera to grab a row from.
             width (int): width of the image row in pixelStart
+            row_data (numpy.ndarray, optional): preallocated, C contiguous uint16 array of length
+                width to grab the row into. If not given a new array will be allocated.
 
         Returns:
             numpy.ndarray: row of image data
         """
-        row_data = np.zeros(width, dtype=np.uint16)
+        if row_data is None:
+            row_data = np.zeros(width, dtype=np.uint16)
+        else:
+            self._check_buffer(row_data, (width,))
         self._call_function('grabbing row', self._CDLL.FLIGrabRow,
                             handle,
                             row_data.ctypes.data_as(ctypes.c_void_p),
                             ctypes.c_size_t(row_data.nbytes))
         return row_data
 
-    def FLIGrabFrame(self, handle, width, height):
+    def FLIGrabRows(self, handle, width, height, image_data=None):
+        """
+        Grabs an image frame from a given camera, row by row, into a single array.
+
+        This function grabs successive rows of image data with FLIGrabRow(), writing each one
+        directly into its place in the image array rather than allocating and copying a new
+        array for every row. Unlike FLIGrabFrame() it works with all FLI cameras. The width and
+        height should be consistent with the call to FLISetImageArea() that preceded the call to
+        FLIExposeFrame(). This function should not be called until the exposure is complete,
+        which can be confirmed with FLIGetExposureStatus().
+
+        Args:
+            handle (ctypes.c_long): handle of the camera to grab a frame from.
+            width (int): width of the image frame in pixels
+            height (int): height of the image frame in pixels
+            image_data (numpy.ndarray, optional): preallocated, C contiguous uint16 array of
+                shape (height, width) to grab the frame into. If not given a new array will be
+                allocated.
+
+        Returns:
+            numpy.ndarray: image from the camera
+
+        Raises:
+            RuntimeError: if the library returns an error before all rows have been grabbed. The
+                rows grabbed before the error will have been written to image_data, the
+                remaining rows will be set to zero.
+        """
+        if image_data is None:
+            image_data = np.zeros((height, width), dtype=np.uint16, order='C')
+        else:
+            self._check_buffer(image_data, (height, width))
+
+        grab_row = self._CDLL.FLIGrabRow
+        row_address = image_data.ctypes.data
+        row_stride = image_data.strides[0]
+        row_bytes = ctypes.c_size_t(row_stride)
+        for i in range(height):
+            try:
+                self._call_function('grabbing row', grab_row,
+                                    handle,
+                                    ctypes.c_void_p(row_address),
+                                    row_bytes)
+            except RuntimeError as err:
+                image_data[i:] = 0
+                raise RuntimeError('Expected {} rows, got {}. {}'.format(height, i, err))
+            row_address += row_stride
+
+        return image_data
+
+    def FLIGrabFrame(self, handle, width, height, image_data=None):
         """
         Grabs an image frame from a given camera.
 
@@ -479,15 +533,28 @@ class FLIDriver(PanBase):
         FLIExposeFrame(). This function should not be called until the exposure is complete, which
         can be confirmed with FLIGetExposureStatus().
 
+        Note that not all versions of the FLI library implement this function for all cameras.
+        FLIGrabRows() can be used instead.
+
         Args:
             handle (ctypes.c_long): handle of the camera to grab a frame from.
             width (int): width of the image frame in pixels
             height (int): height of the image frame in pixels
+            image_data (numpy.ndarray, optional): preallocated, C contiguous uint16 array of
+                shape (height, width) to grab the frame into. If not given a new array will be
+                allocated.
 
         Returns:
             numpy.ndarray: image from the camera
+
+        Raises:
+            RuntimeError: if the library returns an error, or returns less data than expected.
         """
-        image_data = np.zeros((height, width), dtype=np.uint16, order='C')
+        if image_data is None:
+            image_data = np.zeros((height, width), dtype=np.uint16, order='C')
+        else:
+            self._check_buffer(image_data, (height, width))
+
         bytes_grabbed = ctypes.c_size_t()
         self._call_function('grabbing frame', self._CDLL.FLIGrabFrame,
                             handle,
@@ -496,9 +563,10 @@ class FLIDriver(PanBase):
                             ctypes.byref(bytes_grabbed))
 
         if bytes_grabbed.value != image_data.nbytes:
-            self.logger.error('FLI camera readout error: expected {} bytes, got {}!'.format(
-                image_data.nbytes, bytes_grabbed.value
-            ))
+            message = 'FLI camera readout error: expected {} bytes, got {}!'.format(
+                image_data.nbytes, bytes_grabbed.value)
+            self.logger.error(message)
+            raise RuntimeError(message)
 
         return image_data
 
@@ -512,6 +580,11 @@ class FLIDriver(PanBase):
                                                                      os.strerror(-error_code),
                                                                      -error_code))
 
+    def _check_buffer(self, data, shape):
+        if data.shape != shape or data.dtype != np.uint16 or not data.flags['C_CONTIGUOUS']:
+            raise ValueError("Buffer must be a C contiguous uint16 array of shape {}, got {} {}!"
+                             .format(shape, data.dtype, data.shape))
+
     def _check_valid(self, value, name):
         if value not in valid_values[name]:
             raise ValueError("Got invalid {}, {}!".format(name, value))
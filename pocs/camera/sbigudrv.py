@@ -12,14 +12,14 @@ import ctypes
 from ctypes.util import find_library
 from warnings import warn
 import time
-from threading import Timer, Lock
+from threading import Timer, Lock, Event
 
-import numpy as np
 from numpy.ctypeslib import as_ctypes
 from astropy import units as u
 
 from pocs.base import PanBase
 from pocs.utils.images import fits as fits_utils
+from pocs.utils.images.buffers import BufferRing
 
 ################################################################################
 # Main SBIGDriver class
@@ -28,7 +28,7 @@ from pocs.utils.images import fits as fits_utils
 
 class SBIGDriver(PanBase):
 
-    def __init__(self, library_path=False, retries=1, *args, **kwargs):
+    def __init__(self, library_path=False, retries=1, readout_chunk=None, *args, **kwargs):
         """
         Main class representing the SBIG Universal Driver/Library interface.
         On construction loads SBIG's shared library which must have already
@@ -43,6 +43,10 @@ class SBIGDriver(PanBase):
             retries (int, optional): maximum number of times to attempt to send
                 a command to a camera in case of failures. Default 1, i.e. only
                 send a command once.
+            readout_chunk (int, optional): number of image rows to read out each
+                time the command lock is acquired, allowing commands for other
+                cameras to be interleaved with a readout. Default None, i.e. hold
+                the command lock for the whole readout.
 
         Returns:
             `~pocs.camera.sbigudrv.SBIGDriver`
@@ -50,6 +54,7 @@ class SBIGDriver(PanBase):
         super().__init__(*args, **kwargs)
 
         self.retries = retries
+        self.readout_chunk = readout_chunk
 
         # Open library
         self.logger.debug('Opening SBIGUDrv library')
@@ -96,6 +101,17 @@ class SBIGDriver(PanBase):
         # Prepare to keep track of which handles have been assigned to Camera objects
         self._handle_assigned = [False] * len(self._handles)
 
+        # Events that are set when there is no readout pending for each handle, used to wait
+        # for the previous exposure to finish without polling the camera.
+        self._readout_done = {handle: Event() for handle in self._handles}
+        for readout_done in self._readout_done.values():
+            readout_done.set()
+
+        # Image data arrays for each handle, allocated on first readout and reused for subsequent
+        # exposures. Only one readout per handle can be in progress at a time, and write_fits has
+        # finished with the array before the readout thread exits, so a single array is enough.
+        self._image_buffers = {}
+
         self._ccd_info = {}
 
         # Create a Lock that will used to prevent simultaneous commands from multiple
@@ -118,6 +134,19 @@ class SBIGDriver(PanBase):
             raise ValueError("retries should be 1 or greater, got {}!".format(retries))
         self._retries = retries
 
+    @property
+    def readout_chunk(self):
+        return self._readout_chunk
+
+    @readout_chunk.setter
+    def readout_chunk(self, readout_chunk):
+        if readout_chunk is not None:
+            readout_chunk = int(readout_chunk)
+            if readout_chunk < 1:
+                raise ValueError("readout_chunk should be 1 or greater, got {}!".format(
+                    readout_chunk))
+        self._readout_chunk = readout_chunk
+
     def assign_handle(self, serial=None):
         """
         Returns the next unassigned camera handle, along with basic info on the coresponding camera.
@@ -256,28 +285,13 @@ class SBIGDriver(PanBase):
         # Make sure there isn't already an exposure in progress on this camera.
         # If there is then we need to wait otherwise we'll cause a hang.
         # Could do this with Locks but it's more robust to directly query the hardware.
-        query_status_params = QueryCommandStatusParams(command_codes['CC_START_EXPOSURE2'])
-        query_status_results = QueryCommandStatusResults()
-
-        with self._command_lock:
-            self._set_handle(handle)
-            self._send_command('CC_QUERY_COMMAND_STATUS',
-                               params=query_status_params,
-                               results=query_status_results)
-
-        if query_status_results.status != status_codes['CS_IDLE']:
+        if not self._query_command_status(handle, 'CC_START_EXPOSURE2', 'CS_IDLE'):
             self.logger.warning('Attempt to start exposure on {} while camera busy!'.format(
                 self._ccd_info[handle]['serial number']))
-            # Wait until camera is idle
-            while query_status_results.status != status_codes['CS_IDLE']:
-                self.logger.warning('Waiting for exposure on {} to complete'.format(
-                    self._ccd_info[handle]['serial number']))
-                time.sleep(1)
-                with self._command_lock:
-                    self._set_handle(handle)
-                    self._send_command('CC_QUERY_COMMAND_STATUS',
-                                       params=query_status_params,
-                                       results=query_status_results)
+            # If the exposure in progress was started by us then wait for its readout to
+            # finish, then confirm with the hardware that the camera is idle.
+            self._readout_done[handle].wait()
+            self._wait_for_status(handle, 'CC_START_EXPOSURE2', 'CS_IDLE', max_interval=1.0)
 
         # Check temerature is OK.
         temp_status = self.query_temp_status(handle)
@@ -293,9 +307,11 @@ class SBIGDriver(PanBase):
         with self._command_lock:
             self._set_handle(handle)
             self._send_command('CC_START_EXPOSURE2', params=start_exposure_params)
+            self._readout_done[handle].clear()
 
-        # Use a Timer to schedule the exposure readout and return a reference to the Timer.
-        wait = seconds - 0.1 if seconds > 0.1 else 0.0
+        # Use a Timer to schedule the exposure readout for the expected end of the exposure and
+        # return a reference to the Timer.
+        wait = max(seconds, 0.0)
         readout_args = (handle, centiseconds, filename, readout_mode_code,
                         top, left, height, width,
                         header, exposure_event)
@@ -312,7 +328,12 @@ class SBIGDriver(PanBase):
                  top, left, height, width,
                  header, exposure_event=None):
         """
+        Waits for the exposure to complete, reads out the image data and writes it to a FITS file.
 
+        Called at the expected end time of the exposure, will poll the camera with short intervals
+        until it reports integration complete. The command lock is released between polls, and
+        optionally between chunks of rows during readout (see `readout_chunk`), so that commands
+        for other cameras can be interleaved.
         """
         # Set up all the parameter and result Structures that will be needed.
         end_exposure_params = EndExposureParams(ccd_codes['CCD_IMAGING'])
@@ -322,10 +343,6 @@ class SBIGDriver(PanBase):
                                                   top, left,
                                                   height, width)
 
-        query_status_params = QueryCommandStatusParams(command_codes['CC_START_EXPOSURE2'])
-
-        query_status_results = QueryCommandStatusResults()
-
         readout_line_params = ReadoutLineParams(ccd_codes['CCD_IMAGING'],
                                                 readout_mode_code,
                                                 left, width)
@@ -333,58 +350,133 @@ class SBIGDriver(PanBase):
         end_readout_params = EndReadoutParams(ccd_codes['CCD_IMAGING'])
 
         # Array to hold the image data
-        image_data = np.zeros((height, width), dtype=np.uint16)
+        image_buffers = self._image_buffers.get(handle)
+        if image_buffers is None or not image_buffers.matches((height, width)):
+            image_buffers = BufferRing((height, width), size=1)
+            self._image_buffers[handle] = image_buffers
+        image_data = image_buffers.acquire()
 
-        # Check for the end of the exposure.
-        with self._command_lock:
-            self._set_handle(handle)
-            self._send_command('CC_QUERY_COMMAND_STATUS',
-                               params=query_status_params,
-                               results=query_status_results)
+        serial_number = self._ccd_info[handle]['serial number']
 
-        # Poll if needed.
-        while query_status_results.status != status_codes['CS_INTEGRATION_COMPLETE']:
-            self.logger.debug('Waiting for exposure on {} to complete'.format(
-                self._ccd_info[handle]['serial number']))
-            time.sleep(0.1)
+        try:
+            # Wait for the end of the exposure.
+            self.logger.debug('Waiting for exposure on {} to complete'.format(serial_number))
+            self._wait_for_status(handle, 'CC_START_EXPOSURE2', 'CS_INTEGRATION_COMPLETE')
+            self.logger.debug('Exposure on {} complete'.format(serial_number))
+
+            # Readout data
             with self._command_lock:
                 self._set_handle(handle)
-                self._send_command('CC_QUERY_COMMAND_STATUS',
-                                   params=query_status_params,
-                                   results=query_status_results)
+                self._send_command('CC_END_EXPOSURE', params=end_exposure_params)
+                self._send_command('CC_START_READOUT', params=start_readout_params)
 
-        self.logger.debug('Exposure on {} complete'.format(self._ccd_info[handle]['serial number']))
+            chunk = self.readout_chunk or height
+            for first_row in range(0, height, chunk):
+                rows = image_data[first_row:first_row + chunk]
+                with self._command_lock:
+                    self._set_handle(handle)
+                    try:
+                        self._readout_lines(readout_line_params, rows)
+                    except RuntimeError as err:
+                        rows_read = first_row + err.args[1]
+                        # Don't leave data from a previous exposure in the unread rows.
+                        image_data[rows_read:] = 0
+                        message = 'Readout error on {}: expected {} rows, got {}!'.format(
+                            serial_number, height, rows_read)
+                        self.logger.error(message)
+                        self.logger.error(err.args[0])
+                        warn(message)
+                        break
 
-        # Readout data
-        with self._command_lock:
-            self._set_handle(handle)
-            self._send_command('CC_END_EXPOSURE', params=end_exposure_params)
-            self._send_command('CC_START_READOUT', params=start_readout_params)
-            for i in range(height):
+            with self._command_lock:
+                self._set_handle(handle)
+                try:
+                    self.logger.debug("Ending readout on {}".format(serial_number))
+                    self._send_command('CC_END_READOUT', params=end_readout_params)
+                except RuntimeError as err:
+                    message = "Error ending readout on {}: {}".format(serial_number, err)
+                    self.logger.error(message)
+                else:
+                    self.logger.debug('Readout on {} complete'.format(serial_number))
+        except Exception:
+            image_buffers.release(image_data)
+            raise
+        finally:
+            self._readout_done[handle].set()
+
+        fits_utils.write_fits(image_data, header, filename, self.logger, exposure_event)
+        image_buffers.release(image_data)
+
+    def _readout_lines(self, readout_line_params, image_data):
+        """
+        Reads out consecutive rows of image data into an array.
+
+        The SBIG library only supports reading out one line per command so this calls the library
+        directly in a tight loop, writing each line straight into its place in the array, rather
+        than going through `_send_command` for every line. If the library returns an error the
+        line is retried with `_send_command`, which will raise if the error persists.
+
+        Args:
+            readout_line_params (ReadoutLineParams): parameters for the CC_READOUT_LINE command
+            image_data (numpy.ndarray): C contiguous uint16 array to read the rows into, with
+                one row for each line to be read out.
+
+        Raises:
+            RuntimeError: if readout fails. The second element of the exception's args is the
+                number of rows read out before the failure.
+        """
+        command_code = command_codes['CC_READOUT_LINE']
+        params = ctypes.byref(readout_line_params)
+        drv_command = self._CDLL.SBIGUnivDrvCommand
+        row_address = image_data.ctypes.data
+        row_stride = image_data.strides[0]
+
+        for i in range(image_data.shape[0]):
+            if drv_command(command_code, params, ctypes.c_void_p(row_address)) != 0:
                 try:
                     self._send_command('CC_READOUT_LINE',
                                        params=readout_line_params,
                                        results=as_ctypes(image_data[i]))
                 except RuntimeError as err:
-                    message = 'Readout error on {}: expected {} rows, got {}!'.format(self._ccd_info[handle]['serial number'],
-                                                                                      height,
-                                                                                      i)
-                    self.logger.error(message)
-                    self.logger.error(err)
-                    warn(message)
-                    break
+                    raise RuntimeError(str(err), i)
+            row_address += row_stride
 
-            try:
-                self.logger.debug("Ending readout on {}".format(self._ccd_info[handle]['serial number']))
-                self._send_command('CC_END_READOUT', params=end_readout_params)
-            except RuntimeError as err:
-                message = "Error ending readout on {}: {}".format(self._ccd_info[handle]['serial number'],
-                                                                  err)
-                self.logger.error(message)
-            else:
-                self.logger.debug('Readout on {} complete'.format(self._ccd_info[handle]['serial number']))
-            finally:
-                fits_utils.write_fits(image_data, header, filename, self.logger, exposure_event)
+    def _query_command_status(self, handle, command, status):
+        """
+        Queries the status of a command on a camera.
+
+        Returns:
+            bool: True if the command has the given status, otherwise False.
+        """
+        query_status_params = QueryCommandStatusParams(command_codes[command])
+        query_status_results = QueryCommandStatusResults()
+
+        with self._command_lock:
+            self._set_handle(handle)
+            self._send_command('CC_QUERY_COMMAND_STATUS',
+                               params=query_status_params,
+                               results=query_status_results)
+
+        return query_status_results.status == status_codes[status]
+
+    def _wait_for_status(self, handle, command, status, interval=0.01, max_interval=0.1):
+        """
+        Polls the status of a command on a camera until it reaches the given status.
+
+        The polling interval starts short and doubles after each poll up to a maximum, so
+        the wait ends soon after the status changes without repeatedly querying a camera
+        that is still busy. The command lock is only held while querying.
+
+        Args:
+            handle (int): handle of the camera to poll
+            command (str): name of the command to query the status of
+            status (str): name of the status to wait for
+            interval (float, optional): initial polling interval in seconds, default 0.01
+            max_interval (float, optional): maximum polling interval in seconds, default 0.1
+        """
+        while not self._query_command_status(handle, command, status):
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
 
     def _get_ccd_info(self, handle):
         """
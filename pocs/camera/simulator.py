@@ -11,13 +11,18 @@ from astropy.io import fits
 
 from pocs.camera import AbstractCamera
 from pocs.utils.images import fits as fits_utils
+from pocs.utils.images.buffers import BufferRing
 
 
 class Camera(AbstractCamera):
 
+    # Class variable to cache the example image data used for all simulated exposures
+    _fake_data = None
+
     def __init__(self, name='Simulated Camera', *args, **kwargs):
         super().__init__(name, *args, **kwargs)
         self.logger.debug("Initializing simulated camera")
+        self._image_buffers = None
         self.connect()
 
     def connect(self):
@@ -82,21 +87,31 @@ class Camera(AbstractCamera):
         return exposure_event
 
     def _fake_exposure(self, filename, header, exposure_event):
-        # Get example FITS file from test data directory
-        file_path = os.path.join(
-            os.environ['POCS'],
-            'pocs', 'tests', 'data',
-            'unsolved.fits'
-        )
-        fake_data = fits.getdata(file_path)
+        if Camera._fake_data is None:
+            # Get example FITS file from test data directory
+            file_path = os.path.join(
+                os.environ['POCS'],
+                'pocs', 'tests', 'data',
+                'unsolved.fits'
+            )
+            fake_data = fits.getdata(file_path)
+            fake_data.flags.writeable = False
+            Camera._fake_data = fake_data
+
+        if self._image_buffers is None:
+            self._image_buffers = BufferRing(Camera._fake_data.shape, Camera._fake_data.dtype)
+        image_data = self._image_buffers.acquire()
 
         if header['IMAGETYP'] == 'Dark Frame':
             # Replace example data with a bunch of random numbers
-            fake_data = np.random.randint(low=975, high=1026,
-                                          size=fake_data.shape,
-                                          dtype=fake_data.dtype)
-
-        fits_utils.write_fits(fake_data, header, filename, self.logger, exposure_event)
+            image_data[:] = np.random.randint(low=975, high=1026,
+                                              size=image_data.shape,
+                                              dtype=image_data.dtype)
+        else:
+            np.copyto(image_data, Camera._fake_data)
+
+        fits_utils.write_fits(image_data, header, filename, self.logger, exposure_event)
+        self._image_buffers.release(image_data)
 
     def _process_fits(self, file_path, info):
         file_path = super()._process_fits(file_path, info)
@@ -1,6 +1,7 @@
 import os
 import sys
 import queue
+import threading
 import time
 import warnings
 import multiprocessing
@@ -11,12 +12,15 @@ from astropy import units as u
 
 from pocs.base import PanBase
 from pocs.observatory import Observatory
+from pocs.safety import SafetyMonitor
 from pocs.state.machine import PanStateMachine
 from pocs.utils import current_time
 from pocs.utils import get_free_space
 from pocs.utils import CountdownTimer
+from pocs.utils import EventGroup
 from pocs.utils import listify
 from pocs.utils import error
+from pocs.utils import profiling
 from pocs.utils.messaging import PanMessaging
 
 
@@ -82,14 +86,38 @@ class POCS(PanStateMachine, PanBase):
         # Add observatory object, which does the bulk of the work
         self.observatory = observatory
 
+        # Keep the safety state in memory rather than reading it from the database
+        self.safety_monitor = None
+        monitor_config = self.config.get('safety_monitor', {})
+        if self.has_messaging and monitor_config.get('enabled', False):
+            self.safety_monitor = SafetyMonitor(
+                self.observatory.observer,
+                free_space_interval=monitor_config.get('free_space_interval', 60),
+                logger=self.logger,
+                db=self.db)
+            self.safety_monitor.start()
+
+        if self.config.get('profiling', {}).get('enabled', False):
+            self.start_profiling()
+
         self._connected = True
         self._initialized = False
-        self._interrupted = False
+        self._interrupt = threading.Event()
         self.force_reschedule = False
 
         self._retry_attempts = kwargs.get('retry_attempts', 3)
         self._obs_run_retries = self._retry_attempts
 
+        # Sections of the status are reused until they expire or are marked as changed.
+        status_config = self.config.get('status', {})
+        self._status_ttl = {
+            'system': status_config.get('system_ttl', 60),
+            'observatory': status_config.get('observatory_ttl', 10),
+        }
+        self._status_cache = dict()
+        self._status_changed = set(self._status_ttl)
+        self._status_state = None
+
         self.status()
 
         self.say("Hi there!")
@@ -106,7 +134,7 @@ class POCS(PanStateMachine, PanBase):
         Returns:
             bool: If an interrupt signal has been received
         """
-        return self._interrupted
+        return self._interrupt.is_set()
 
     @property
     def connected(self):
@@ -155,25 +183,58 @@ class POCS(PanStateMachine, PanBase):
             else:
                 self._initialized = True
 
+        self.mark_status_changed()
         self.status()
         return self._initialized
 
     def status(self):
-        status = dict()
+        """Get the status of the state, the system and the observatory.
 
-        try:
-            status['state'] = self.state
-            status['system'] = {
-                'free_space': get_free_space().value,
-            }
-            status['observatory'] = self.observatory.status()
-        except Exception as e:  # pragma: no cover
-            self.logger.warning("Can't get status: {}".format(e))
-        else:
-            self.send_message(status, topic='STATUS')
+        The 'system' and 'observatory' sections are cached and only recomputed once
+        they are older than their time to live (the `status.system_ttl` and
+        `status.observatory_ttl` config items, in seconds), or have been marked as
+        changed with `mark_status_changed`. A change of state marks the observatory
+        as changed. Only the recomputed sections are published, along with the state.
+
+        Returns:
+            dict: The status, using the cached value of the sections not recomputed.
+        """
+        state = self.state
+        if state != self._status_state:
+            self._status_changed.add('observatory')
+            self._status_state = state
+
+        now = time.monotonic()
+        changed = {'state': state}
+        for section, get_status in (('system', self._get_system_status),
+                                    ('observatory', self.observatory.status)):
+            cached = self._status_cache.get(section)
+            if section not in self._status_changed and cached is not None and \
+                    now - cached[0] < self._status_ttl[section]:
+                continue
 
+            try:
+                changed[section] = get_status()
+            except Exception as e:  # pragma: no cover
+                self.logger.warning("Can't get {} status: {}", section, e)
+            else:
+                self._status_cache[section] = (now, changed[section])
+                self._status_changed.discard(section)
+
+        self.send_message(changed, topic='STATUS')
+
+        status = {section: value for section, (_, value) in self._status_cache.items()}
+        status.update(changed)
         return status
 
+    def mark_status_changed(self, *sections):
+        """Recompute the given status sections, or all of them, on the next `status` call.
+
+        Args:
+            *sections (str): Any of 'system' and 'observatory'.
+        """
+        self._status_changed.update(sections or self._status_ttl)
+
     def say(self, msg):
         """ PANOPTES Units like to talk!
 
@@ -216,6 +277,37 @@ class POCS(PanStateMachine, PanBase):
             self._check_messages('command', self._cmd_queue)
             self._check_messages('schedule', self._sched_queue)
 
+    def start_profiling(self):
+        """Start profiling the regions given in the `profiling` config.
+
+        The regions are the 'scheduler' pass, the 'safety' check, 'camera' processing of
+        each exposure, 'database' writes and 'messaging'. Also called on a `start_profiling`
+        POCS-CMD message. See `pocs.utils.profiling.Profiler`.
+        """
+        profiling_config = self.config.get('profiling', {})
+        profiler = profiling.start_profiling(
+            regions=profiling_config.get('regions'),
+            mode=profiling_config.get('mode', 'deterministic'),
+            interval=profiling_config.get('interval', 0.01))
+        self.logger.info("Profiling {} ({})", sorted(profiler.regions), profiler.mode)
+
+    def stop_profiling(self):
+        """Stop profiling and dump the results to `$PANDIR/profiles`.
+
+        Also called on a `stop_profiling` POCS-CMD message and when powering down.
+
+        Returns:
+            str: The directory with the results, or None if not profiling.
+        """
+        profiler = profiling.get_profiler()
+        profile_dir = profiling.stop_profiling()
+        if profile_dir is not None:
+            for name, summary in sorted(profiler.summary().items()):
+                self.logger.info("Profiled {}: {} x {:.3f} s = {:.1f} s",
+                                 name, summary['count'], summary['mean'], summary['total'])
+            self.logger.info("Profile results in {}", profile_dir)
+        return profile_dir
+
     def power_down(self):
         """Actions to be performed upon shutdown
 
@@ -254,6 +346,11 @@ class POCS(PanStateMachine, PanBase):
             # Observatory shut down
             self.observatory.power_down()
 
+            if self.safety_monitor is not None:
+                self.safety_monitor.stop()
+
+            self.stop_profiling()
+
             # Shut down messaging
             self.logger.debug('Shutting down messaging system')
 
@@ -276,6 +373,7 @@ class POCS(PanStateMachine, PanBase):
 # Safety Methods
 ##################################################################################################
 
+    @profiling.profiled('safety')
     def is_safe(self, no_warning=False, horizon='observe'):
         """Checks the safety flag of the system to determine if safe.
 
@@ -342,7 +440,10 @@ class POCS(PanStateMachine, PanBase):
         """
         # See if dark - we check this first because we want to know
         # the sun position even if using a simulator.
-        is_dark = self.observatory.is_dark(horizon=horizon)
+        if self.safety_monitor is not None:
+            is_dark = self.safety_monitor.is_dark(horizon=horizon)
+        else:
+            is_dark = self.observatory.is_dark(horizon=horizon)
 
         # Check simulator
         with suppress(KeyError):
@@ -373,13 +474,16 @@ class POCS(PanStateMachine, PanBase):
                 self.logger.debug("Weather simulator always safe")
                 return True
 
+        if self.safety_monitor is not None:
+            return self.safety_monitor.is_weather_safe(stale=stale)
+
         # Get current weather readings from database
         try:
             record = self.db.get_current('weather')
             is_safe = record['data'].get('safe', False)
 
             timestamp = record['date'].replace(tzinfo=None)  # current_time is timezone naive
-            age = (current_time().datetime - timestamp).total_seconds()
+            age = (current_time(datetime=True) - timestamp).total_seconds()
 
             self.logger.debug("Weather Safety: {} [{:.0f} sec old - {:%Y-%m-%d %H:%M:%S}]",
                               is_safe,
@@ -407,6 +511,9 @@ class POCS(PanStateMachine, PanBase):
         Returns:
             bool: True if enough space
         """
+        if self.safety_monitor is not None:
+            return self.safety_monitor.has_free_space(required_space=required_space)
+
         free_space = get_free_space()
         return free_space.value >= required_space.to(u.gigabyte).value
 
@@ -425,9 +532,7 @@ class POCS(PanStateMachine, PanBase):
         Returns:
             bool: True if system AC power is present.
         """
-        # Always assume False
         self.logger.debug("Checking for AC power")
-        has_power = False
 
         # TODO(wtgee): figure out if we really want to simulate no power
         # Check if we are using power simulator
@@ -436,27 +541,10 @@ class POCS(PanStateMachine, PanBase):
                 self.logger.debug("AC power simulator always safe")
                 return True
 
-        # Get current power readings from database
-        try:
-            record = self.db.get_current('power')
-            has_power = bool(record['data'].get('main', False))
-
-            timestamp = record['date'].replace(tzinfo=None)  # current_time is timezone naive
-            age = (current_time().datetime - timestamp).total_seconds()
-
-            self.logger.debug("Power Safety: {} [{:.0f} sec old - {:%Y-%m-%d %H:%M:%S}]",
-                              has_power,
-                              age,
-                              timestamp)
-
-        except (TypeError, KeyError) as e:
-            self.logger.warning("No record found in DB: {}", e)
-        except Exception as e:  # pragma: no cover
-            self.logger.error("Error checking weather: {}", e)
+        if self.safety_monitor is not None:
+            has_power = self.safety_monitor.has_ac_power(stale=stale)
         else:
-            if age > stale:
-                self.logger.warning("Power record looks stale, marking unsafe.")
-                has_power = False
+            has_power = self._get_ac_power_from_db(stale)
 
         if not has_power:
             self.logger.critical('AC power not detected.')
@@ -510,17 +598,18 @@ class POCS(PanStateMachine, PanBase):
         """Wait for event(s) to be set.
 
         This method will wait for a maximum of `timeout` seconds for all of the
-        `events` to complete.
+        `events` to complete, returning as soon as the last of them is set or POCS
+        is interrupted.
 
-        Will check at least every `sleep_delay` seconds for the events to be done,
-        and also for interrupts and bad weather. Will log debug messages approximately
-        every `status_interval` seconds, and will output status messages approximately
-        every `msg_interval` seconds.
+        Will check at least every `sleep_delay` seconds for messages. Will log debug
+        messages approximately every `msg_interval` seconds, and will output status
+        approximately every `status_interval` seconds. The intervals are timed with
+        a monotonic clock.
 
         Args:
             events (list(`threading.Event`)): An Event or list of Events to wait on.
             timeout (float|`astropy.units.Quantity`): Timeout in seconds to wait for events.
-            sleep_delay (float, optional): Time in seconds between event checks.
+            sleep_delay (float, optional): Time in seconds between message checks.
             status_interval (float, optional): Time in seconds between status checks of the system.
             msg_interval (float, optional): Time in seconds between sending of status messages.
             event_type (str, optional): The type of event, used for outputting in log messages,
@@ -529,53 +618,44 @@ class POCS(PanStateMachine, PanBase):
         Raises:
             error.Timeout: Raised if events have not all been set before `timeout` seconds.
         """
-        events = listify(events)
-
         # Remove units from these values.
-        if isinstance(timeout, u.Quantity):
-            timeout = timeout.to(u.second).value
-
-        if isinstance(sleep_delay, u.Quantity):
-            sleep_delay = sleep_delay.to(u.second).value
-
-        # ADD units to these values. Ugly.
-        if not isinstance(status_interval, u.Quantity):
-            status_interval = status_interval * u.second
-
-        if not isinstance(msg_interval, u.Quantity):
-            msg_interval = msg_interval * u.second
+        timeout, sleep_delay, status_interval, msg_interval = (
+            value.to(u.second).value if isinstance(value, u.Quantity) else value
+            for value in (timeout, sleep_delay, status_interval, msg_interval))
 
         timer = CountdownTimer(timeout)
 
-        start_time = current_time()
+        start_time = time.monotonic()
         next_status_time = start_time + status_interval
         next_msg_time = start_time + msg_interval
 
-        while not all([event.is_set() for event in events]):
-            self.check_messages()
-            if self.interrupted:
-                self.logger.info("Waiting for events has been interrupted")
-                break
-
-            now = current_time()
-            if now >= next_msg_time:
-                elapsed_secs = (now - start_time).to(u.second).value
-                self.logger.debug('Waiting for {} events: {} seconds elapsed',
-                                  event_type,
-                                  round(elapsed_secs))
-                next_msg_time += msg_interval
-                now = current_time()
-
-            if now >= next_status_time:
-                self.status()
-                next_status_time += status_interval
-                now = current_time()
-
-            if timer.expired():
-                raise error.Timeout("Timedout waiting for {} event".format(event_type))
-
-            # Sleep for a little bit.
-            time.sleep(sleep_delay)
+        with EventGroup(events, interrupt=self._interrupt) as event_group:
+            while not event_group.is_set():
+                self.check_messages()
+                if self.interrupted:
+                    self.logger.info("Waiting for events has been interrupted")
+                    break
+
+                now = time.monotonic()
+                if now >= next_msg_time:
+                    self.logger.debug('Waiting for {} events: {} seconds elapsed',
+                                      event_type,
+                                      round(now - start_time))
+                    next_msg_time += msg_interval
+
+                if now >= next_status_time:
+                    self.status()
+                    next_status_time += status_interval
+
+                if timer.expired():
+                    raise error.Timeout("Timedout waiting for {} event".format(event_type))
+
+                # Wake up when the events are done or when the next check is due.
+                now = time.monotonic()
+                event_group.wait(max(0, min(sleep_delay,
+                                            timer.time_left(),
+                                            next_msg_time - now,
+                                            next_status_time - now)))
 
     def wait_until_safe(self):
         """ Waits until weather is safe.
@@ -623,11 +703,18 @@ class POCS(PanStateMachine, PanBase):
 # Private Methods
 ##################################################################################################
 
+    def _get_system_status(self):
+        return {
+            'free_space': get_free_space().value,
+        }
+
     def _check_messages(self, queue_type, q):
         cmd_dispatch = {
             'command': {
                 'park': self._interrupt_and_park,
                 'shutdown': self._interrupt_and_shutdown,
+                'start_profiling': self.start_profiling,
+                'stop_profiling': self.stop_profiling,
             },
             'schedule': {}
         }
@@ -648,14 +735,41 @@ class POCS(PanStateMachine, PanBase):
             else:
                 break
 
+    def _get_ac_power_from_db(self, stale):
+        has_power = False
+
+        # Get current power readings from database
+        try:
+            record = self.db.get_current('power')
+            has_power = bool(record['data'].get('main', False))
+
+            timestamp = record['date'].replace(tzinfo=None)  # current_time is timezone naive
+            age = (current_time(datetime=True) - timestamp).total_seconds()
+
+            self.logger.debug("Power Safety: {} [{:.0f} sec old - {:%Y-%m-%d %H:%M:%S}]",
+                              has_power,
+                              age,
+                              timestamp)
+
+        except (TypeError, KeyError) as e:
+            self.logger.warning("No record found in DB: {}", e)
+        except Exception as e:  # pragma: no cover
+            self.logger.error("Error checking weather: {}", e)
+        else:
+            if age > stale:
+                self.logger.warning("Power record looks stale, marking unsafe.")
+                has_power = False
+
+        return has_power
+
     def _interrupt_and_park(self):
         self.logger.info('Park interrupt received')
-        self._interrupted = True
+        self._interrupt.set()
         self.park()
 
     def _interrupt_and_shutdown(self):
         self.logger.warning('Shutdown command received')
-        self._interrupted = True
+        self._interrupt.set()
         self.power_down()
 
     def _setup_messaging(self):
@@ -1,16 +1,7 @@
 import os
-import matplotlib.colors as colours
-from matplotlib import cm as colormap
-
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-from astropy.modeling import models, fitting
-from scipy.ndimage import binary_dilation
 
 import numpy as np
 
-from copy import copy
 from threading import Event
 from threading import Thread
 
@@ -18,11 +9,7 @@ from threading import Thread
 from pocs.base import PanBase
 from pocs.utils import current_time
 from pocs.utils.images import focus as focus_utils
-
-palette = copy(colormap.inferno)
-palette.set_over('w', 1.0)
-palette.set_under('k', 1.0)
-palette.set_bad('g', 1.0)
+from pocs.utils.images import get_palette
 
 
 class AbstractFocuser(PanBase):
@@ -324,6 +311,13 @@ class AbstractFocuser(PanBase):
 
         See public `autofocus` for information about the parameters.
         """
+        # Only needed when focusing, and slow to import.
+        import matplotlib.colors as colours
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        from astropy.modeling import models, fitting
+        from scipy.ndimage import binary_dilation
+
         focus_type = 'fine'
         if coarse:
             focus_type = 'coarse'
@@ -488,7 +482,7 @@ class AbstractFocuser(PanBase):
 
             ax1 = fig.add_subplot(3, 1, 1)
             im1 = ax1.imshow(initial_thumbnail, interpolation='none',
-                             cmap=palette, norm=colours.LogNorm())
+                             cmap=get_palette(), norm=colours.LogNorm())
             fig.colorbar(im1)
             ax1.set_title('Initial focus position: {}'.format(initial_focus))
 
@@ -516,7 +510,7 @@ class AbstractFocuser(PanBase):
 
             ax3 = fig.add_subplot(3, 1, 3)
             im3 = ax3.imshow(final_thumbnail, interpolation='none',
-                             cmap=palette, norm=colours.LogNorm())
+                             cmap=get_palette(), norm=colours.LogNorm())
             fig.colorbar(im3)
             ax3.set_title('Final focus position: {}'.format(final_focus))
             plot_path = os.path.join(file_path_root, '{}_focus.png'.format(focus_type))
@@ -145,8 +145,7 @@ class Mount(AbstractSerialMount):
             # to see if initialized and be put into loop.
             self._is_initialized = True
 
-            actual_version = self.query('version')
-            actual_mount_info = self.query('mount_info')
+            actual_version, actual_mount_info = self.query_batch(['version', 'mount_info'])
 
             expected_version = self.commands.get('version').get('response')
             expected_mount_info = self.commands.get('mount_info').get('response')
@@ -248,19 +247,18 @@ class Mount(AbstractSerialMount):
         lat = '{:+07.0f}'.format(self.location.lat.to(u.arcsecond).value)
         lon = '{:+07.0f}'.format(self.location.lon.to(u.arcsecond).value)
 
-        self.query('set_long', lon)
-        self.query('set_lat', lat)
-
         # Time
-        self.query('disable_daylight_savings')
-
         gmt_offset = self.config.get('location').get('gmt_offset', 0)
-        self.query('set_gmt_offset', gmt_offset)
-
         now = current_time() + gmt_offset * u.minute
 
-        self.query('set_local_time', now.datetime.strftime("%H%M%S"))
-        self.query('set_local_date', now.datetime.strftime("%y%m%d"))
+        self.query_batch([
+            ('set_long', lon),
+            ('set_lat', lat),
+            'disable_daylight_savings',
+            ('set_gmt_offset', gmt_offset),
+            ('set_local_time', now.datetime.strftime("%H%M%S")),
+            ('set_local_date', now.datetime.strftime("%y%m%d")),
+        ])
 
     def _mount_coord_to_skycoord(self, mount_coords):
         """
@@ -1,5 +1,8 @@
+import threading
 import time
 
+from collections import defaultdict
+
 from astropy import units as u
 from astropy.coordinates import EarthLocation
 from astropy.coordinates import SkyCoord
@@ -8,6 +11,7 @@ from pocs.base import PanBase
 
 from pocs.utils import current_time
 from pocs.utils import error
+from pocs.utils.latency import LatencyHistogram
 
 
 class AbstractMount(PanBase):
@@ -85,6 +89,21 @@ class AbstractMount(PanBase):
         self._current_coordinates = None
         self._park_coordinates = None
 
+        # Serialises write/read pairs so the status poller and commands don't interleave.
+        self._query_lock = threading.RLock()
+        self._pipeline_queries = self.mount_config.get('pipeline_queries', False)
+        self._command_latencies = defaultdict(LatencyHistogram)
+
+        # Background status polling, see `start_status_poller`.
+        self._status_poll_interval = self.mount_config.get('status_poll_interval', 0)
+        self._status_condition = threading.Condition()
+        self._status_snapshot = None
+        self._status_snapshot_count = 0
+        self._command_count = 0
+        self._status_thread = None
+        self._status_thread_stop = threading.Event()
+        self._status_refresh = threading.Event()
+
     def connect(self):  # pragma: no cover
         raise NotImplementedError
 
@@ -96,27 +115,67 @@ class AbstractMount(PanBase):
         self._is_connected = False
 
     def status(self):
-        status = {}
-        try:
-            status['tracking_rate'] = '{:0.04f}'.format(self.tracking_rate)
-            status['ra_guide_rate'] = self.ra_guide_rate
-            status['dec_guide_rate'] = self.dec_guide_rate
-            status['movement_speed'] = self.movement_speed
+        """ Get the mount status.
 
-            current_coord = self.get_current_coordinates()
-            if current_coord is not None:
-                status['current_ra'] = current_coord.ra
-                status['current_dec'] = current_coord.dec
+        If the status poller is running (see `start_status_poller`) this returns a copy
+        of the latest snapshot without touching the serial line. The exception is when a
+        command has been sent to the mount since the snapshot was taken, in which case a
+        refresh is requested and waited for, so that e.g. a slew loop doesn't see the
+        state from before the slew started.
 
-            if self.has_target:
-                target_coord = self.get_target_coordinates()
-                status['mount_target_ra'] = target_coord.ra
-                status['mount_target_dec'] = target_coord.dec
-        except Exception as e:
-            self.logger.debug('Problem getting mount status: {}'.format(e))
+        Returns:
+            dict: The mount status.
+        """
+        if not self.is_polling_status:
+            return self._get_status()
 
-        status.update(self._update_status())
-        return status
+        with self._status_condition:
+            if not self._status_is_fresh():
+                self._status_refresh.set()
+                self._status_condition.wait_for(self._status_is_fresh,
+                                                timeout=max(2 * self._status_poll_interval, 2.))
+            return dict(self._status_snapshot or {})
+
+    def start_status_poller(self, interval=None):
+        """ Start refreshing the mount status in a background thread.
+
+        Args:
+            interval (float, optional): Seconds between refreshes, defaults to the
+                `status_poll_interval` mount config item. The poller is not started
+                if this is not a positive number.
+
+        Returns:
+            bool: True if the poller is running.
+        """
+        if interval is not None:
+            self._status_poll_interval = interval
+
+        if self.is_polling_status or not self._status_poll_interval or \
+                self._status_poll_interval <= 0:
+            return self.is_polling_status
+
+        self.logger.debug('Polling mount status every {} seconds', self._status_poll_interval)
+        self._status_thread_stop.clear()
+        self._status_thread = threading.Thread(target=self._poll_status,
+                                               name='MountStatusPoller',
+                                               daemon=True)
+        self._status_thread.start()
+        return True
+
+    def stop_status_poller(self):
+        """ Stop the background status refresh, if running. """
+        if self._status_thread is None:
+            return
+
+        self.logger.debug('Stopping mount status poller')
+        self._status_thread_stop.set()
+        self._status_refresh.set()
+        if self._status_thread is not threading.current_thread():
+            self._status_thread.join()
+        self._status_thread = None
+
+        with self._status_condition:
+            self._status_snapshot = None
 
     def initialize(self, *arg, **kwargs):  # pragma: no cover
         raise NotImplementedError
@@ -184,6 +243,19 @@ class AbstractMount(PanBase):
         """ bool: Movement speed when button pressed. """
         return self._movement_speed
 
+    @property
+    def is_polling_status(self):
+        """ bool: Whether the mount status is being refreshed in the background. """
+        return self._status_thread is not None and self._status_thread.is_alive()
+
+    @property
+    def current_coordinates(self):
+        """ astropy.coordinates.SkyCoord: The last coordinates read from the mount.
+
+        Unlike `get_current_coordinates` this doesn't query the mount.
+        """
+        return self._current_coordinates
+
     @property
     def has_target(self):
         return self._target_coordinates is not None
@@ -662,9 +734,13 @@ class AbstractMount(PanBase):
         assert self.is_initialized, self.logger.warning('Mount has not been initialized')
 
         full_command = self._get_command(cmd, params=params)
-        self.write(full_command)
 
-        response = self.read()
+        with self._query_lock:
+            self._count_command()
+            start_time = time.monotonic()
+            self.write(full_command)
+            response = self.read()
+            self._command_latencies[cmd].add(time.monotonic() - start_time)
 
         # expected_response = self._get_expected_response(cmd)
         # if str(response) != str(expected_response):
@@ -672,6 +748,61 @@ class AbstractMount(PanBase):
 
         return response
 
+    def query_batch(self, queries):
+        """Sends several queries to the mount and returns their responses.
+
+        No other traffic is sent to the mount while the batch is in progress. If the
+        `pipeline_queries` mount config item is set all of the commands are written
+        before any of the responses are read, which saves a round trip per command.
+        Otherwise each command is written and its response read in turn.
+
+        Args:
+            queries (list): Commands to send, either command names or (command, params)
+                pairs. See `query`.
+
+        Examples:
+            >>> mount.query_batch(['get_status', ('set_guide_rate', '9090')])  #doctest: +SKIP
+            ['061111', 1]
+
+        Returns:
+            list: The responses, in the same order as `queries`.
+        """
+        assert self.is_initialized, self.logger.warning('Mount has not been initialized')
+
+        queries = [(query, None) if isinstance(query, str) else tuple(query)
+                   for query in queries]
+        full_commands = [self._get_command(cmd, params=params) for cmd, params in queries]
+
+        responses = list()
+        with self._query_lock:
+            self._count_command()
+            if self._pipeline_queries:
+                # Latency of each command is from the start of the batch to its response.
+                start_time = time.monotonic()
+                for full_command in full_commands:
+                    self.write(full_command)
+                for cmd, _ in queries:
+                    responses.append(self._read_response(cmd))
+                    self._command_latencies[cmd].add(time.monotonic() - start_time)
+            else:
+                for (cmd, _), full_command in zip(queries, full_commands):
+                    start_time = time.monotonic()
+                    self.write(full_command)
+                    responses.append(self.read())
+                    self._command_latencies[cmd].add(time.monotonic() - start_time)
+
+        return responses
+
+    def get_command_latencies(self):
+        """Round trip times of the commands sent to the mount.
+
+        Returns:
+            dict: A summary of the latency histogram for each command that has been
+                sent, see `pocs.utils.latency.LatencyHistogram.to_dict`.
+        """
+        with self._query_lock:
+            return {cmd: latencies.to_dict() for cmd, latencies in self._command_latencies.items()}
+
     def write(self, cmd):
         raise NotImplementedError
 
@@ -682,6 +813,67 @@ class AbstractMount(PanBase):
 # Private Methods
 ##################################################################################################
 
+    def _get_status(self):
+        """ Query the mount for its current status. """
+        status = {}
+        try:
+            status['tracking_rate'] = '{:0.04f}'.format(self.tracking_rate)
+            status['ra_guide_rate'] = self.ra_guide_rate
+            status['dec_guide_rate'] = self.dec_guide_rate
+            status['movement_speed'] = self.movement_speed
+
+            current_coord = self.get_current_coordinates()
+            if current_coord is not None:
+                status['current_ra'] = current_coord.ra
+                status['current_dec'] = current_coord.dec
+
+            if self.has_target:
+                target_coord = self.get_target_coordinates()
+                status['mount_target_ra'] = target_coord.ra
+                status['mount_target_dec'] = target_coord.dec
+        except Exception as e:
+            self.logger.debug('Problem getting mount status: {}'.format(e))
+
+        status.update(self._update_status())
+        return status
+
+    def _count_command(self):
+        """ Note that a command is being sent, see `status`. """
+        if threading.current_thread() is not self._status_thread:
+            self._command_count += 1
+
+    def _read_response(self, cmd):
+        """Read the response to a pipelined command, see `query_batch`.
+
+        Mounts that can pipeline queries should override this to read exactly one
+        response from the connection.
+        """
+        return self.read()
+
+    def _status_is_fresh(self):
+        """ Whether the snapshot was taken after the last command was sent. """
+        return self._status_snapshot is not None and \
+            self._status_snapshot_count >= self._command_count
+
+    def _poll_status(self):
+        """ Status poller thread, refreshes the snapshot until stopped. """
+        while not self._status_thread_stop.is_set():
+            self._status_refresh.clear()
+            command_count = self._command_count
+            try:
+                status = self._get_status()
+            except Exception as e:
+                self.logger.warning('Problem polling mount status: {}', e)
+                status = None
+
+            with self._status_condition:
+                if status is not None:
+                    self._status_snapshot = status
+                self._status_snapshot_count = command_count
+                self._status_condition.notify_all()
+
+            self._status_refresh.wait(self._status_poll_interval)
+
     def _get_expected_response(self, cmd):
         """ Looks up appropriate response for command for telescope """
         # self.logger.debug('Mount Response Lookup: {}'.format(cmd))
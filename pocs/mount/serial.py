@@ -1,4 +1,5 @@
 import os
+import time
 import yaml
 
 from pocs.utils import error
@@ -137,17 +138,7 @@ class AbstractSerialMount(AbstractMount):
 
         # self.logger.debug("Mount Read: {}".format(response))
 
-        # Strip the line ending (#) and return
-        response = response.rstrip('#')
-
-        # If it is an integer, turn it into one
-        if response == '0' or response == '1':
-            try:
-                response = int(response)
-            except ValueError:
-                pass
-
-        return response
+        return self._parse_response(response)
 
 
 ##################################################################################################
@@ -166,6 +157,50 @@ class AbstractSerialMount(AbstractMount):
 
         self.logger.debug('Mount connected via serial')
 
+    def _read_response(self, cmd):
+        """Reads the response to a single pipelined command.
+
+        Responses are terminated by the post command character (`#`), except for
+        single digit responses (e.g. `1` for success), so the expected response from
+        the commands file is used to tell where the response for `cmd` ends.
+
+        Args:
+            cmd (str): The command the response is for.
+
+        Returns:
+            str or int: Response from mount, see `read`.
+        """
+        cmd_info = self.commands.get(cmd) or dict()
+        single_digit = str(cmd_info.get('response')) in ('0', '1')
+
+        response = ''
+        for _ in range(self.serial.retry_limit):
+            while True:
+                char = self.serial.read_bytes(1).decode(encoding='ascii')
+                if not char:
+                    break
+                response += char
+                if single_digit or char == self._post_cmd:
+                    return self._parse_response(response)
+            time.sleep(self.serial.retry_delay)
+
+        self.logger.warning('Incomplete response for {}: {!r}', cmd, response)
+        return self._parse_response(response)
+
+    def _parse_response(self, response):
+        """ Strips the line ending and converts `0` and `1` to int. """
+        # Strip the line ending (#) and return
+        response = response.rstrip('#')
+
+        # If it is an integer, turn it into one
+        if response == '0' or response == '1':
+            try:
+                response = int(response)
+            except ValueError:
+                pass
+
+        return response
+
     def _setup_commands(self, commands):
         """
         Does any setup for the commands needed for this mount. Mostly responsible for
@@ -237,7 +272,8 @@ class AbstractSerialMount(AbstractMount):
         return full_command
 
     def _update_status(self):
-        self._raw_status = self.query('get_status')
+        self._raw_status, guide_rate, local_time = self.query_batch(
+            ['get_status', 'get_guide_rate', 'get_local_time'])
 
         status = dict()
 
@@ -257,11 +293,10 @@ class AbstractSerialMount(AbstractMount):
             self._is_tracking = 'Tracking' in self.state
             self._is_slewing = 'Slewing' in self.state
 
-            guide_rate = self.query('get_guide_rate')
             self.ra_guide_rate = int(guide_rate[0:2]) / 100
             self.dec_guide_rate = int(guide_rate[2:]) / 100
 
-        status['timestamp'] = self.query('get_local_time')
+        status['timestamp'] = local_time
         status['tracking_rate_ra'] = self.tracking_rate
 
         return status
@@ -183,6 +183,10 @@ class Mount(AbstractMount):
     def query(self, cmd, params=None):
         self.logger.debug("Query: {} {}".format(cmd, params))
 
+    def query_batch(self, queries):
+        self.logger.debug("Query batch: {}".format(queries))
+        return [None for query in queries]
+
     def write(self, cmd):
         self.logger.debug("Write: {}".format(cmd))
 
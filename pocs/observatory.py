@@ -3,13 +3,12 @@ import os
 from collections import OrderedDict
 from datetime import datetime
 import subprocess
+import threading
 from glob import glob
 
 from astroplan import Observer
 from astropy import units as u
 from astropy.coordinates import EarthLocation
-from astropy.coordinates import get_moon
-from astropy.coordinates import get_sun
 
 from pocs.base import PanBase
 import pocs.dome
@@ -20,6 +19,8 @@ from pocs.scheduler.constraint import Altitude
 from pocs.utils import current_time
 from pocs.utils import error
 from pocs.utils import horizon as horizon_utils
+from pocs.utils.ephemeris import Ephemeris
+from pocs.utils.metrics import timed
 from pocs.utils import load_module
 from pocs.camera import AbstractCamera
 
@@ -40,6 +41,7 @@ class Observatory(PanBase):
         self.location = None
         self.earth_location = None
         self.observer = None
+        self.ephemeris = None
         self._setup_location()
 
         self.logger.info('\tSetting up mount')
@@ -64,6 +66,12 @@ class Observatory(PanBase):
 
         self.current_offset_info = None
 
+        # Analyze each exposure while the next one is taken, see `analyze_recent`.
+        self.pipeline_analysis = self.config.get('observations', {}).get('pipeline_analysis',
+                                                                         False)
+        self._analysis_thread = None
+        self._offset_lock = threading.Lock()
+
         self._image_dir = self.config['directories']['images']
         self.logger.info('\t Observatory initialized')
 
@@ -87,10 +95,10 @@ class Observatory(PanBase):
         except KeyError:
             self.logger.info(f"Can't find {horizon}_horizon, using -18°")
             horizon_deg = -18 * u.degree
-        is_dark = self.observer.is_night(at_time, horizon=horizon_deg)
+        is_dark = self.ephemeris.is_dark(at_time, horizon=horizon_deg)
 
         if not is_dark:
-            sun_pos = self.observer.altaz(at_time, target=get_sun(at_time)).alt
+            sun_pos = self.ephemeris.sun_alt(at_time)
             self.logger.debug(f"Sun {sun_pos:.02f} > {horizon_deg} [{horizon}]")
 
         return is_dark
@@ -186,6 +194,8 @@ class Observatory(PanBase):
         """Initialize the observatory and connected hardware """
         self.logger.debug("Initializing mount")
         self.mount.initialize()
+        self.mount.start_status_poller()
+        self.ephemeris.start()
         if self.dome:
             self.dome.connect()
 
@@ -193,6 +203,8 @@ class Observatory(PanBase):
         """Power down the observatory. Currently does nothing
         """
         self.logger.debug("Shutting down observatory")
+        self.mount.stop_status_poller()
+        self.ephemeris.stop()
         self.mount.disconnect()
         if self.dome:
             self.dome.disconnect()
@@ -207,8 +219,13 @@ class Observatory(PanBase):
 
             if self.mount.is_initialized:
                 status['mount'] = self.mount.status()
+                if self.mount.is_polling_status:
+                    # Use the coordinates from the last refresh rather than query the mount.
+                    current_coords = self.mount.current_coordinates
+                else:
+                    current_coords = self.mount.get_current_coordinates()
                 status['mount']['current_ha'] = self.observer.target_hour_angle(
-                    t, self.mount.get_current_coordinates())
+                    t, current_coords)
                 if self.mount.has_target:
                     status['mount']['mount_target_ha'] = self.observer.target_hour_angle(
                         t, self.mount.get_target_coordinates())
@@ -221,8 +238,8 @@ class Observatory(PanBase):
                 status['observation']['field_ha'] = self.observer.target_hour_angle(
                     t, self.current_observation.field)
 
-            evening_astro_time = self.observer.twilight_evening_astronomical(t, which='next')
-            morning_astro_time = self.observer.twilight_morning_astronomical(t, which='next')
+            evening_astro_time = self.ephemeris.twilight_evening_astronomical(t, which='next')
+            morning_astro_time = self.ephemeris.twilight_morning_astronomical(t, which='next')
 
             status['observer'] = {
                 'siderealtime': str(self.sidereal_time),
@@ -230,11 +247,11 @@ class Observatory(PanBase):
                 'localtime': local_time,
                 'local_evening_astro_time': evening_astro_time,
                 'local_morning_astro_time': morning_astro_time,
-                'local_sun_set_time': self.observer.sun_set_time(t),
-                'local_sun_rise_time': self.observer.sun_rise_time(t),
-                'local_moon_alt': self.observer.moon_altaz(t).alt,
-                'local_moon_illumination': self.observer.moon_illumination(t),
-                'local_moon_phase': self.observer.moon_phase(t),
+                'local_sun_set_time': self.ephemeris.sun_set_time(t),
+                'local_sun_rise_time': self.ephemeris.sun_rise_time(t),
+                'local_moon_alt': self.ephemeris.moon_alt(t),
+                'local_moon_illumination': self.ephemeris.moon_illumination(t),
+                'local_moon_phase': self.ephemeris.moon_phase(t),
             }
 
         except Exception as e:  # pragma: no cover
@@ -242,6 +259,7 @@ class Observatory(PanBase):
 
         return status
 
+    @timed()
     def get_observation(self, *args, **kwargs):
         """Gets the next observation from the scheduler
 
@@ -362,6 +380,7 @@ class Observatory(PanBase):
 
         self.scheduler.reset_observed_list()
 
+    @timed()
     def observe(self):
         """Take individual images for the current observation
 
@@ -394,52 +413,83 @@ class Observatory(PanBase):
 
         return camera_events
 
-    def analyze_recent(self):
+    @property
+    def is_analyzing(self):
+        """ bool: True if an exposure is being analyzed in the background """
+        return self._analysis_thread is not None and self._analysis_thread.is_alive()
+
+    @timed()
+    def analyze_recent(self, background=None):
         """Analyze the most recent exposure
 
         Compares the most recent exposure to the reference exposure and determines
         the offset between the two.
 
+        If done in the `background` the analysis runs in a thread and this returns
+        straight away, so that the next exposure can be taken at the same time. The
+        offset is stored in `current_offset_info` once known, for `update_tracking`
+        to apply between exposures. The exposure is skipped if the previous one is
+        still being analyzed.
+
+        Args:
+            background (bool, optional): Analyze in a background thread, defaults to
+                the `observations.pipeline_analysis` config item.
+
         Returns:
-            dict: Offset information
+            dict: Offset information, None if analyzing in the background
         """
-        # Clear the offset info
-        self.current_offset_info = None
+        if background is None:
+            background = self.pipeline_analysis
 
-        pointing_image_id, pointing_image = self.current_observation.pointing_image
-        self.logger.debug(
-            "Analyzing recent image using pointing image: '{}'".format(pointing_image))
+        observation = self.current_observation
+
+        if not background:
+            # Clear the offset info
+            self.current_offset_info = None
 
         try:
             # Get the image to compare
-            image_id, image_path = self.current_observation.last_exposure
+            image_id, image_path = observation.last_exposure
+        except TypeError:
+            self.logger.warning("No exposure to analyze")
+            return None
 
-            current_image = Image(image_path, location=self.earth_location)
+        try:
+            pointing_image_id, pointing_image = observation.pointing_image
+        except TypeError:
+            self.logger.warning("No pointing image to compare with")
+            return None
 
-            solve_info = current_image.solve_field(skip_solved=False)
+        if not background:
+            self._analyze_exposure(observation, image_id, image_path, pointing_image)
+            return self.current_offset_info
 
-            self.logger.debug("Solve Info: {}".format(solve_info))
+        if self.is_analyzing:
+            self.logger.debug("Still analyzing previous exposure, skipping {}", image_id)
+            return None
 
-            # Get the offset between the two
-            self.current_offset_info = current_image.compute_offset(pointing_image)
-            self.logger.debug('Offset Info: {}'.format(self.current_offset_info))
+        self._analysis_thread = threading.Thread(
+            target=self._analyze_exposure,
+            args=(observation, image_id, image_path, pointing_image),
+            name='AnalysisThread',
+            daemon=True)
+        self._analysis_thread.start()
 
-            # Store the offset information
-            self.db.insert('offset_info', {
-                'image_id': image_id,
-                'd_ra': self.current_offset_info.delta_ra.value,
-                'd_dec': self.current_offset_info.delta_dec.value,
-                'magnitude': self.current_offset_info.magnitude.value,
-                'unit': 'arcsec',
-            })
+    def wait_for_analysis(self, timeout=None):
+        """Wait for a background analysis to finish.
 
-        except error.SolveError:
-            self.logger.warning("Can't solve field, skipping")
-        except Exception as e:
-            self.logger.warning("Problem in analyzing: {}".format(e))
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait, default
+                is to wait until done.
 
-        return self.current_offset_info
+        Returns:
+            bool: True if no analysis is running.
+        """
+        if self._analysis_thread is not None:
+            self._analysis_thread.join(timeout=timeout)
+        return not self.is_analyzing
 
+    @timed()
     def update_tracking(self):
         """Update tracking with rate adjustment.
 
@@ -455,8 +505,14 @@ class Observatory(PanBase):
         Here we take the number of arcseconds that the mount is offset and,
         via the `mount.get_ms_offset`, find the number of milliseconds we
         should adjust in a given direction, one for each axis.
+
+        Each offset is only applied once.
         """
-        if self.current_offset_info is not None:
+        with self._offset_lock:
+            offset_info = self.current_offset_info
+            self.current_offset_info = None
+
+        if offset_info is not None:
             self.logger.debug("Updating the tracking")
 
             # Get the pier side of pointing image
@@ -470,7 +526,7 @@ class Observatory(PanBase):
 
             self.logger.debug("Pointing HA: {:.02f}".format(pointing_ha))
             correction_info = self.mount.get_tracking_correction(
-                self.current_offset_info,
+                offset_info,
                 pointing_ha
             )
 
@@ -501,7 +557,7 @@ class Observatory(PanBase):
         self.logger.debug("Getting headers for : {}".format(observation))
 
         t0 = current_time()
-        moon = get_moon(t0, self.observer.location)
+        moon = self.ephemeris.moon_coord(t0)
 
         headers = {
             'airmass': self.observer.altaz(t0, field).secz.value,
@@ -615,6 +671,43 @@ class Observatory(PanBase):
 # Private Methods
 ##########################################################################
 
+    def _analyze_exposure(self, observation, image_id, image_path, pointing_image):
+        """Compute the offset of an exposure from the pointing image.
+
+        Sets `current_offset_info` if `observation` is still the current one.
+        """
+        self.logger.debug(
+            "Analyzing recent image using pointing image: '{}'".format(pointing_image))
+
+        try:
+            current_image = Image(image_path, location=self.earth_location)
+
+            solve_info = current_image.solve_field(skip_solved=False)
+
+            self.logger.debug("Solve Info: {}".format(solve_info))
+
+            # Get the offset between the two
+            offset_info = current_image.compute_offset(pointing_image)
+            self.logger.debug('Offset Info: {}'.format(offset_info))
+
+            # Store the offset information
+            self.db.insert('offset_info', {
+                'image_id': image_id,
+                'd_ra': offset_info.delta_ra.value,
+                'd_dec': offset_info.delta_dec.value,
+                'magnitude': offset_info.magnitude.value,
+                'unit': 'arcsec',
+            })
+
+        except error.SolveError:
+            self.logger.warning("Can't solve field, skipping")
+        except Exception as e:
+            self.logger.warning("Problem in analyzing: {}".format(e))
+        else:
+            with self._offset_lock:
+                if observation is self.current_observation:
+                    self.current_offset_info = offset_info
+
     def _setup_location(self):
         """
         Sets up the site and location details for the observatory
@@ -670,6 +763,7 @@ class Observatory(PanBase):
                 lat=latitude, lon=longitude, height=elevation)
             self.observer = Observer(
                 location=self.earth_location, name=name, timezone=timezone)
+            self.ephemeris = Ephemeris(self.observer, logger=self.logger)
         except Exception:
             raise error.PanError(msg='Bad site information')
 
@@ -750,7 +844,8 @@ class Observatory(PanBase):
 
                 horizon_line = horizon_utils.Horizon(
                     obstructions=obstruction_list,
-                    default_horizon=default_horizon.value
+                    default_horizon=default_horizon.value,
+                    resolution=self.config['location'].get('horizon_resolution', 1)
                 )
 
                 # Simple constraint for now
@@ -0,0 +1,238 @@
+import math
+import threading
+import time
+
+import zmq
+
+from astropy import units as u
+from astropy.time import Time
+
+from pocs.base import PanBase
+from pocs.utils import current_time
+from pocs.utils import current_unix_time
+from pocs.utils import get_free_space
+from pocs.utils.messaging import PanMessaging
+
+
+class SafetyMonitor(PanBase):
+    """Keeps the state needed by the safety checks in memory.
+
+    The monitor subscribes to the `weather` and `power` messaging topics and keeps
+    the latest record for each, along with the time it was received, so that the
+    safety checks don't need to query the database. The darkness interval for each
+    horizon is computed once per night and the free disk space is only checked
+    every `free_space_interval` seconds.
+
+    Records older than the `stale` limit of the checks are treated as unsafe, as
+    with the database records used by `pocs.core.POCS`.
+
+    Args:
+        observer (astroplan.Observer): The observer used to compute the darkness
+            intervals.
+        port (int, optional): The port to subscribe to, defaults to the port the
+            messaging forwarder publishes on (`messaging.msg_port` + 1).
+        free_space_interval (float, optional): Seconds between checks of the free
+            disk space, default 60.
+    """
+
+    topics = ('weather', 'power')
+
+    def __init__(self, observer, port=None, free_space_interval=60, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.observer = observer
+        if port is None:
+            port = self.config['messaging']['msg_port'] + 1
+        self.port = port
+        self.free_space_interval = free_space_interval
+
+        # Latest (data, time received) for each topic.
+        self._records = dict()
+        # (valid from, dark from, dark until) for each horizon, as unix times.
+        self._dark_intervals = dict()
+        # (free space in gigabytes, time checked)
+        self._free_space = None
+
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def is_running(self):
+        """ bool: True if the monitor is receiving messages """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Load the current records from the database and start receiving messages."""
+        if self.is_running:
+            return
+
+        for topic in self.topics:
+            self.load_current(topic)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._receive_messages,
+                                        name='SafetyMonitor',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop receiving messages """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def update(self, topic, data, age=0.):
+        """Store the latest record for a topic.
+
+        Args:
+            topic (str): The topic, e.g. 'weather'.
+            data (dict): The record, as stored in the `current` collection.
+            age (float, optional): Seconds since the record was made, default 0.
+        """
+        self._records[topic] = (data, self._now() - age)
+
+    def load_current(self, topic):
+        """Store the record for a topic from the `current` collection in the database.
+
+        Args:
+            topic (str): The topic, which is also the name of the collection.
+        """
+        try:
+            record = self.db.get_current(topic)
+            timestamp = record['date'].replace(tzinfo=None)  # current_time is timezone naive
+            age = (current_time(datetime=True) - timestamp).total_seconds()
+            self.update(topic, record['data'], age=age)
+        except (TypeError, KeyError) as e:
+            self.logger.debug("No {} record found in DB: {}", topic, e)
+
+    def record_age(self, topic):
+        """Seconds since the latest record for a topic was made, None if there isn't one."""
+        try:
+            data, received = self._records[topic]
+        except KeyError:
+            return None
+        return self._now() - received
+
+    def is_weather_safe(self, stale=180):
+        """Whether the latest weather record says conditions are safe.
+
+        Args:
+            stale (int, optional): Number of seconds before record is stale, defaults to 180
+
+        Returns:
+            bool: Conditions are safe (True) or unsafe (False)
+        """
+        return self._check_record('weather', 'safe', stale)
+
+    def has_ac_power(self, stale=90):
+        """Whether the latest power record shows AC power.
+
+        Args:
+            stale (int, optional): Number of seconds before record is stale,
+                defaults to 90 seconds.
+
+        Returns:
+            bool: True if system AC power is present.
+        """
+        return self._check_record('power', 'main', stale)
+
+    def has_free_space(self, required_space=0.25 * u.gigabyte):
+        """Does hard drive have disk space, checked at most every `free_space_interval` seconds.
+
+        Args:
+            required_space (u.gigabyte, optional): Amount of free space required
+            for operation
+
+        Returns:
+            bool: True if enough space
+        """
+        now = time.monotonic()
+        if self._free_space is None or now - self._free_space[1] >= self.free_space_interval:
+            self._free_space = (get_free_space().to(u.gigabyte).value, now)
+        return self._free_space[0] >= required_space.to(u.gigabyte).value
+
+    def is_dark(self, horizon='observe', at_time=None):
+        """If sun is below horizon.
+
+        Args:
+            horizon (str, optional): Which horizon to use, 'flat', 'focus', or
+                'observe' (default).
+            at_time (None or `astropy.time.Time`, optional): Time at which to
+                check if dark, defaults to now.
+        """
+        now = self._now() if at_time is None else at_time.unix
+
+        interval = self._dark_intervals.get(horizon)
+        if interval is None or not interval[0] <= now < interval[2]:
+            interval = self._get_dark_interval(horizon, now)
+            if interval is None:
+                return False
+            self._dark_intervals[horizon] = interval
+
+        return interval[1] <= now < interval[2]
+
+##################################################################################################
+# Private Methods
+##################################################################################################
+
+    def _now(self):
+        """ The current unix time, honouring `$POCSTIME` (see `pocs.utils.current_time`) """
+        return current_unix_time()
+
+    def _check_record(self, topic, key, stale):
+        try:
+            data, received = self._records[topic]
+        except KeyError:
+            self.logger.warning("No {} record received", topic)
+            return False
+
+        value = bool(data.get(key, False))
+        age = self._now() - received
+        if age > stale:
+            self.logger.warning("{} record looks stale, marking unsafe.", topic.capitalize())
+            value = False
+        return value
+
+    def _get_dark_interval(self, horizon, now):
+        """Compute the darkness interval for the night containing or following `now`.
+
+        Returns:
+            tuple: The unix times from which the interval is valid, and at which it
+                gets dark and light, or None if the sun doesn't set or rise.
+        """
+        try:
+            horizon_deg = self.config['location']['{}_horizon'.format(horizon)]
+        except KeyError:
+            self.logger.info(f"Can't find {horizon}_horizon, using -18°")
+            horizon_deg = -18 * u.degree
+
+        at_time = Time(now, format='unix')
+        if self.observer.is_night(at_time, horizon=horizon_deg):
+            dark_from = self.observer.sun_set_time(at_time, which='previous', horizon=horizon_deg)
+            valid_from = dark_from
+        else:
+            dark_from = self.observer.sun_set_time(at_time, which='next', horizon=horizon_deg)
+            valid_from = at_time
+        dark_until = self.observer.sun_rise_time(dark_from, which='next', horizon=horizon_deg)
+
+        interval = (valid_from.unix, dark_from.unix, dark_until.unix)
+        if not all(math.isfinite(t) for t in interval):
+            self.logger.warning("Sun doesn't cross the {} horizon", horizon)
+            return None
+
+        self.logger.debug("Dark [{}] from {} until {}", horizon, dark_from.isot, dark_until.isot)
+        return interval
+
+    def _receive_messages(self):
+        subscriber = PanMessaging.create_subscriber(self.port, topic=self.topics[0])
+        for topic in self.topics[1:]:
+            subscriber.socket.setsockopt_string(zmq.SUBSCRIBE, topic)
+
+        try:
+            while not self._stop.is_set():
+                topic, msg_obj = subscriber.receive_message(timeout_ms=500)
+                if topic in self.topics and isinstance(msg_obj, dict) and 'data' in msg_obj:
+                    self.update(topic, msg_obj['data'])
+        finally:
+            subscriber.close()
@@ -42,6 +42,7 @@ class Altitude(BaseConstraint):
         """Create an Altitude constraint from a valid `Horizon`. """
         super().__init__(*args, **kwargs)
         assert isinstance(horizon, horizon_utils.Horizon)
+        self.horizon = horizon
         self.horizon_line = horizon.horizon_line
 
     def get_score(self, time, observer, observation, **kwargs):
@@ -50,13 +51,12 @@ class Altitude(BaseConstraint):
 
         target = observation.field
 
-        # Note we just get nearest integer
-        target_az = int(observer.altaz(time, target=target).az.value)
-        target_alt = observer.altaz(time, target=target).alt.degree
+        altaz = observer.altaz(time, target=target)
+        target_alt = altaz.alt.degree
 
         # Determine if the target altitude is above or below the determined
         # minimum elevation for that azimuth
-        min_alt = self.horizon_line[target_az]
+        min_alt = self.horizon.altitude(altaz.az)
         if target_alt < min_alt:
             self.logger.debug("\t\tBelow minimum altitude: {:.02f} < {:.02f}", target_alt, min_alt)
             veto = True
@@ -4,6 +4,7 @@ from astropy.coordinates import get_moon
 
 from pocs.utils import current_time
 from pocs.utils import listify
+from pocs.utils.profiling import profiled
 from pocs.scheduler import BaseScheduler
 
 
@@ -22,6 +23,7 @@ class Scheduler(BaseScheduler):
 # Methods
 ##########################################################################
 
+    @profiled('scheduler')
     def get_observation(self, time=None, show_all=False, reread_fields_file=False):
         """Get a valid observation
 
@@ -53,18 +55,18 @@ class Scheduler(BaseScheduler):
         }
 
         for constraint in listify(self.constraints):
-            self.logger.info("Checking Constraint: {}".format(constraint))
+            self.logger.info("Checking Constraint: {}", constraint)
             for obs_name, observation in self.observations.items():
                 if obs_name in valid_obs:
-                    self.logger.debug("\tObservation: {}".format(obs_name))
+                    self.logger.debug("\tObservation: {}", obs_name)
 
                     veto, score = constraint.get_score(
                         time, self.observer, observation, **common_properties)
 
-                    self.logger.debug("\t\tScore: {:.05f}\tVeto: {}".format(score, veto))
+                    self.logger.debug("\t\tScore: {:.05f}\tVeto: {}", score, veto)
 
                     if veto:
-                        self.logger.debug("\t\t{} vetoed by {}".format(obs_name, constraint))
+                        self.logger.debug("\t\t{} vetoed by {}", obs_name, constraint)
                         del valid_obs[obs_name]
                         continue
 
@@ -1,8 +1,12 @@
 from astroplan import FixedTarget
 from astropy.coordinates import SkyCoord
+from astropy.time import Time
 
 from pocs.base import PanBase
 
+# Parsed equinoxes, as most fields use the same one.
+_equinox_times = dict()
+
 
 class Field(FixedTarget, PanBase):
 
@@ -18,15 +22,21 @@ class Field(FixedTarget, PanBase):
             position {str} -- Center of field, can be anything accepted by
                 `~astropy.coordinates.SkyCoord`
             **kwargs {dict} -- Additional keywords to be passed to
-                `astroplan.ObservingBlock`
+                `astroplan.ObservingBlock`, and `parent` (see `pocs.base.PanBase`)
 
         """
-        PanBase.__init__(self)
+        PanBase.__init__(self, parent=kwargs.pop('parent', None))
 
         # Force an equinox
         if equinox is None:
             equinox = 'J2000'
 
+        if isinstance(equinox, str):
+            try:
+                equinox = _equinox_times[equinox]
+            except KeyError:
+                equinox = _equinox_times.setdefault(equinox, Time(equinox))
+
         super().__init__(SkyCoord(position, equinox=equinox, frame='icrs'), name=name, **kwargs)
 
         self._field_name = self.name.title().replace(' ', '').replace('-', '')
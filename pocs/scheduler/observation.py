@@ -38,9 +38,11 @@ class Observation(PanBase):
                 (default: {10})
             priority {int} -- Overall priority for field, with 1.0 being highest
                 (default: {100})
+            parent {`pocs.base.PanBase`} -- Object whose config, logger and db
+                are used, see `pocs.base.PanBase` (default: {None})
 
         """
-        PanBase.__init__(self)
+        PanBase.__init__(self, parent=kwargs.get('parent'))
 
         assert isinstance(field, Field), self.logger.error("Must be a valid Field instance")
 
@@ -228,10 +228,10 @@ class BaseScheduler(PanBase):
             field_config['exp_time'] = float(field_config['exp_time']) * u.second
 
         self.logger.debug("Adding {} to scheduler", field_config['name'])
-        field = Field(field_config['name'], field_config['position'])
+        field = Field(field_config['name'], field_config['position'], parent=self)
 
         try:
-            obs = Observation(field, **field_config)
+            obs = Observation(field, parent=self, **field_config)
         except Exception:
             raise error.InvalidObservation(
                 "Skipping invalid field config: {}".format(field_config))
@@ -263,7 +263,8 @@ class BaseScheduler(PanBase):
                 raise FileNotFoundError
 
             with open(self.fields_file, 'r') as f:
-                self._fields_list = yaml.load(f.read())
+                # The C loader (if available) is much faster for large files.
+                self._fields_list = yaml.load(f.read(), Loader=getattr(yaml, 'CLoader', yaml.Loader))
 
         if self._fields_list is not None:
             for field_config in self._fields_list:
@@ -11,6 +11,7 @@ import time
 from serial import serialutil
 import threading
 import traceback
+import zmq
 
 from pocs.utils.error import ArduinoDataError
 from pocs.utils.logger import get_root_logger
@@ -173,14 +174,35 @@ class ArduinoIO(object):
     def run(self):
         """Main loop for recording data and reading commands.
 
+        Waits for input from both the board and the command subscriber,
+        handling whichever is ready, so that commands are applied as soon
+        as they arrive rather than between readings. Serial devices
+        without a file descriptor (e.g. the simulator) are checked for
+        input every 50ms instead.
+
         This only ends if an Exception is unhandled or if a 'shutdown'
         command is received. The most likely exception is from
-        SerialData.get_and_parse_reading() in the event that the device
-        disconnects from USB.
+        SerialData.read_latest() in the event that the device disconnects
+        from USB.
         """
+        poller = zmq.Poller()
+        poller.register(self._sub.socket, zmq.POLLIN)
+        serial_fd = None
         while not self.stop_running:
-            self.read_and_record()
-            self.handle_commands()
+            # The descriptor changes if we have to reconnect.
+            fd = self._serial_fileno()
+            if fd != serial_fd:
+                if serial_fd is not None:
+                    poller.unregister(serial_fd)
+                if fd is not None:
+                    poller.register(fd, zmq.POLLIN)
+                serial_fd = fd
+
+            ready = dict(poller.poll(1000 if serial_fd is not None else 50))
+            if self._sub.socket in ready:
+                self.handle_commands(timeout=0)
+            if serial_fd is None or serial_fd in ready:
+                self.read_available()
 
     def read_and_record(self):
         """Try to get the next reading and, if successful, record it.
@@ -206,6 +228,32 @@ class ArduinoIO(object):
         self.handle_reading(reading)
         return True
 
+    def read_available(self):
+        """Record the newest complete reading waiting in the input buffer, if any.
+
+        Unlike `read_and_record` this doesn't block waiting for a reading,
+        partial lines are kept until the rest arrives.
+
+        Returns: True if a reading was recorded.
+        """
+        if not self._serial_data.is_connected:
+            self._serial_data.connect()
+        try:
+            reading = self._serial_data.get_and_parse_latest_reading(block=False)
+        except serial.SerialException as e:
+            self._logger.error('Exception raised while reading from port {}', self.port)
+            self._logger.error('Exception: {}', "\n".join(traceback.format_exc()))
+            if self.reconnect():
+                return False
+            raise e
+        if not reading:
+            return False
+        if self._report_next_reading:
+            self._logger.info('Succeeded in reading from {}; got:\n{}', self.port, reading)
+            self._report_next_reading = False
+        self.handle_reading(reading)
+        return True
+
     def connect(self):
         """Connect to the port."""
         if not self._serial_data.is_connected:
@@ -269,21 +317,22 @@ class ArduinoIO(object):
         if self._db:
             self._db.insert_current(self.board, reading)
 
-    def handle_commands(self):
-        """Read and process commands for up to 1 second.
+    def handle_commands(self, timeout=1.0):
+        """Read and process commands for up to timeout seconds.
 
-        Returns when there are no more commands available from the
-        command subscriber, or when a second has passed.
-        The interval is 1 second because we expect at least 2 seconds
-        between reports, and also expect that it probably doesn't take
-        more than 1 second for each report to be read. We could make
-        this configurable, or could dynamically adjust, such as by
-        polling for input.
+        Handles all of the commands already waiting, then waits for more
+        until timeout seconds have passed. With a timeout of 0 returns as
+        soon as there are no more commands available from the command
+        subscriber.
         """
-        timer = CountdownTimer(1.0)
-        while not timer.expired():
-            topic, msg_obj = self._sub.receive_message(blocking=True, timeout_ms=0.05)
+        timer = CountdownTimer(timeout)
+        while True:
+            topic, msg_obj = self._sub.receive_message(blocking=False)
             if not topic:
+                if timer.expired():
+                    return
+                # Wait for the next message, without spinning.
+                self._sub.socket.poll(timeout=max(1, int(timer.time_left() * 1000)))
                 continue
             self._logger.debug('Received a message for topic {}', topic)
             if topic.lower() == self._cmd_topic:
@@ -311,6 +360,15 @@ class ArduinoIO(object):
         else:
             self._logger.error('Ignoring command: {}', msg)
 
+    def _serial_fileno(self):
+        """File descriptor of the serial device, or None if it doesn't have one."""
+        try:
+            if self._serial_data.is_connected:
+                return self._serial_data.ser.fileno()
+        except Exception:
+            pass
+        return None
+
     def write(self, text):
         """Writes text (a string) to the port.
 
@@ -1,4 +1,5 @@
 import os
+import time
 import yaml
 
 from transitions import State
@@ -6,6 +7,7 @@ from transitions import State
 from pocs.utils import error
 from pocs.utils import listify
 from pocs.utils import load_module
+from pocs.utils.metrics import get_metrics
 
 can_graph = False
 try:  # pragma: no cover
@@ -43,6 +45,9 @@ class PanStateMachine(Machine):
 
         states = [self._load_state(state) for state in state_machine_table.get('states', [])]
 
+        # (unix time, perf counter) at the start of the current transition
+        self._state_start = None
+
         super(PanStateMachine, self).__init__(
             states=states,
             transitions=_transitions,
@@ -268,6 +273,7 @@ class PanStateMachine(Machine):
         Args:
             event_data(transitions.EventData):  Contains informaton about the event
          """
+        self._state_start = (time.time(), time.perf_counter())
         self.logger.debug(
             "Before calling {} from {} state".format(
                 event_data.event.name,
@@ -276,7 +282,8 @@ class PanStateMachine(Machine):
     def after_state(self, event_data):
         """ Called after each state.
 
-        Updates the mongodb collection for state stats.
+        Records the time taken by the state (i.e. by the transition, which includes
+        the `on_enter` of the state) in the `metrics` collection.
 
         Args:
             event_data(transitions.EventData):  Contains informaton about the event
@@ -287,6 +294,13 @@ class PanStateMachine(Machine):
                 event_data.event.name,
                 event_data.state.name))
 
+        if self._state_start is not None:
+            start, start_counter = self._state_start
+            self._state_start = None
+            get_metrics(self.db).record('state', event_data.state.name, start,
+                                        time.perf_counter() - start_counter,
+                                        event=event_data.event.name)
+
 
 ##################################################################################################
 # Class Methods
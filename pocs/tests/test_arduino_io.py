@@ -359,6 +359,27 @@ def test_arduino_io_board_name(serial_handlers, memory_db, msg_publisher, msg_su
         aio.board = board
 
 
+def test_arduino_io_read_available(serial_handlers, memory_db, msg_publisher, msg_subscriber,
+                                   cmd_publisher, cmd_subscriber):
+    board = 'camera'
+    port = 'arduinosimulator://?board=' + board
+    board = board + '_board'
+    with open_serial_device(port) as ser:
+        aio = arduino_io.ArduinoIO(board, ser, memory_db, msg_publisher, cmd_subscriber)
+
+        # Doesn't block waiting for a reading, so poll until one arrives.
+        timer = CountdownTimer(10)
+        while not aio.read_available():
+            assert timer.sleep(max_sleep=0.05)
+        stored_reading = memory_db.get_current(board)
+        assert stored_reading['data']['data']['name'] == board
+
+        # With no commands waiting handle_commands returns right away.
+        timer = CountdownTimer(1)
+        aio.handle_commands(timeout=0)
+        assert timer.time_left() > 0.5
+
+
 def test_arduino_io_shutdown(serial_handlers, memory_db, msg_publisher, msg_subscriber,
                              cmd_publisher, cmd_subscriber):
     """Confirm request to shutdown is recorded."""
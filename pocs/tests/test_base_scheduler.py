@@ -1,3 +1,5 @@
+import time
+
 import pytest
 import yaml
 
@@ -6,6 +8,7 @@ from astropy.coordinates import EarthLocation
 
 from astroplan import Observer
 
+from pocs.base import PanBase
 from pocs.utils import error
 from pocs.scheduler import BaseScheduler as Scheduler
 from pocs.scheduler.constraint import Duration
@@ -237,3 +240,43 @@ def test_remove_field(scheduler):
 
     scheduler.remove_observation('HD 189733')
     assert orig_keys != list(scheduler.observations.keys())
+
+
+def test_shared_base(scheduler):
+    for obs in scheduler.observations.values():
+        assert obs.config is scheduler.config
+        assert obs.db is scheduler.db
+        assert obs.field.logger is scheduler.logger
+
+
+def test_read_field_list_benchmark(observer, constraints, tmpdir):
+    """Time reading a large fields file, and the set up of the config etc for each field.
+
+    Most of the time for each field is spent parsing its position, the set up
+    of the config, logger and db is shared with the scheduler.
+    """
+    n_fields = 10000
+    fields_file = str(tmpdir.join('benchmark.yaml'))
+    with open(fields_file, 'w') as f:
+        f.write(yaml.dump([{'name': 'Field {}'.format(i),
+                            'position': '{}d {:+}d'.format(i * 360 / n_fields,
+                                                           (i % 170) - 85),
+                            'priority': 100} for i in range(n_fields)]))
+
+    scheduler = Scheduler(observer, constraints=constraints)
+    start = time.perf_counter()
+    scheduler.fields_file = fields_file
+    duration = time.perf_counter() - start
+    assert len(scheduler.observations) == n_fields
+    print('read_field_list: {:.2f} s for {} fields'.format(duration, n_fields))
+
+    n_repeats = 1000
+    timings = dict()
+    for name, kwargs in [('own', {}), ('shared', {'parent': scheduler})]:
+        start = time.perf_counter()
+        for i in range(n_repeats):
+            PanBase(**kwargs)
+        timings[name] = (time.perf_counter() - start) / n_repeats
+        print('{:>6} set up: {:.1f} us'.format(name, timings[name] * 1e6))
+
+    assert timings['shared'] < timings['own']
@@ -0,0 +1,206 @@
+"""Micro-benchmarks of the utilities POCS calls all the time.
+
+Each benchmark is timed relative to a reference workload timed in the same
+session, so that the baselines stored in `data/benchmarks.json` carry over
+between machines, and fails if it is more than `SLOWDOWN_LIMIT` times slower
+than its baseline. After a change that is meant to alter the timings, run
+
+    pytest pocs/tests/test_benchmarks.py --benchmark-save
+
+to store new baselines.
+"""
+import datetime
+import json
+import os
+import timeit
+
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.time import Time
+from bson import ObjectId
+
+from pocs.utils import current_time
+from pocs.utils import flatten_time
+from pocs.utils import serializers
+from pocs.utils.horizon import Horizon
+from pocs.utils.images import crop_data
+from pocs.utils.images.focus import mask_saturated
+from pocs.utils.images.focus import vollath_F4
+from pocs.utils.logger import logger_msg_formatter
+from pocs.utils.messaging import PanMessaging
+from pocs.utils.rs232 import _parse_json
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), 'data', 'benchmarks.json')
+
+# A benchmark fails if it takes this many times longer than its baseline.
+SLOWDOWN_LIMIT = 3.
+
+TELEMETRY_LINE = (
+    '{"name":"telemetry_board","ver":"2018-12-03","power":{"computer":1,"fan":1,"mount":1,'
+    '"cameras":1,"weather":1,"main":1},"current":{"main":387,"fan":28,"mount":34,"cameras":27},'
+    '"amps":{"main":1.80,"fan":0.13,"mount":0.16,"cameras":0.13},"humidity":42.60,'
+    '"temp_00":15.50,"temperature":[13.00,12.81,19.75]}')
+
+
+def time_per_call(func, min_time=0.02, repeat=5):
+    """Best time in seconds of a call to `func`, from `repeat` runs of at least `min_time`."""
+    number = 1
+    while True:
+        duration = timeit.timeit(func, number=number)
+        if duration >= min_time:
+            break
+        number *= 2
+    return min([duration] + timeit.repeat(func, number=number, repeat=repeat - 1)) / number
+
+
+def reference_workload():
+    """Plain Python work, like that done by most of the benchmarked functions."""
+    values = {str(i): i * 0.5 for i in range(200)}
+    return sorted('{}={:.3f}'.format(key, value) for key, value in values.items())
+
+
+@pytest.fixture(scope='module')
+def baselines(request):
+    save = request.config.getoption('benchmark_save')
+    try:
+        with open(BASELINES_FILE) as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        stored = dict()
+
+    yield stored
+
+    if save:
+        with open(BASELINES_FILE, 'w') as f:
+            json.dump(stored, f, indent=4, sort_keys=True)
+            f.write('\n')
+
+
+@pytest.fixture(scope='module')
+def reference_time():
+    return time_per_call(reference_workload)
+
+
+@pytest.fixture
+def benchmark(request, baselines, reference_time):
+    """Time a function call, comparing with (or saving) the baseline of the test.
+
+    Returns:
+        callable: Called with the function and its arguments, returns the result.
+    """
+    name = request.node.name
+
+    def run(func, *args, **kwargs):
+        relative = time_per_call(lambda: func(*args, **kwargs)) / reference_time
+        print("{}: {:.3f} x reference ({:.3g} s)".format(
+            name, relative, relative * reference_time))
+
+        if request.config.getoption('benchmark_save'):
+            baselines[name] = relative
+        elif name in baselines:
+            assert relative < SLOWDOWN_LIMIT * baselines[name], \
+                "{} is {:.1f} times slower than its baseline".format(
+                    name, relative / baselines[name])
+
+        return func(*args, **kwargs)
+
+    return run
+
+
+@pytest.fixture(scope='module')
+def image():
+    return np.random.RandomState(42).randint(0, 2**16, size=(1000, 1500)).astype(np.uint16)
+
+
+@pytest.fixture(scope='module')
+def messaging():
+    messaging = PanMessaging()
+    yield messaging
+    messaging.context.term()
+
+
+@pytest.fixture
+def status():
+    return {
+        'state': 'observing',
+        'system': {'free_space': 123.456789},
+        'observatory': {
+            'mount': {'current_ra': 123.456 * u.deg, 'tracking_rate': 1.0,
+                      'last_move_time': datetime.datetime(2018, 10, 1, 12, 0, 0)},
+            'observation': {'_id': ObjectId('5bb2a8c0e4b0f2a9c8d1e2f3'),
+                            'exp_time': 120 * u.second,
+                            'field_name': 'Wasp 33',
+                            'seq_time': Time('2018-10-01T12:00:00'),
+                            'merit': 0.98765432},
+        },
+    }
+
+
+def test_current_time(benchmark, monkeypatch):
+    monkeypatch.delenv('POCSTIME', raising=False)
+    assert isinstance(benchmark(current_time), Time)
+
+
+def test_current_time_pocstime(benchmark, monkeypatch):
+    monkeypatch.setenv('POCSTIME', '2018-10-01 12:00:00')
+    assert benchmark(current_time, pretty=True) > '2018-10-01 12:00:00'
+
+
+def test_flatten_time(benchmark):
+    assert benchmark(flatten_time, Time('2018-10-01T12:34:56.789')) == '20181001T123456'
+
+
+def test_scrub_message(benchmark, messaging, status):
+    scrubbed = benchmark(messaging.scrub_message, status)
+    assert scrubbed['system']['free_space'] == 123.457
+
+
+@pytest.mark.parametrize('fmt,args', [
+    ('{} {:.2f} {}', ('Cam00', 1.23456, 'done')),
+    ('%s %.2f %s', ('Cam00', 1.23456, 'done')),
+    ('{name} {value:.2f}', {'name': 'Cam00', 'value': 1.23456}),
+])
+def test_logger_msg_formatter(benchmark, fmt, args):
+    assert benchmark(logger_msg_formatter, fmt, args).startswith('Cam00 1.23')
+
+
+def test_parse_json(benchmark, fake_logger):
+    assert benchmark(_parse_json, TELEMETRY_LINE, fake_logger)['humidity'] == 42.6
+
+
+def test_parse_json_nan(benchmark, fake_logger):
+    line = TELEMETRY_LINE.replace('42.60', 'nan').replace('15.50', 'nan')
+    assert np.isnan(benchmark(_parse_json, line, fake_logger)['humidity'])
+
+
+def test_serializers_dumps(benchmark, messaging, status):
+    status = messaging.scrub_message(status)
+    assert benchmark(serializers.dumps, status).startswith('{')
+
+
+def test_serializers_loads(benchmark, messaging, status):
+    message = serializers.dumps(messaging.scrub_message(status))
+    assert benchmark(serializers.loads, message)['state'] == 'observing'
+
+
+def test_horizon(benchmark):
+    obstructions = [
+        [[40, 30], [40, 75]],
+        [[50, 180], [40, 200]],
+        [[60, 270], [45, 300], [35, 330]],
+    ]
+    horizon = benchmark(Horizon, obstructions=obstructions)
+    assert horizon.horizon_line[50] == 40
+
+
+def test_crop_data(benchmark, image):
+    assert benchmark(crop_data, image, box_width=200).shape == (200, 200)
+
+
+def test_mask_saturated(benchmark, image):
+    assert benchmark(mask_saturated, image).mask.any()
+
+
+def test_vollath_F4(benchmark, image):
+    assert benchmark(vollath_F4, image) != 0
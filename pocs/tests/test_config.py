@@ -1,3 +1,4 @@
+import copy
 import os
 import pytest
 import uuid
@@ -173,3 +174,61 @@ def test_location_positive_elevation(config):
 
 def test_directories(config):
     assert config['directories']['data'] == os.path.join(os.getenv('PANDIR'), 'data')
+
+
+def test_cached_copies():
+    config01 = load_config(ignore_local=True)
+    config01['name'] = 'Changed'
+    config01['location']['name'] = 'Changed'
+
+    config02 = load_config(ignore_local=True)
+    assert config02['name'] == 'Generic PANOPTES Unit'
+    assert config02['location']['name'] != 'Changed'
+    assert isinstance(config02['location']['latitude'], u.Quantity)
+
+
+def test_read_only():
+    config = load_config(ignore_local=True, read_only=True)
+    assert config is load_config(ignore_local=True, read_only=True)
+
+    with pytest.raises(TypeError):
+        config['name'] = 'Changed'
+    with pytest.raises(TypeError):
+        config['location'].update({'name': 'Changed'})
+    with pytest.raises(AttributeError):
+        config['cameras']['devices'].append({})
+
+    # Copies can be modified
+    config_copy = copy.deepcopy(config)
+    config_copy['cameras']['devices'].append({})
+    assert len(config_copy['cameras']['devices']) == len(config['cameras']['devices']) + 1
+    assert type(config.copy()) is dict
+
+
+def test_modified_file(tmpdir):
+    config_file = str(tmpdir.join('changing.yaml'))
+    with open(config_file, 'w') as f:
+        f.write(yaml.dump({'foo': 1}))
+    assert load_config(config_file)['foo'] == 1
+
+    with open(config_file, 'w') as f:
+        f.write(yaml.dump({'foo': 2}))
+    # Make sure the modification time has changed
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+    assert load_config(config_file)['foo'] == 2
+
+
+def test_reload(tmpdir):
+    config_file = str(tmpdir.join('reloaded.yaml'))
+    with open(config_file, 'w') as f:
+        f.write(yaml.dump({'foo': 1}))
+    stat = os.stat(config_file)
+    assert load_config(config_file, read_only=True)['foo'] == 1
+
+    # Same modification time, so only read again when asked to
+    with open(config_file, 'w') as f:
+        f.write(yaml.dump({'foo': 2}))
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_config(config_file, read_only=True)['foo'] == 1
+    assert load_config(config_file, read_only=True, reload=True)['foo'] == 2
@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 import random
+from astropy import units as u
 
 from pocs.utils.horizon import Horizon
 
@@ -97,3 +98,53 @@ def test_sorting():
     assert hp.obstructions == [[(10.0, 10.0), (20.0, 20.0)],
                                [(10.0, 50.0), (30.0, 60.0)],
                                [(10.0, 180.0), (30.0, 190.0)]]
+
+
+def test_horizon_line():
+    hp = Horizon(obstructions=[
+        [[40, 30], [40, 75]],
+        [[50, 180], [40, 200]],
+    ])
+    assert len(hp.horizon_line) == 360
+    assert hp.horizon_line[29] == 30
+    assert hp.horizon_line[30] == hp.horizon_line[75] == 40
+    assert hp.horizon_line[190] == 45
+    assert hp.horizon_line[201] == 30
+
+
+def test_resolution():
+    hp = Horizon(obstructions=[[[50, 180], [40, 200]]], resolution=0.5)
+    assert len(hp.horizon_line) == 720
+    assert hp.horizon_line[381] == 44.75  # 190.5 degrees
+
+    with pytest.raises(AssertionError):
+        Horizon(resolution=0.7)
+
+
+def test_obstruction_to_360():
+    hp = Horizon(obstructions=[[[50, 350], [50, 360]]])
+    assert hp.horizon_line[359] == 50
+    assert hp.horizon_line[0] == 30
+
+
+def test_altitude():
+    hp = Horizon(obstructions=[[[40, 30], [40, 75]]])
+    assert hp.altitude(50) == 40.
+    assert hp.altitude(50 * u.degree) == 40.
+    assert hp.altitude(29.5) == 35.
+    assert hp.altitude(-310) == 40.
+
+    azimuths = np.linspace(0, 360, 100)
+    assert np.array_equal(hp.altitude(azimuths), [hp.altitude(az) for az in azimuths])
+
+    # Interpolates across north.
+    hp = Horizon(obstructions=[[[60, 0], [60, 10]], [[40, 350], [40, 359]]])
+    assert hp.altitude(359.5) == 50.
+
+
+def test_is_above():
+    hp = Horizon(obstructions=[[[40, 30], [40, 75]]])
+    alt = np.array([35, 35, 45, 40]) * u.degree
+    az = np.array([20, 50, 50, 75]) * u.degree
+    assert hp.is_above(alt, az).tolist() == [True, False, True, True]
+    assert hp.is_above(35, 20)
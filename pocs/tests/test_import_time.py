@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules that should only be imported by the code that uses them.
+HEAVY_MODULES = [
+    'matplotlib',
+    'scipy',
+    'skimage',
+    'astropy.modeling',
+    'astropy.visualization',
+    'pymongo',
+]
+
+
+def cold_import(statement):
+    """Run an import statement in a new interpreter.
+
+    Returns:
+        tuple: Seconds taken by the import and the heavy modules it loaded.
+    """
+    script = '\n'.join([
+        'import sys, time',
+        'start = time.perf_counter()',
+        statement,
+        'print(time.perf_counter() - start)',
+        'print(" ".join(m for m in {!r} if m in sys.modules))'.format(HEAVY_MODULES),
+    ])
+    output = subprocess.check_output([sys.executable, '-c', script], universal_newlines=True)
+    duration, loaded = (output.splitlines() + [''])[:2]
+    return float(duration), loaded.split()
+
+
+@pytest.mark.parametrize('module', [
+    'pocs.core',
+    'pocs.observatory',
+    'pocs.camera',
+    'pocs.focuser',
+    'pocs.utils.images',
+    'peas.sensors',
+    'peas.weather',
+])
+def test_no_heavy_imports(module):
+    duration, loaded = cold_import('import {}'.format(module))
+    assert loaded == []
+
+
+def test_import_benchmark():
+    """Compare the cold start time of `pocs.core` with that of the astropy and
+    astroplan modules it can't do without, so that a regression fails here.
+
+    Importing `pocs.core` used to take close to three times as long as these.
+    """
+    n_repeats = 5
+    baseline = pocs_core = float('inf')
+    for i in range(n_repeats):
+        baseline = min(baseline, cold_import('import astropy.coordinates, astroplan')[0])
+        pocs_core = min(pocs_core, cold_import('import pocs.core')[0])
+
+    print("Cold import: astropy & astroplan {:.2f} s, pocs.core {:.2f} s".format(
+        baseline, pocs_core))
+    assert pocs_core < 2 * baseline
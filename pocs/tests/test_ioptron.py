@@ -1,11 +1,13 @@
 import os
 import pytest
+import serial
 
 from astropy.coordinates import EarthLocation
 from astropy import units as u
 
 from pocs.images import OffsetError
 from pocs.mount.ioptron import Mount
+from pocs.tests.serial_handlers import protocol_buffers
 from pocs.utils.config import load_config
 
 
@@ -127,3 +129,28 @@ def test_get_tracking_correction(mount):
 
         assert ra_info[1] == pytest.approx(correction[2], rel=1e-2)
         assert ra_info[2] == correction[3]
+
+
+def test_pipelined_query_batch(config, location):
+    serial.protocol_handler_packages.append('pocs.tests.serial_handlers')
+    config['mount'] = {
+        'brand': 'ioptron',
+        'serial': {'port': 'buffers://', 'timeout': 0., 'retry_delay': 0.01},
+        'pipeline_queries': True,
+    }
+    mount = Mount(location=location, config=config)
+    mount._is_initialized = True
+
+    protocol_buffers.ResetBuffers(b'061111#19090#+060181018221530#')
+    responses = mount.query_batch([
+        'get_status',
+        ('set_guide_rate', '9090'),
+        'get_guide_rate',
+        'get_local_time',
+    ])
+    assert responses == ['061111', 1, '9090', '+060181018221530']
+    assert protocol_buffers.GetWBufferValue() == b':GAS#:RG9090#:AG#:GLT#'
+
+    # Responses that never arrive are returned incomplete rather than hanging.
+    protocol_buffers.ResetBuffers(b'0611')
+    assert mount.query_batch(['get_status']) == ['0611']
@@ -0,0 +1,171 @@
+import ctypes
+import errno
+import time
+
+import numpy as np
+import pytest
+
+from pocs.camera import libfli
+
+WIDTH = 2048
+HEIGHT = 1536
+
+
+def expected_image(width=WIDTH, height=HEIGHT):
+    return np.repeat(np.arange(height, dtype=np.uint16), width).reshape((height, width))
+
+
+class FakeFLILibrary(object):
+    """Stand in for the FLI library CDLL, returns a known image pattern.
+
+    Each row of the fake image is filled with its row number, and readout
+    can be made to fail after a given number of rows, or to not support
+    FLIGrabFrame, to test error handling.
+    """
+
+    def __init__(self, width=WIDTH, height=HEIGHT, fail_after=None, grab_frame=True):
+        self.width = width
+        self.height = height
+        self.fail_after = fail_after
+        self.grab_frame = grab_frame
+        self.rows_grabbed = 0
+        self.calls = 0
+        self.image = expected_image(width, height)
+
+    def FLIGetLibVersion(self, version, length):
+        version.value = b'Fake FLI library'
+        return 0
+
+    def FLIGrabRow(self, handle, buff, width):
+        self.calls += 1
+        if self.fail_after is not None and self.rows_grabbed >= self.fail_after:
+            return -errno.EIO
+        row = self.image[self.rows_grabbed]
+        ctypes.memmove(buff.value, row.ctypes.data, min(width.value, row.nbytes))
+        self.rows_grabbed += 1
+        return 0
+
+    def FLIGrabFrame(self, handle, buff, buffsize, bytes_grabbed):
+        self.calls += 1
+        if not self.grab_frame:
+            return -errno.EFAULT
+        n_bytes = min(buffsize.value, self.image[:self.height].nbytes)
+        ctypes.memmove(buff.value, self.image.ctypes.data, n_bytes)
+        bytes_grabbed._obj.value = n_bytes
+        return 0
+
+
+@pytest.fixture(scope='function')
+def fake_library():
+    return FakeFLILibrary()
+
+
+@pytest.fixture(scope='function')
+def fli_driver(fake_library, monkeypatch):
+    monkeypatch.setattr(libfli.ctypes, 'CDLL', lambda library_path: fake_library)
+    return libfli.FLIDriver(library_path='libfake.so')
+
+
+def test_version(fli_driver):
+    assert fli_driver.version == 'Fake FLI library'
+
+
+def test_grab_row(fli_driver):
+    row_data = fli_driver.FLIGrabRow(ctypes.c_long(0), WIDTH)
+    assert row_data.shape == (WIDTH,)
+    assert (row_data == 0).all()
+
+
+def test_grab_row_buffer(fli_driver):
+    row_data = np.ones(WIDTH, dtype=np.uint16)
+    assert fli_driver.FLIGrabRow(ctypes.c_long(0), WIDTH, row_data) is row_data
+    assert (row_data == 0).all()
+
+
+def test_grab_rows(fli_driver, fake_library):
+    image_data = fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT)
+    assert fake_library.calls == HEIGHT
+    assert (image_data == expected_image()).all()
+
+
+def test_grab_rows_buffer(fli_driver):
+    image_data = np.empty((HEIGHT, WIDTH), dtype=np.uint16)
+    assert fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT, image_data) is image_data
+    assert (image_data == expected_image()).all()
+
+
+def test_grab_rows_bad_buffer(fli_driver):
+    with pytest.raises(ValueError):
+        fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT,
+                               np.empty((HEIGHT, WIDTH - 1), dtype=np.uint16))
+    with pytest.raises(ValueError):
+        fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT,
+                               np.empty((HEIGHT, WIDTH), dtype=np.int32))
+    with pytest.raises(ValueError):
+        fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT,
+                               np.empty((WIDTH, HEIGHT), dtype=np.uint16).T)
+
+
+def test_grab_rows_error(fli_driver, fake_library):
+    fake_library.fail_after = 100
+    image_data = np.ones((HEIGHT, WIDTH), dtype=np.uint16)
+    with pytest.raises(RuntimeError, match='Expected {} rows, got 100'.format(HEIGHT)):
+        fli_driver.FLIGrabRows(ctypes.c_long(0), WIDTH, HEIGHT, image_data)
+    assert (image_data[:100] == expected_image()[:100]).all()
+    assert (image_data[100:] == 0).all()
+
+
+def test_grab_frame(fli_driver, fake_library):
+    image_data = np.empty((HEIGHT, WIDTH), dtype=np.uint16)
+    assert fli_driver.FLIGrabFrame(ctypes.c_long(0), WIDTH, HEIGHT, image_data) is image_data
+    assert fake_library.calls == 1
+    assert (image_data == expected_image()).all()
+
+
+def test_grab_frame_short(fli_driver, fake_library):
+    fake_library.height = HEIGHT - 1
+    with pytest.raises(RuntimeError):
+        fli_driver.FLIGrabFrame(ctypes.c_long(0), WIDTH, HEIGHT)
+
+
+def test_grab_frame_unsupported(fli_driver, fake_library):
+    fake_library.grab_frame = False
+    with pytest.raises(RuntimeError):
+        fli_driver.FLIGrabFrame(ctypes.c_long(0), WIDTH, HEIGHT)
+
+
+def test_readout_benchmark(fli_driver, fake_library):
+    """Compare readout times of the bulk readout methods with the old per row readout.
+
+    The fake library does the same amount of copying for all methods, so
+    differences are due to the per row overheads on the Python side.
+    """
+    handle = ctypes.c_long(0)
+    n_repeats = 3
+
+    def per_row():
+        image_data = np.zeros((HEIGHT, WIDTH), dtype=np.uint16)
+        for i in range(image_data.shape[0]):
+            image_data[i] = fli_driver.FLIGrabRow(handle, image_data.shape[1])
+        return image_data
+
+    image_data = np.zeros((HEIGHT, WIDTH), dtype=np.uint16)
+    readouts = {'per row': per_row,
+                'grab rows': lambda: fli_driver.FLIGrabRows(handle, WIDTH, HEIGHT, image_data),
+                'grab frame': lambda: fli_driver.FLIGrabFrame(handle, WIDTH, HEIGHT, image_data)}
+
+    timings = {}
+    for name, readout in readouts.items():
+        best = None
+        for i in range(n_repeats):
+            fake_library.rows_grabbed = 0
+            start = time.perf_counter()
+            result = readout()
+            duration = time.perf_counter() - start
+            best = duration if best is None else min(best, duration)
+        assert (result == expected_image()).all()
+        timings[name] = best
+        print('{:>10}: {:.4f} s'.format(name, best))
+
+    assert timings['grab frame'] < timings['per row']
+    assert timings['grab rows'] < timings['per row']
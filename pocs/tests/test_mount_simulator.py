@@ -5,6 +5,7 @@ from astropy import units as u
 from astropy.coordinates import EarthLocation
 from astropy.coordinates import SkyCoord
 
+from pocs.mount import AbstractMount
 from pocs.mount.simulator import Mount
 from pocs.utils import altaz_to_radec
 
@@ -173,3 +174,65 @@ def test_slew_to_home(mount):
     mount.slew_to_home()
     assert mount.is_parked is False
     assert mount.is_home is True
+
+
+def test_status_poller_disabled(mount):
+    mount.initialize()
+    assert mount.start_status_poller() is False
+    assert mount.is_polling_status is False
+    assert 'state' in mount.status()
+
+
+def test_status_poller(mount):
+    mount.initialize()
+    assert mount.start_status_poller(interval=0.01) is True
+    assert mount.is_polling_status is True
+    assert mount.status()['state'] == 'Parked'
+    mount.stop_status_poller()
+    assert mount.is_polling_status is False
+
+
+def test_status_poller_refresh_after_command(mount, monkeypatch):
+    mount.initialize()
+    monkeypatch.setattr(mount, '_get_command', lambda cmd, params=None: cmd)
+
+    # Long interval so only a requested refresh picks up the new state.
+    assert mount.start_status_poller(interval=60) is True
+    assert mount.status()['state'] == 'Parked'
+
+    mount._state = 'Slewing'
+    assert mount.status()['state'] == 'Parked'
+
+    # Sending a command makes the next status call wait for a fresh snapshot.
+    AbstractMount.query(mount, 'slew_to_target')
+    assert mount.status()['state'] == 'Slewing'
+    mount.stop_status_poller()
+
+
+@pytest.fixture
+def fake_io(mount, monkeypatch):
+    """Record writes and reads made through `AbstractMount.query_batch`."""
+    mount.initialize()
+    io = list()
+    monkeypatch.setattr(mount, '_get_command', lambda cmd, params=None: cmd + str(params or ''))
+    monkeypatch.setattr(mount, 'write', lambda cmd: io.append(('write', cmd)))
+    monkeypatch.setattr(mount, 'read', lambda: io.append(('read', None)) or len(io))
+    return io
+
+
+def test_query_batch(mount, fake_io):
+    responses = AbstractMount.query_batch(mount, ['get_status', ('set_guide_rate', '9090')])
+    assert responses == [2, 4]
+    assert [op for op, _ in fake_io] == ['write', 'read', 'write', 'read']
+    assert fake_io[2] == ('write', 'set_guide_rate9090')
+
+    latencies = mount.get_command_latencies()
+    assert set(latencies) == {'get_status', 'set_guide_rate'}
+    assert latencies['get_status']['count'] == 1
+
+
+def test_query_batch_pipelined(mount, fake_io):
+    mount._pipeline_queries = True
+    responses = AbstractMount.query_batch(mount, ['get_status', 'get_guide_rate'])
+    assert responses == [3, 4]
+    assert [op for op, _ in fake_io] == ['write', 'write', 'read', 'read']
@@ -1,12 +1,15 @@
 import os
 import pytest
 
+import threading
 import time
 from astropy import units as u
 from astropy.time import Time
 
 from pocs import hardware
+import pocs.observatory
 import pocs.version
+from pocs.images import OffsetError
 from pocs.observatory import Observatory
 from pocs.scheduler.dispatch import Scheduler
 from pocs.scheduler.observation import Observation
@@ -247,6 +250,59 @@ def test_observe(observatory):
     assert len(observatory.scheduler.observed_list) == 0
 
 
+def test_analyze_recent_background(observatory, monkeypatch):
+    solving = threading.Event()
+    offset_info = OffsetError(1 * u.arcsec, 2 * u.arcsec, 3 * u.arcsec)
+
+    class SlowImage(object):
+        def __init__(self, path, location=None):
+            self.path = path
+
+        def solve_field(self, **kwargs):
+            assert solving.wait(timeout=10)
+
+        def compute_offset(self, pointing_image):
+            return offset_info
+
+    monkeypatch.setattr(pocs.observatory, 'Image', SlowImage)
+
+    os.environ['POCSTIME'] = '2016-08-13 15:00:00'
+    observation = observatory.get_observation()
+    observation.pointing_images['pointing'] = 'pointing.fits'
+    observation.exposure_list['image_1'] = 'image_1.fits'
+
+    assert observatory.analyze_recent(background=True) is None
+    assert observatory.is_analyzing
+
+    # The next exposure is skipped while still analyzing.
+    observation.exposure_list['image_2'] = 'image_2.fits'
+    assert observatory.analyze_recent(background=True) is None
+    assert observatory.current_offset_info is None
+
+    solving.set()
+    assert observatory.wait_for_analysis(timeout=10)
+    assert observatory.current_offset_info == offset_info
+
+    # Results for an observation that is no longer current are dropped.
+    solving.clear()
+    observatory.current_offset_info = None
+    observatory.analyze_recent(background=True)
+    observatory.current_observation = None
+    solving.set()
+    assert observatory.wait_for_analysis(timeout=10)
+    assert observatory.current_offset_info is None
+
+
+def test_analyze_recent_no_pointing_image(observatory):
+    os.environ['POCSTIME'] = '2016-08-13 15:00:00'
+    observation = observatory.get_observation()
+    observation.exposure_list['image_1'] = 'image_1.fits'
+
+    assert observatory.analyze_recent() is None
+    assert observatory.analyze_recent(background=True) is None
+    assert observatory.is_analyzing is False
+
+
 def test_cleanup_missing_config_keys(observatory):
     os.environ['POCSTIME'] = '2016-08-13 15:00:00'
 
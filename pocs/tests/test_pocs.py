@@ -1,5 +1,7 @@
+import json
 import os
 import pytest
+import queue
 import time
 import threading
 
@@ -9,6 +11,7 @@ from pocs import hardware
 from pocs.core import POCS
 from pocs.observatory import Observatory
 from pocs.utils import CountdownTimer
+from pocs.utils.metrics import get_metrics
 from pocs.utils.messaging import PanMessaging
 from pocs.utils import error
 from pocs.utils import current_time
@@ -190,6 +193,14 @@ def test_wait_for_events_timeout(pocs):
     pocs.wait_for_events(test_event, 10)
     assert test_event.is_set()
 
+    # Returns as soon as the last event is set, not at the next check.
+    test_events = [threading.Event(), threading.Event()]
+    test_events[0].set()
+    threading.Timer(0.5, test_events[1].set).start()
+    start = time.monotonic()
+    pocs.wait_for_events(test_events, 10, sleep_delay=5)
+    assert time.monotonic() - start < 2
+
     test_event = threading.Event()
 
     def set_event():
@@ -197,7 +208,7 @@ def test_wait_for_events_timeout(pocs):
             time.sleep(1)
 
     def interrupt():
-        pocs._interrupted = True
+        pocs._interrupt.set()
 
     # Wait for 60 seconds (interrupts below)
     t = threading.Timer(60.0, set_event)
@@ -301,6 +312,75 @@ def test_run_wait_until_safe(observatory, cmd_publisher, msg_subscriber):
     assert pocs_thread.is_alive() is False
 
 
+def test_profiling_commands(pocs, monkeypatch, tmpdir):
+    monkeypatch.setenv('PANDIR', str(tmpdir))
+    pocs.config['profiling'] = {'regions': ['safety', 'scheduler']}
+    commands = queue.Queue()
+
+    commands.put({'message': 'start_profiling'})
+    pocs._check_messages('command', commands)
+    pocs.is_safe()
+    pocs.observatory.get_observation()
+
+    commands.put({'message': 'stop_profiling'})
+    pocs._check_messages('command', commands)
+    profile_dirs = os.listdir(os.path.join(str(tmpdir), 'profiles'))
+    assert len(profile_dirs) == 1
+
+    profile_dir = os.path.join(str(tmpdir), 'profiles', profile_dirs[0])
+    with open(os.path.join(profile_dir, 'summary.json')) as f:
+        regions = json.load(f)['regions']
+    assert sorted(regions) == ['safety', 'scheduler']
+    assert regions['safety']['count'] == 1
+    assert os.path.exists(os.path.join(profile_dir, 'scheduler.prof'))
+
+    # Not profiling any more.
+    assert pocs.stop_profiling() is None
+
+
+def test_status_cache(pocs, monkeypatch):
+    calls = list()
+    observatory_status = pocs.observatory.status
+
+    def count_status():
+        calls.append('observatory')
+        return observatory_status()
+
+    messages = list()
+    monkeypatch.setattr(pocs.observatory, 'status', count_status)
+    monkeypatch.setattr(pocs, 'send_message',
+                        lambda msg, topic: topic == 'STATUS' and messages.append(msg))
+    pocs.mark_status_changed()
+
+    status = pocs.status()
+    assert sorted(status) == ['observatory', 'state', 'system']
+    assert sorted(messages[-1]) == ['observatory', 'state', 'system']
+
+    # Reused, and only the state is published.
+    assert pocs.status()['observatory'] is status['observatory']
+    assert messages[-1] == {'state': 'sleeping'}
+    assert len(calls) == 1
+
+    pocs.mark_status_changed('observatory')
+    assert sorted(pocs.status()) == ['observatory', 'state', 'system']
+    assert sorted(messages[-1]) == ['observatory', 'state']
+    assert len(calls) == 2
+
+    # Expired.
+    pocs._status_ttl['observatory'] = 0
+    pocs.status()
+    assert len(calls) == 3
+    pocs._status_ttl['observatory'] = 10
+
+    # A new state recomputes the observatory status.
+    pocs.initialize()
+    pocs.get_ready()
+    assert messages[-1]['state'] == 'ready'
+    assert 'observatory' in messages[-1]
+    pocs.status()
+    assert messages[-1] == {'state': 'ready'}
+
+
 def test_unsafe_park(pocs):
     pocs.initialize()
     assert pocs.is_initialized is True
@@ -414,10 +494,19 @@ def test_run_complete(pocs):
     pocs.initialize()
     assert pocs.is_initialized is True
 
+    start = time.time()
     pocs.run(exit_when_done=True, run_once=True)
     assert pocs.state == 'sleeping'
     pocs.power_down()
 
+    # The states, observatory methods and camera stages were timed.
+    report = get_metrics(pocs.db).duty_cycle_report(start=start)
+    assert report['states']['scheduling']['count'] >= 1
+    assert report['states']['sleeping']['count'] == 1
+    assert report['methods']['Observatory.get_observation']['count'] >= 1
+    assert report['cameras']['exposure']['count'] >= 1
+    assert 0 <= report['duty_cycle'] < 1
+
 
 def test_run_power_down_interrupt(observatory, cmd_publisher, msg_subscriber):
     os.environ['POCSTIME'] = '2016-09-09 08:00:00'
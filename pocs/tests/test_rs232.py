@@ -145,6 +145,31 @@ def test_basic_io(handler):
     assert not ser.is_connected
 
 
+def test_latest_only(handler):
+    backlog = b'1}\r\n{"a": 2}\r\n{"a": 3}\r\n{"a": 4}\r\n{"a":'
+    protocol_buffers.ResetBuffers(backlog)
+    ser = rs232.SerialData(port='buffers://', baudrate=9600, retry_delay=0.01, retry_limit=2,
+                           latest_only=True)
+
+    # The backlog is skipped over, only the newest complete line is parsed.
+    (ts, data) = ser.get_and_parse_reading()
+    assert data == {'a': 4}
+    assert ser.lines_dropped == 3
+    assert ser.read_lag == pytest.approx(len(backlog) * 10 / 9600)
+
+    # The trailing fragment is completed by the next read.
+    protocol_buffers.SetRBufferValue(b' 5}\r\n')
+    (ts, data) = ser.get_and_parse_reading()
+    assert data == {'a': 5}
+    assert ser.lines_dropped == 3
+
+    # Nothing more to read.
+    assert ser.get_and_parse_reading(retry_limit=1) is None
+    assert ser.read_lag == 0
+
+    ser.disconnect()
+
+
 class HookedSerialHandler(NoOpSerial):
     """Sources a line of text repeatedly, and sinks an infinite amount of input."""
 
@@ -0,0 +1,115 @@
+import os
+import time
+
+import pytest
+
+from astroplan import Observer
+from astropy import units as u
+from astropy.coordinates import EarthLocation
+from astropy.time import Time
+
+from pocs.safety import SafetyMonitor
+
+
+@pytest.fixture(scope='function')
+def observer(config):
+    location = config['location']
+    earth_location = EarthLocation(lat=location['latitude'],
+                                   lon=location['longitude'],
+                                   height=location['elevation'])
+    return Observer(location=earth_location, timezone=location['timezone'])
+
+
+@pytest.fixture(scope='function')
+def monitor(config, observer, db):
+    os.environ['POCSTIME'] = '2016-08-13 23:00:00'
+    monitor = SafetyMonitor(observer, config=config, db=db)
+    yield monitor
+    monitor.stop()
+    os.environ.pop('POCSTIME', None)
+
+
+def test_no_records(monitor):
+    assert monitor.is_weather_safe() is False
+    assert monitor.has_ac_power() is False
+    assert monitor.record_age('weather') is None
+
+
+def test_weather_and_power(monitor):
+    monitor.update('weather', {'safe': True})
+    monitor.update('power', {'main': 12.4})
+    assert monitor.is_weather_safe() is True
+    assert monitor.has_ac_power() is True
+
+    monitor.update('weather', {'safe': False})
+    monitor.update('power', {'main': 0.})
+    assert monitor.is_weather_safe() is False
+    assert monitor.has_ac_power() is False
+
+
+def test_stale_records(monitor):
+    monitor.update('weather', {'safe': True}, age=170)
+    monitor.update('power', {'main': True}, age=60)
+    assert monitor.is_weather_safe() is True
+    assert monitor.has_ac_power() is True
+    assert monitor.has_ac_power(stale=30) is False
+
+    # Set a time 181 seconds later
+    os.environ['POCSTIME'] = '2016-08-13 23:03:01'
+    assert monitor.is_weather_safe() is False
+    assert monitor.has_ac_power() is False
+
+
+def test_load_current(monitor):
+    monitor.db.insert_current('weather', {'safe': True})
+    monitor.load_current('weather')
+    assert monitor.is_weather_safe() is True
+
+    # Set a time 181 seconds later
+    os.environ['POCSTIME'] = '2016-08-13 23:05:01'
+    assert monitor.is_weather_safe() is False
+
+
+def test_is_dark(monitor, observer, config):
+    horizon = config['location']['observe_horizon']
+    start = Time('2016-08-13 00:00:00')
+    for minutes in range(0, 48 * 60, 17):
+        at_time = start + minutes * u.minute
+        assert monitor.is_dark(at_time=at_time) == observer.is_night(at_time, horizon=horizon)
+
+    # The interval is only computed once per night
+    assert len(monitor._dark_intervals) == 1
+    interval = monitor._dark_intervals['observe']
+    assert monitor.is_dark(at_time=Time(interval[1] + 60, format='unix')) is True
+    assert monitor._dark_intervals['observe'] is interval
+
+
+def test_free_space(monitor):
+    assert monitor.has_free_space() is True
+    assert monitor.has_free_space(required_space=1e9 * u.gigabyte) is False
+
+    # Cached between checks
+    checked = monitor._free_space
+    monitor.has_free_space()
+    assert monitor._free_space is checked
+
+
+def test_messages(monitor, msg_publisher, message_forwarder):
+    os.environ.pop('POCSTIME', None)
+    monitor.port = message_forwarder['msg_ports'][1]
+    monitor.start()
+    assert monitor.is_running
+
+    for i in range(20):
+        msg_publisher.send_message('weather', {'data': {'safe': True}})
+        msg_publisher.send_message('power', {'data': {'main': True}})
+        if monitor.is_weather_safe() and monitor.has_ac_power():
+            break
+        time.sleep(0.5)
+
+    assert monitor.is_weather_safe() is True
+    assert monitor.has_ac_power() is True
+    assert monitor.record_age('weather') < 5
+
+    monitor.stop()
+    assert not monitor.is_running
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from pocs.utils.images.buffers import BufferRing
+
+
+def test_bad_size():
+    with pytest.raises(ValueError):
+        BufferRing((10, 20), size=0)
+
+
+def test_acquire_release():
+    ring = BufferRing((10, 20), size=2)
+    assert ring.n_free == 2
+
+    data = ring.acquire()
+    assert data.shape == (10, 20)
+    assert data.dtype == np.uint16
+    assert ring.n_free == 1
+
+    ring.release(data)
+    assert ring.n_free == 2
+
+    # Releasing twice doesn't add the array to the ring again
+    ring.release(data)
+    assert ring.n_free == 2
+
+
+def test_reuse_order():
+    ring = BufferRing((10, 20), size=2)
+    first = ring.acquire()
+    second = ring.acquire()
+    assert first is not second
+
+    ring.release(second)
+    ring.release(first)
+    assert ring.acquire() is second
+    assert ring.acquire() is first
+
+
+def test_exhausted():
+    ring = BufferRing((10, 20), dtype=np.float32, size=1)
+    data = ring.acquire()
+    temporary = ring.acquire()
+    assert temporary is not data
+    assert temporary.shape == (10, 20)
+    assert temporary.dtype == np.float32
+
+    # Temporary arrays don't join the ring
+    ring.release(temporary)
+    assert ring.n_free == 0
+    ring.release(data)
+    assert ring.n_free == 1
+
+
+def test_matches():
+    ring = BufferRing((10, 20))
+    assert ring.matches((10, 20))
+    assert ring.matches([10, 20], dtype='uint16')
+    assert not ring.matches((20, 10))
+    assert not ring.matches((10, 20), dtype=np.int32)
+
+
+def test_context_manager():
+    ring = BufferRing((10, 20), size=1)
+    with ring.buffer() as data:
+        assert ring.n_free == 0
+        data[:] = 42
+    assert ring.n_free == 1
+    assert (ring.acquire() == 42).all()
@@ -0,0 +1,83 @@
+import pytest
+
+from astroplan import Observer
+from astropy import units as u
+from astropy.coordinates import EarthLocation
+from astropy.coordinates import get_moon
+from astropy.coordinates import SkyCoord
+from astropy.time import Time
+
+from pocs.utils.ephemeris import Ephemeris
+
+
+@pytest.fixture(scope='module')
+def observer():
+    location = EarthLocation(lat=19.54 * u.deg, lon=-155.58 * u.deg, height=3400 * u.m)
+    return Observer(location=location, timezone='US/Hawaii')
+
+
+@pytest.fixture(scope='function')
+def ephemeris(observer):
+    ephemeris = Ephemeris(observer)
+    ephemeris.update(Time('2016-08-13 23:00:00'))
+    return ephemeris
+
+
+@pytest.mark.parametrize('which', ['next', 'previous', 'nearest'])
+@pytest.mark.parametrize('horizon', [0, -6, -12, -18])
+def test_sun_set_rise(ephemeris, observer, which, horizon):
+    t = Time('2016-08-13 23:00:00')
+    horizon = horizon * u.degree
+    for ours, theirs in [(ephemeris.sun_set_time, observer.sun_set_time),
+                         (ephemeris.sun_rise_time, observer.sun_rise_time)]:
+        difference = ours(t, which=which, horizon=horizon) - \
+            theirs(t, which=which, horizon=horizon)
+        assert abs(difference.to(u.second).value) < 5
+
+
+def test_is_dark(ephemeris, observer):
+    t = Time('2016-08-13 23:00:00')
+    for minutes in range(-12 * 60, 36 * 60, 7):
+        at_time = t + minutes * u.minute
+        for horizon in [-6, -18] * u.degree:
+            assert ephemeris.is_dark(at_time, horizon=horizon) == \
+                observer.is_night(at_time, horizon=horizon)
+
+
+def test_moon(ephemeris, observer):
+    field = SkyCoord('20h00m00s +20d00m00s')
+    for t in Time(['2016-08-13 13:07:00', '2016-08-14 02:51:00', '2016-08-14 20:33:00']):
+        assert ephemeris.moon_alt(t).value == pytest.approx(observer.moon_altaz(t).alt.value,
+                                                            abs=0.1)
+        assert ephemeris.moon_illumination(t) == pytest.approx(observer.moon_illumination(t),
+                                                               abs=1e-3)
+        assert ephemeris.moon_phase(t).value == pytest.approx(observer.moon_phase(t).value,
+                                                              abs=1e-3)
+        separation = field.separation(ephemeris.moon_coord(t))
+        assert separation.value == pytest.approx(
+            field.separation(get_moon(t, observer.location)).value, abs=0.01)
+
+
+def test_update_outside_timeline(ephemeris):
+    timeline = ephemeris._timeline
+    ephemeris.is_dark(Time('2016-08-14 12:00:00'))
+    assert ephemeris._timeline is timeline
+
+    ephemeris.is_dark(Time('2016-09-01 12:00:00'))
+    assert ephemeris._timeline is not timeline
+    assert ephemeris._timeline['times'][0] == pytest.approx(Time('2016-09-01 00:00:00').unix)
+
+
+def test_next_refresh(ephemeris):
+    # Local noon in Hawaii is 22:00 UTC
+    assert ephemeris._next_refresh(Time('2016-08-13 21:00:00')) == pytest.approx(3600)
+    assert ephemeris._next_refresh(Time('2016-08-13 23:00:00')) == pytest.approx(23 * 3600)
+
+
+def test_start_stop(observer):
+    ephemeris = Ephemeris(observer)
+    ephemeris.start()
+    assert ephemeris.is_running
+    ephemeris.stop()
+    assert not ephemeris.is_running
+    assert ephemeris._timeline is not None
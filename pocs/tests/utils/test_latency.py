@@ -0,0 +1,32 @@
+import math
+
+from pocs.utils.latency import LatencyHistogram
+
+
+def test_empty():
+    latencies = LatencyHistogram()
+    assert latencies.count == 0
+    assert math.isnan(latencies.mean)
+    assert math.isnan(latencies.percentile(50))
+    assert latencies.to_dict()['max'] is None
+
+
+def test_bins():
+    latencies = LatencyHistogram(edges=[0.1, 1])
+    for seconds in (0.05, 0.1, 0.5, 2, 3):
+        latencies.add(seconds)
+    assert latencies.counts == [2, 1, 2]
+    assert latencies.count == 5
+    assert latencies.min == 0.05
+    assert latencies.max == 3
+
+
+def test_percentile():
+    latencies = LatencyHistogram(edges=[0.1, 1])
+    for seconds in (0.01, 0.02, 0.5, 5):
+        latencies.add(seconds)
+    assert latencies.percentile(0) == 0.1
+    assert latencies.percentile(50) == 0.1
+    assert latencies.percentile(75) == 1
+    # Percentiles in the overflow bin are reported as the largest sample.
+    assert latencies.percentile(100) == 5
@@ -1,7 +1,17 @@
+import io
+import logging
+import logging.handlers
+import queue
+import threading
+
 import pytest
 
+from pocs.utils.logger import PanQueueHandler
+from pocs.utils.logger import StrFormatLogRecord
+from pocs.utils.logger import _formatting_method_names
 from pocs.utils.logger import field_name_to_key
 from pocs.utils.logger import format_has_reference_keys
+from pocs.utils.logger import get_root_logger
 from pocs.utils.logger import logger_msg_formatter
 
 
@@ -103,3 +113,71 @@ def test_logger_msg_formatter_1_non_dict():
     for fmt in tests:
         with pytest.warns(UserWarning):
             assert logger_msg_formatter(fmt, d) == fmt
+
+
+def test_logger_msg_formatter_memoized():
+    fmt = 'Memoized {} {}'
+    logger_msg_formatter(fmt, ['abc', 123])
+    hits = _formatting_method_names.cache_info().hits
+    assert logger_msg_formatter(fmt, ['def', 456]) == 'Memoized def 456'
+    assert _formatting_method_names.cache_info().hits == hits + 1
+
+    # Whether the keys are referenced still depends on the args.
+    fmt = 'Memoized {xyz}'
+    assert logger_msg_formatter(fmt, dict(xyz=1)) == 'Memoized 1'
+    with pytest.warns(UserWarning):
+        assert logger_msg_formatter(fmt, dict(abc=1)) == fmt
+
+
+def test_message_formatted_once():
+    class CountingArg(object):
+        count = 0
+
+        def __format__(self, spec):
+            self.count += 1
+            return 'counted'
+
+    arg = CountingArg()
+    record = StrFormatLogRecord('test', logging.INFO, __file__, 1, 'Once {}', (arg,), None)
+    assert record.getMessage() == 'Once counted'
+    assert record.getMessage() == 'Once counted'
+    assert arg.count == 1
+
+
+def test_queue_handler():
+    get_root_logger()  # Sets the record factory.
+    stream = io.StringIO()
+    emitted_by = []
+
+    class StreamHandler(logging.StreamHandler):
+        def emit(self, record):
+            emitted_by.append(threading.current_thread())
+            super().emit(record)
+
+    handler = StreamHandler(stream)
+    handler.setLevel(logging.INFO)
+    record_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(record_queue, handler, respect_handler_level=True)
+    logger = logging.getLogger('test_queue_handler')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(PanQueueHandler(record_queue, listener))
+
+    logger.debug('Not written {}', 1)
+    logger.info('Written {}', 2)
+
+    # Queued without being formatted.
+    assert record_queue.qsize() == 2
+    assert not any(hasattr(record, 'message') for record in record_queue.queue)
+
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue() == 'Written 2\n'
+    assert emitted_by and threading.current_thread() not in emitted_by
+
+
+def test_root_logger_queued():
+    get_root_logger()
+    handlers = logging.getLogger().handlers
+    assert any(isinstance(handler, PanQueueHandler) for handler in handlers)
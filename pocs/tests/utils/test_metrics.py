@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from pocs.utils.metrics import Metrics
+from pocs.utils.metrics import duty_cycle_report
+from pocs.utils.metrics import get_metrics
+from pocs.utils.metrics import nightly_reports
+from pocs.utils.metrics import timed
+
+
+class Timed(object):
+    def __init__(self, db):
+        self.db = db
+
+    @timed()
+    def method(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+
+def test_record(memory_db):
+    metrics = Metrics(db=memory_db, max_records=2)
+    timing = metrics.record('camera', 'exposure', start=100., duration=10., camera='Cam00')
+    assert timing == {'kind': 'camera', 'name': 'exposure', 'start': 100., 'end': 110.,
+                      'duration': 10., 'camera': 'Cam00'}
+    assert memory_db.collections['metrics']
+
+    metrics.record('state', 'observing', start=110., duration=10.)
+    metrics.record('state', 'analyzing', start=120., duration=10.)
+    assert [r['name'] for r in metrics.records()] == ['observing', 'analyzing']
+    assert [r['name'] for r in metrics.records(start=125.)] == ['analyzing']
+    assert [r['name'] for r in metrics.records(end=115.)] == ['observing']
+    assert metrics.records(kind='camera') == []
+
+
+def test_timed(memory_db):
+    obj = Timed(memory_db)
+    start = time.time()
+    assert obj.method(0.1) == 0.1
+
+    metrics = get_metrics(memory_db)
+    timing = metrics.records(start=start, kind='method')[-1]
+    assert timing['name'] == 'Timed.method'
+    assert timing['duration'] == pytest.approx(0.1, abs=0.05)
+    assert get_metrics(memory_db) is metrics
+
+
+def test_duty_cycle_report():
+    records = [
+        {'kind': 'state', 'name': 'slewing', 'start': 0., 'duration': 60.},
+        {'kind': 'state', 'name': 'observing', 'start': 60., 'duration': 125.},
+        {'kind': 'camera', 'name': 'exposure', 'camera': 'Cam00', 'start': 60., 'duration': 120.},
+        {'kind': 'camera', 'name': 'exposure', 'camera': 'Cam01', 'start': 60., 'duration': 110.},
+        {'kind': 'state', 'name': 'analyzing', 'start': 185., 'duration': 15.},
+        {'kind': 'state', 'name': 'observing', 'start': 200., 'duration': 125.},
+        {'kind': 'camera', 'name': 'exposure', 'camera': 'Cam00', 'start': 200., 'duration': 120.},
+    ]
+    for r in records:
+        r['end'] = r['start'] + r['duration']
+
+    report = duty_cycle_report(records)
+    assert report['elapsed'] == 325.
+    assert report['duty_cycle'] == pytest.approx(250. / 325.)
+    assert report['exposing'] == pytest.approx(240. / 325.)
+    assert report['states']['observing']['count'] == 2
+    assert report['states']['observing']['mean'] == 125.
+    assert report['states']['slewing']['fraction'] == pytest.approx(60. / 325.)
+    assert report['cameras']['exposure']['count'] == 3
+
+    assert duty_cycle_report([])['duty_cycle'] == 0.
+
+
+def test_nightly_reports():
+    day = 24 * 3600.
+    # Local (UTC - 10) evenings of the 1st and 2nd, and the morning of the 3rd.
+    starts = [day + 8 * 3600, day + day + 6 * 3600, day + day + 20 * 3600]
+    records = [{'kind': 'state', 'name': 'observing', 'start': start, 'end': start + 100.,
+                'duration': 100.} for start in starts]
+
+    reports = nightly_reports(records, utc_offset=-10)
+    assert list(reports) == ['1970-01-01', '1970-01-02']
+    assert reports['1970-01-02']['states']['observing']['count'] == 2
@@ -0,0 +1,91 @@
+import json
+import os
+import pstats
+import threading
+import time
+
+import pytest
+
+from pocs.utils import profiling
+from pocs.utils.profiling import Profiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@profiling.profiled('camera')
+def process(seconds):
+    busy(seconds)
+    return seconds
+
+
+@pytest.fixture(scope='function')
+def stop_profiling():
+    yield
+    profiling.stop_profiling()
+
+
+def test_bad_mode():
+    with pytest.raises(ValueError):
+        Profiler(mode='tracing')
+
+
+def test_not_profiling():
+    assert profiling.get_profiler() is None
+    assert process(0.01) == 0.01
+    with profiling.profile_region('camera'):
+        pass
+    assert profiling.stop_profiling() is None
+
+
+def test_deterministic(tmpdir, stop_profiling):
+    profiler = profiling.start_profiling(regions=['camera', 'database'],
+                                         output_dir=str(tmpdir))
+    assert profiling.start_profiling() is profiler
+
+    threads = [threading.Thread(target=process, args=(0.05,)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with profiling.profile_region('camera'):
+        # Nested regions are timed but profiled as part of the outer region.
+        with profiling.profile_region('database'):
+            busy(0.01)
+    with profiling.profile_region('messaging'):
+        pass
+
+    profile_dir = profiling.stop_profiling()
+    assert profiling.get_profiler() is None
+    assert os.path.dirname(profile_dir) == str(tmpdir)
+
+    with open(os.path.join(profile_dir, 'summary.json')) as f:
+        summary = json.load(f)
+    assert summary['mode'] == 'deterministic'
+    assert summary['regions']['camera']['count'] == 4
+    assert summary['regions']['camera']['total'] >= 0.16
+    assert summary['regions']['database']['count'] == 1
+    assert 'messaging' not in summary['regions']
+
+    assert sorted(os.listdir(profile_dir)) == ['camera.prof', 'camera.txt', 'summary.json']
+    stats = pstats.Stats(os.path.join(profile_dir, 'camera.prof'))
+    assert any(func[2] == 'busy' for func in stats.stats)
+
+
+def test_sampling(tmpdir, stop_profiling):
+    profiling.start_profiling(mode='sampling', interval=0.005, output_dir=str(tmpdir))
+    process(0.2)
+    profile_dir = profiling.stop_profiling()
+
+    with open(os.path.join(profile_dir, 'summary.json')) as f:
+        summary = json.load(f)
+    assert summary['mode'] == 'sampling'
+    assert summary['regions']['camera']['count'] == 1
+
+    with open(os.path.join(profile_dir, 'camera.stacks')) as f:
+        stacks = [line.rsplit(' ', 1) for line in f]
+    assert sum(int(count) for stack, count in stacks) > 10
+    assert any(stack.endswith('test_profiling:busy') for stack, count in stacks)
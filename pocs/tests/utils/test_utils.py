@@ -1,15 +1,19 @@
 import os
 import pytest
 import signal
+import threading
 import time
 from datetime import datetime as dt
 from astropy import units as u
 
 from pocs.utils import current_time
+from pocs.utils import current_datetime
+from pocs.utils import current_unix_time
 from pocs.utils import DelaySigTerm
 from pocs.utils import listify
 from pocs.utils import load_module
 from pocs.utils import CountdownTimer
+from pocs.utils import EventGroup
 from pocs.utils import error
 from pocs.camera import list_connected_cameras
 
@@ -67,6 +71,25 @@ def test_pretty_time():
     assert t3 == dt(2016, 8, 13, 10, 0, 2)
 
 
+def test_pocstime_changed(monkeypatch):
+    monkeypatch.setenv('POCSTIME', '2016-08-13 10:00:00')
+    assert current_datetime() == dt(2016, 8, 13, 10, 0, 0)
+    assert current_time().isot == '2016-08-13T10:00:01.000'
+    assert os.environ['POCSTIME'] == '2016-08-13T10:00:02'
+
+    # Setting the same time again starts from it again.
+    monkeypatch.setenv('POCSTIME', '2016-08-13 10:00:00')
+    assert current_time(pretty=True) == '2016-08-13 10:00:00'
+
+    monkeypatch.setenv('POCSTIME', '2016-08-13T23:59:59.5')
+    assert current_unix_time() == 1471132799.5
+    assert current_datetime() == dt(2016, 8, 14, 0, 0, 0, 500000)
+
+    monkeypatch.delenv('POCSTIME')
+    assert abs(current_unix_time() - time.time()) < 1
+    assert abs(current_time().unix - time.time()) < 1
+
+
 def test_list_connected_cameras():
     ports = list_connected_cameras()
     assert isinstance(ports, list)
@@ -118,6 +141,27 @@ def test_countdown_timer():
     assert timer.expired() is True
 
 
+def test_event_group():
+    events = [threading.Event(), threading.Event()]
+    interrupt = threading.Event()
+
+    with EventGroup(events, interrupt=interrupt) as group:
+        events[0].set()
+        assert group.wait(timeout=0.1) is False
+
+        # Wakes up as soon as the interrupt is set.
+        threading.Timer(0.2, interrupt.set).start()
+        start = time.monotonic()
+        assert group.wait(timeout=10) is False
+        assert time.monotonic() - start < 2
+
+    with EventGroup(events) as group:
+        threading.Timer(0.2, events[1].set).start()
+        start = time.monotonic()
+        assert group.wait(timeout=10) is True
+        assert time.monotonic() - start < 2
+
+
 def test_delay_of_sigterm_with_nosignal():
     orig_sigterm_handler = signal.getsignal(signal.SIGTERM)
 
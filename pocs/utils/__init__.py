@@ -1,7 +1,9 @@
 import contextlib
+import datetime
 import os
 import shutil
 import signal
+import threading
 import time
 
 from astropy import units as u
@@ -12,6 +14,14 @@ from astropy.time import Time
 from astropy.utils import resolve_name
 
 
+# The value `current_time` last wrote to $POCSTIME and the time it stands for, so
+# that the variable is only parsed again when something else changes it.
+_pocs_time = (None, None)
+_pocs_time_lock = threading.Lock()
+
+_unix_epoch = datetime.datetime(1970, 1, 1)
+
+
 def current_time(flatten=False, datetime=False, pretty=False):
     """ Convenience method to return the "current" time according to the system.
 
@@ -29,6 +39,11 @@ def current_time(flatten=False, datetime=False, pretty=False):
         The time returned from this function is **not** timezone aware. All times
         are UTC.
 
+    Note:
+        An astropy `Time` is only made if asked for, i.e. not for a `datetime`,
+        `flatten` or `pretty` time, which are much quicker to get. See also
+        `current_datetime` and `current_unix_time`.
+
 
     .. doctest::
 
@@ -60,29 +75,70 @@ def current_time(flatten=False, datetime=False, pretty=False):
     Returns:
         astropy.time.Time: Object representing now.
     """
-
-    pocs_time = os.getenv('POCSTIME')
-
-    if pocs_time is not None and pocs_time > '':
-        _time = Time(pocs_time)
-        # Increment POCSTIME
-        os.environ['POCSTIME'] = (_time + 1 * u.second).isot
-    else:
-        _time = Time.now()
+    _time = current_datetime()
 
     if flatten:
-        _time = flatten_time(_time)
+        return _time.strftime('%Y%m%dT%H%M%S')
 
     if pretty:
-        _time = _time.isot.split('.')[0].replace('T', ' ')
+        return _time.strftime('%Y-%m-%d %H:%M:%S')
 
     if datetime:
-        # Add UTC timezone
-        _time = _time.to_datetime()
+        return _time
+
+    return Time(_time, scale='utc')
+
+
+def current_datetime():
+    """The "current" time as a (timezone naive) UTC `datetime.datetime`.
+
+    Honours ``$POCSTIME``, see `current_time`, but is much quicker than making an
+    astropy `Time`.
+
+    .. doctest::
+
+        >>> os.environ['POCSTIME'] = '1999-12-31 23:59:59'
+        >>> current_datetime()
+        datetime.datetime(1999, 12, 31, 23, 59, 59)
+        >>> current_datetime()
+        datetime.datetime(2000, 1, 1, 0, 0)
+        >>> del os.environ['POCSTIME']
+
+    Returns:
+        datetime.datetime: The time.
+    """
+    pocs_time = os.getenv('POCSTIME')
+    if not pocs_time:
+        return datetime.datetime.utcnow()
+
+    global _pocs_time
+    with _pocs_time_lock:
+        written, next_time = _pocs_time
+        if pocs_time == written:
+            _time = next_time
+        else:
+            _time = Time(pocs_time).to_datetime()
+
+        # Increment POCSTIME
+        next_time = _time + datetime.timedelta(seconds=1)
+        written = next_time.isoformat()
+        os.environ['POCSTIME'] = written
+        _pocs_time = (written, next_time)
 
     return _time
 
 
+def current_unix_time():
+    """The "current" unix time in seconds, honouring ``$POCSTIME`` (see `current_time`).
+
+    Returns:
+        float: The time.
+    """
+    if not os.getenv('POCSTIME'):
+        return time.time()
+    return (current_datetime() - _unix_epoch).total_seconds()
+
+
 def flatten_time(t):
     """Given an astropy time, flatten to have no extra chars besides integers.
 
@@ -178,6 +234,87 @@ class CountdownTimer(object):
         return False
 
 
+class EventGroup(object):
+    """Wait for all of a group of events, waking up as soon as the last one is set.
+
+    A thread per event waits for it to be set, so `wait` returns as soon as all
+    of the events (or the `interrupt` event) are set, rather than at the next
+    poll. Use as a context manager, or call `close` when done, to stop the
+    threads.
+
+    .. doctest::
+
+        >>> import threading
+        >>> from pocs.utils import EventGroup
+        >>> events = [threading.Event(), threading.Event()]
+        >>> with EventGroup(events) as group:
+        ...     events[0].set()
+        ...     group.wait(timeout=0.1)
+        ...     threading.Timer(0.1, events[1].set).start()
+        ...     group.wait(timeout=10)
+        False
+        True
+
+    Args:
+        events (list(`threading.Event`)): The events to wait for.
+        interrupt (`threading.Event`, optional): An event that also ends the wait.
+    """
+
+    def __init__(self, events, interrupt=None):
+        self.events = listify(events)
+        self.interrupt = interrupt
+
+        self._done = threading.Event()
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = [event for event in self.events if not event.is_set()]
+
+        if not self._pending:
+            self._done.set()
+        for event in self._pending:
+            threading.Thread(target=self._watch, args=(event, ), daemon=True).start()
+        if interrupt is not None:
+            threading.Thread(target=self._watch, args=(interrupt, ), daemon=True).start()
+
+    def is_set(self):
+        """ bool: True if all the events are set """
+        return all(event.is_set() for event in self.events)
+
+    def wait(self, timeout=None):
+        """Wait until all the events, or the interrupt, are set or the timeout passes.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait, default
+                is to wait indefinitely.
+
+        Returns:
+            bool: True if all the events are set.
+        """
+        self._done.wait(timeout)
+        return self.is_set()
+
+    def close(self):
+        """ Stop the threads waiting for the events """
+        self._closed.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _watch(self, event):
+        # Waits in short steps so that the thread stops soon after `close`.
+        while not self._closed.is_set():
+            if event.wait(1.0):
+                with self._lock:
+                    if event in self._pending:
+                        self._pending.remove(event)
+                    if event is self.interrupt or not self._pending:
+                        self._done.set()
+                return
+
+
 def listify(obj):
     """ Given an object, return a list.
 
@@ -1,4 +1,5 @@
 import os
+import threading
 import yaml
 from contextlib import suppress
 
@@ -7,14 +8,62 @@ from pocs import hardware
 from pocs.utils import listify
 from warnings import warn
 
+# Parsed configs, keyed on the arguments to `load_config`, see `_load_cached`.
+_config_cache = dict()
+_config_cache_lock = threading.Lock()
 
-def load_config(config_files=None, simulator=None, parse=True, ignore_local=False):
+
+class ReadOnlyDict(dict):
+    """A dict that can't be modified, as returned by `load_config(read_only=True)`.
+
+    Nested dicts are also `ReadOnlyDict` and lists are tuples. Copies made with
+    `copy` or `copy.deepcopy` are ordinary (modifiable) dicts and lists.
+
+    .. doctest::
+
+        >>> from pocs.utils.config import ReadOnlyDict
+        >>> config = ReadOnlyDict({'db': {'type': 'file'}})
+        >>> config['db']['type'] = 'mongo'
+        Traceback (most recent call last):
+            ...
+        TypeError: Config is read-only, use a copy to modify it
+        >>> config.copy()['db']['type'] = 'mongo'
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in super().items():
+            super().__setitem__(key, _freeze(value))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('Config is read-only, use a copy to modify it')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return _thaw(self)
+
+    def __copy__(self):
+        return _thaw(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (ReadOnlyDict, (_thaw(self),))
+
+
+def load_config(config_files=None, simulator=None, parse=True, ignore_local=False,
+                read_only=False, reload=False):
     """Load configuation information
 
     This function supports loading of a number of different files. If no options
     are passed to `config_files` then the default `$POCS/conf_files/pocs.yaml`
     will be loaded. See Notes for additional information.
 
+    The parsed config is cached, and only read again if one of the files has been
+    modified (or created or removed) since, or if `reload` is True.
+
     Notes:
         The `config_files` parameter supports a number of options:
         * `config_files` is a list and loaded in order, so the first entry
@@ -45,6 +94,9 @@ def load_config(config_files=None, simulator=None, parse=True, ignore_local=Fals
             objects such as dates, astropy units, etc.
         ignore_local (bool, optional): If local files should be ignored, see
             Notes for details.
+        read_only (bool, optional): Return the cached config as a `ReadOnlyDict`
+            rather than a copy, which is cheaper for callers that only read it.
+        reload (bool, optional): Read the files even if they haven't changed.
 
     Returns:
         dict: A dictionary of config items
@@ -55,10 +107,9 @@ def load_config(config_files=None, simulator=None, parse=True, ignore_local=Fals
         config_files = ['pocs']
     config_files = listify(config_files)
 
-    config = dict()
-
     config_dir = '{}/conf_files'.format(os.getenv('POCS'))
 
+    paths = list()
     for f in config_files:
         if not f.endswith('.yaml'):
             f = '{}.yaml'.format(f)
@@ -68,25 +119,22 @@ def load_config(config_files=None, simulator=None, parse=True, ignore_local=Fals
         else:
             path = f
 
-        try:
-            _add_to_conf(config, path)
-        except Exception as e:
-            warn("Problem with config file {}, skipping. {}".format(path, e))
-
-        # Load local version of config
+        # Local version of config
+        local_version = None
         if not ignore_local:
             local_version = os.path.join(config_dir, f.replace('.', '_local.'))
-            if os.path.exists(local_version):
-                try:
-                    _add_to_conf(config, local_version)
-                except Exception:
-                    warn("Problem with local config file {}, skipping".format(local_version))
+
+        paths.append((path, local_version))
+
+    config = _load_cached(paths, parse, reload)
 
     if simulator is not None:
+        config = _thaw(config)
         config['simulator'] = hardware.get_simulator_names(simulator=simulator)
-
-    if parse:
-        config = _parse_config(config)
+        if read_only:
+            config = ReadOnlyDict(config)
+    elif not read_only:
+        config = _thaw(config)
 
     return config
 
@@ -115,6 +163,71 @@ def save_config(path, config, overwrite=True):
         with open(path, 'w') as f:
             f.write(yaml.dump(config))
 
+        # The modification time may not have changed if the file was just written.
+        with _config_cache_lock:
+            for key in list(_config_cache):
+                if any(path in paths for paths in key[0]):
+                    del _config_cache[key]
+
+
+def _load_cached(paths, parse, reload):
+    """Read and parse the config files, or return the cached config if none have changed."""
+    key = (tuple(paths), parse, os.getenv('PANDIR'))
+    mtimes = tuple(_get_mtime(path) for path_pair in paths for path in path_pair)
+
+    with _config_cache_lock:
+        if not reload:
+            with suppress(KeyError):
+                cached_mtimes, config = _config_cache[key]
+                if cached_mtimes == mtimes:
+                    return config
+
+        config = dict()
+        for path, local_version in paths:
+            try:
+                _add_to_conf(config, path)
+            except Exception as e:
+                warn("Problem with config file {}, skipping. {}".format(path, e))
+
+            if local_version is not None and os.path.exists(local_version):
+                try:
+                    _add_to_conf(config, local_version)
+                except Exception:
+                    warn("Problem with local config file {}, skipping".format(local_version))
+
+        if parse:
+            config = _parse_config(config)
+
+        config = ReadOnlyDict(config)
+        _config_cache[key] = (mtimes, config)
+
+    return config
+
+
+def _get_mtime(path):
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _freeze(value):
+    if isinstance(value, dict) and not isinstance(value, ReadOnlyDict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
 
 def _parse_config(config):
     # Add units to our location
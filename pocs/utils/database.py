@@ -1,6 +1,5 @@
 import abc
 import os
-import pymongo
 import threading
 import weakref
 from contextlib import suppress
@@ -8,11 +7,11 @@ from warnings import warn
 from uuid import uuid4
 from glob import glob
 from bson.objectid import ObjectId
-from pymongo.errors import ConnectionFailure
 
 from pocs.utils import current_time
 from pocs.utils import serializers as json_util
 from pocs.utils.config import load_config
+from pocs.utils.profiling import profiled
 
 
 class AbstractPanDB(metaclass=abc.ABCMeta):
@@ -133,7 +132,10 @@ def get_shared_mongo_client(host, port, connect):
     except KeyError:
         pass
 
-    # No client available, try to create new one.
+    # No client available, try to create new one. pymongo is only imported when needed.
+    import pymongo
+    from pymongo.errors import ConnectionFailure
+
     client = pymongo.MongoClient(host, port, connect=connect)
     try:
         # See second Note in official api docs for MongoClient
@@ -168,7 +170,7 @@ class PanDB(object):
             raise ValueError('db_name, a string, must be provided and not empty')
 
         if db_type is None:
-            db_type = load_config()['db']['type']
+            db_type = load_config(read_only=True)['db']['type']
 
         if not isinstance(db_type, str) and db_type:
             raise ValueError('db_type, a string, must be provided and not empty')
@@ -197,6 +199,7 @@ class PanDB(object):
             'current',
             'drift_align',
             'environment',
+            'metrics',
             'mount',
             'observations',
             'offset_info',
@@ -269,6 +272,7 @@ class PanMongoDB(AbstractPanDB):
             # Add the collection as an attribute.
             setattr(self, collection, getattr(db_handle, collection))
 
+    @profiled('database')
     def insert_current(self, collection, obj, store_permanently=True):
         self.validate_collection(collection)
         obj = create_storage_obj(collection, obj)
@@ -296,6 +300,7 @@ class PanMongoDB(AbstractPanDB):
             return str(obj_id)
         return None
 
+    @profiled('database')
     def insert(self, collection, obj):
         self.validate_collection(collection)
         try:
@@ -355,6 +360,7 @@ class PanFileDB(AbstractPanDB):
         self._storage_dir = os.path.join(os.environ['PANDIR'], 'json_store', self.db_folder)
         os.makedirs(self._storage_dir, exist_ok=True)
 
+    @profiled('database')
     def insert_current(self, collection, obj, store_permanently=True):
         self.validate_collection(collection)
         obj_id = self._make_id()
@@ -380,6 +386,7 @@ class PanFileDB(AbstractPanDB):
             self._warn("Problem inserting object into collection: {}, {!r}".format(e, obj))
             return None
 
+    @profiled('database')
     def insert(self, collection, obj):
         self.validate_collection(collection)
         obj_id = self._make_id()
@@ -478,6 +485,7 @@ class PanMemoryDB(AbstractPanDB):
     def _make_id(self):
         return str(uuid4())
 
+    @profiled('database')
     def insert_current(self, collection, obj, store_permanently=True):
         self.validate_collection(collection)
         obj_id = self._make_id()
@@ -493,6 +501,7 @@ class PanMemoryDB(AbstractPanDB):
                 self.collections.setdefault(collection, {})[obj_id] = obj
         return obj_id
 
+    @profiled('database')
     def insert(self, collection, obj):
         self.validate_collection(collection)
         obj_id = self._make_id()
@@ -0,0 +1,265 @@
+import threading
+from datetime import timedelta
+
+import numpy as np
+
+from astropy import units as u
+from astropy.coordinates import get_moon
+from astropy.coordinates import get_sun
+from astropy.coordinates import SkyCoord
+from astropy.time import Time
+
+from pocs.utils import current_time
+from pocs.utils.logger import get_root_logger
+
+
+class Ephemeris(object):
+    """Sun and moon timeline for an observer, computed once a day.
+
+    The altitude of the sun, and the position, altitude, illumination and phase of
+    the moon on a coarser grid, are computed for times covering two days with one
+    call to astropy each and interpolated between the grid points. Sunset and
+    sunrise times for a horizon are found from the sun altitudes, as astroplan
+    does, and kept for the life of the timeline.
+
+    The timeline is recomputed when asked about a time it doesn't cover, and by a
+    background thread at local noon if `start` has been called.
+
+    .. doctest::
+
+        >>> from astroplan import Observer
+        >>> from astropy import units as u
+        >>> from astropy.coordinates import EarthLocation
+        >>> from astropy.time import Time
+        >>> from pocs.utils.ephemeris import Ephemeris
+        >>> location = EarthLocation(lat=19.54 * u.deg, lon=-155.58 * u.deg, height=3400 * u.m)
+        >>> ephemeris = Ephemeris(Observer(location=location, timezone='US/Hawaii'))
+        >>> ephemeris.is_dark(Time('2016-08-13 10:00:00'))
+        True
+        >>> ephemeris.sun_set_time(Time('2016-08-13 00:00:00'), which='next').iso[:16]
+        '2016-08-13 04:48'
+        >>> round(ephemeris.moon_illumination(Time('2016-08-13 10:00:00')), 2)
+        0.75
+
+    Args:
+        observer (astroplan.Observer): The observer.
+        duration (astropy.units.Quantity, optional): Length of the timeline, from
+            half a day before the time it is computed for, default 48 hours.
+        step (astropy.units.Quantity, optional): Interval between grid points for
+            the sun, default 5 minutes.
+        moon_step (astropy.units.Quantity, optional): Interval between grid points
+            for the moon, default 20 minutes.
+        logger (optional): Logger to use, defaults to the root logger.
+    """
+
+    def __init__(self, observer, duration=48 * u.hour, step=5 * u.minute,
+                 moon_step=20 * u.minute, logger=None):
+        self.observer = observer
+        self.duration = duration
+        self.step = step
+        self.moon_step = moon_step
+        self.logger = logger or get_root_logger()
+
+        self._timeline = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def is_running(self):
+        """ bool: True if the timeline is being refreshed in the background """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ Refresh the timeline in a background thread at local noon every day """
+        if self.is_running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name='Ephemeris', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop refreshing the timeline """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def update(self, at_time=None):
+        """Compute the timeline around a time.
+
+        Args:
+            at_time (astropy.time.Time, optional): Time the timeline should cover,
+                defaults to now. The timeline starts half a day earlier.
+        """
+        if at_time is None:
+            at_time = current_time()
+
+        start_time = at_time - 12 * u.hour
+        times = self._grid(start_time, self.step)
+        moon_times = self._grid(start_time, self.moon_step)
+
+        sun = get_sun(times)
+
+        # Geocentric, the altitude and ICRS direction account for the observer's location.
+        moon = get_moon(moon_times)
+        moon_xyz = moon.icrs.cartesian.xyz.value
+        moon_xyz = moon_xyz / np.sqrt((moon_xyz ** 2).sum(axis=0))
+
+        # As `astroplan.moon.moon_phase_angle`, without computing the positions again.
+        moon_sun = get_sun(moon_times)
+        elongation = moon_sun.separation(moon)
+        moon_phase = np.arctan2(moon_sun.distance * np.sin(elongation),
+                                moon.distance - moon_sun.distance * np.cos(elongation))
+
+        timeline = {
+            'times': times.unix,
+            'sun_alt': self.observer.altaz(times, sun).alt.to(u.degree).value,
+            'moon_times': moon_times.unix,
+            'moon_alt': self.observer.altaz(moon_times, moon).alt.to(u.degree).value,
+            'moon_illumination': ((1 + np.cos(moon_phase)) / 2.).value,
+            'moon_phase': moon_phase.to(u.radian).value,
+            'moon_xyz': moon_xyz,
+            'crossings': dict(),
+        }
+        self.logger.debug("Computed ephemeris from {} to {}", times[0].isot, times[-1].isot)
+        self._timeline = timeline
+        return timeline
+
+    def sun_alt(self, at_time):
+        """ astropy.units.Quantity: Altitude of the sun """
+        return self._interp(at_time, 'sun_alt') * u.degree
+
+    def is_dark(self, at_time, horizon=-18 * u.degree):
+        """If sun is below horizon.
+
+        Args:
+            at_time (astropy.time.Time): The time.
+            horizon (astropy.units.Quantity, optional): The horizon, default -18 degrees.
+        """
+        return bool(self._interp(at_time, 'sun_alt') < u.Quantity(horizon, u.degree).value)
+
+    def sun_set_time(self, at_time, which='nearest', horizon=0 * u.degree):
+        """Time the sun sets below a horizon, see `astroplan.Observer.sun_set_time`.
+
+        Args:
+            at_time (astropy.time.Time): The time.
+            which (str, optional): 'next', 'previous' or 'nearest' (default).
+            horizon (astropy.units.Quantity, optional): The horizon, default 0 degrees.
+
+        Returns:
+            astropy.time.Time: The time of sunset.
+        """
+        return self._crossing(at_time, which, horizon, rising=False)
+
+    def sun_rise_time(self, at_time, which='nearest', horizon=0 * u.degree):
+        """Time the sun rises above a horizon, see `astroplan.Observer.sun_rise_time`.
+
+        Args:
+            at_time (astropy.time.Time): The time.
+            which (str, optional): 'next', 'previous' or 'nearest' (default).
+            horizon (astropy.units.Quantity, optional): The horizon, default 0 degrees.
+
+        Returns:
+            astropy.time.Time: The time of sunrise.
+        """
+        return self._crossing(at_time, which, horizon, rising=True)
+
+    def twilight_evening_astronomical(self, at_time, which='nearest'):
+        """ astropy.time.Time: Time the sun sets below -18 degrees """
+        return self.sun_set_time(at_time, which=which, horizon=-18 * u.degree)
+
+    def twilight_morning_astronomical(self, at_time, which='nearest'):
+        """ astropy.time.Time: Time the sun rises above -18 degrees """
+        return self.sun_rise_time(at_time, which=which, horizon=-18 * u.degree)
+
+    def moon_alt(self, at_time):
+        """ astropy.units.Quantity: Altitude of the moon """
+        return self._interp(at_time, 'moon_alt') * u.degree
+
+    def moon_illumination(self, at_time):
+        """ float: Fraction of the moon illuminated """
+        return self._interp(at_time, 'moon_illumination')
+
+    def moon_phase(self, at_time):
+        """ astropy.units.Quantity: Phase angle of the moon, see `astroplan.Observer.moon_phase` """
+        return self._interp(at_time, 'moon_phase') * u.radian
+
+    def moon_coord(self, at_time):
+        """ astropy.coordinates.SkyCoord: ICRS direction of the moon """
+        timeline, t = self._get_timeline(at_time)
+        x, y, z = (np.interp(t, timeline['moon_times'], xyz) for xyz in timeline['moon_xyz'])
+        return SkyCoord(x=x, y=y, z=z, frame='icrs', representation_type='cartesian')
+
+##################################################################################################
+# Private Methods
+##################################################################################################
+
+    def _get_timeline(self, at_time):
+        """ The timeline covering a time, computing it if needed, and the time as unix time """
+        t = at_time.unix
+        timeline = self._timeline
+        if timeline is None or not timeline['times'][0] <= t <= timeline['times'][-1]:
+            timeline = self.update(at_time)
+        return timeline, t
+
+    def _grid(self, start_time, step):
+        n_points = int(np.ceil((self.duration / step).decompose().value)) + 1
+        return start_time + np.arange(n_points) * step
+
+    def _interp(self, at_time, name):
+        timeline, t = self._get_timeline(at_time)
+        times = timeline['moon_times'] if name.startswith('moon') else timeline['times']
+        return float(np.interp(t, times, timeline[name]))
+
+    def _crossing(self, at_time, which, horizon, rising):
+        horizon = u.Quantity(horizon, u.degree).value
+        timeline, t = self._get_timeline(at_time)
+
+        try:
+            sets, rises = timeline['crossings'][horizon]
+        except KeyError:
+            sets, rises = self._find_crossings(timeline, horizon)
+            timeline['crossings'][horizon] = (sets, rises)
+        crossings = rises if rising else sets
+
+        i = np.searchsorted(crossings, t)
+        candidates = list()
+        if which in ('previous', 'nearest') and i > 0:
+            candidates.append(crossings[i - 1])
+        if which in ('next', 'nearest') and i < len(crossings):
+            candidates.append(crossings[i])
+
+        if not candidates:
+            # Not in the timeline, e.g. the sun doesn't rise or set.
+            self.logger.debug("No crossing of {} found in ephemeris", horizon)
+            method = self.observer.sun_rise_time if rising else self.observer.sun_set_time
+            return method(at_time, which=which, horizon=horizon * u.degree)
+
+        crossing = min(candidates, key=lambda c: abs(c - t))
+        return Time(crossing, format='unix', scale='utc').utc
+
+    def _find_crossings(self, timeline, horizon):
+        """Sunset and sunrise times, interpolated between the grid points either side."""
+        times = timeline['times']
+        alt = timeline['sun_alt'] - horizon
+        i = np.nonzero(np.sign(alt[:-1]) != np.sign(alt[1:]))[0]
+        crossing_times = times[i] - alt[i] * (times[i + 1] - times[i]) / (alt[i + 1] - alt[i])
+        rising = alt[i + 1] > alt[i]
+        return crossing_times[~rising], crossing_times[rising]
+
+    def _next_refresh(self, now):
+        """ Seconds until the next local noon """
+        local = now.to_datetime(timezone=self.observer.timezone)
+        noon = local.replace(hour=12, minute=0, second=0, microsecond=0)
+        if noon <= local:
+            noon += timedelta(days=1)
+        return (noon - local).total_seconds()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.update()
+            except Exception as e:  # pragma: no cover
+                self.logger.warning("Problem computing ephemeris: {}", e)
+            self._stop.wait(self._next_refresh(current_time()))
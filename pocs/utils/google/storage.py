@@ -46,7 +46,7 @@ class PanStorage(object):
         super(PanStorage, self).__init__()
 
         try:
-            self.unit_id = load_config()['pan_id']
+            self.unit_id = load_config(read_only=True)['pan_id']
         except KeyError:
             raise error.GoogleCloudError("Missing pan_id in config "
                                          "Cannot connect to Google services.")
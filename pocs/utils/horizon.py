@@ -1,5 +1,5 @@
 import numpy as np
-from scipy import interpolate
+from astropy import units as u
 
 
 class Horizon(object):
@@ -11,9 +11,13 @@ class Horizon(object):
     range.
 
     The list are points that are obstruction points beyond the default horizon.
+
+    The horizon is sampled every `resolution` degrees of azimuth in `horizon_line`
+    and looked up with `altitude` or `is_above`, which interpolate between the
+    samples and accept arrays, e.g. the alt/az track of a field over the night.
     """
 
-    def __init__(self, obstructions=list(), default_horizon=30):
+    def __init__(self, obstructions=list(), default_horizon=30, resolution=1):
         """Create a list of horizon obstruction points.
 
         Example:
@@ -35,6 +39,8 @@ class Horizon(object):
                 `default_horizon` defines a flat horizon.
             default_horizon (float, optional): A default horizon to be used whenever
                 there is no obstruction.
+            resolution (float, optional): Spacing in degrees of the azimuths at which
+                the horizon is sampled, default 1. Must divide 360.
 
         """
         super().__init__()
@@ -68,8 +74,13 @@ class Horizon(object):
 
         self.obstructions = sorted(obstruction_list, key=lambda point: point[1])
 
+        assert resolution > 0 and (360 / resolution).is_integer(), \
+            "Resolution must divide 360 degrees"
+
         self.default_horizon = default_horizon
-        self.horizon_line = np.ones(360) * self.default_horizon
+        self.resolution = resolution
+        self.azimuths = np.arange(0, 360, resolution)
+        self.horizon_line = np.full(len(self.azimuths), float(self.default_horizon))
 
         # Make helper lists of the alt and az
         self.alt = list()
@@ -79,11 +90,56 @@ class Horizon(object):
             self.az.append([point[1] for point in obstruction])
 
         for obs_az, obs_alt in zip(self.az, self.alt):
-            f = interpolate.interp1d(obs_az, obs_alt)
+            in_range = (self.azimuths >= obs_az[0]) & (self.azimuths <= obs_az[-1])
+            self.horizon_line[in_range] = np.interp(self.azimuths[in_range], obs_az, obs_alt)
+
+        # Close the line at 360 degrees so lookups interpolate across north.
+        self._lookup_az = np.append(self.azimuths, 360)
+        self._lookup_alt = np.append(self.horizon_line, self.horizon_line[0])
+
+    def altitude(self, az):
+        """Minimum altitude in degrees at the given azimuth(s).
 
-            x_range = np.arange(obs_az[0], obs_az[-1] + 1)
-            new_y = f(x_range)
+        Example:
+            >>> from pocs.utils.horizon import Horizon
+            >>> horizon = Horizon(obstructions=[[[40, 30], [40, 75]]])
+            >>> horizon.altitude(50)
+            40.0
+            >>> horizon.altitude([10, 29.5, 360])
+            array([30., 35., 30.])
+
+        Args:
+            az (float, array or `astropy.units.Quantity`): Azimuth(s), in degrees if
+                not a `Quantity`. Values outside 0-360 are wrapped.
 
-            # Assign over index elements
-            for i, j in enumerate(x_range):
-                self.horizon_line[int(j)] = new_y[i]
+        Returns:
+            float or `numpy.ndarray`: The altitude(s) of the horizon, in degrees.
+        """
+        if isinstance(az, u.Quantity):
+            az = az.to_value(u.degree)
+        altitude = np.interp(np.mod(az, 360), self._lookup_az, self._lookup_alt)
+        if np.ndim(altitude) == 0:
+            altitude = float(altitude)
+        return altitude
+
+    def is_above(self, alt, az):
+        """Whether the alt/az position(s) are above the horizon.
+
+        Example:
+            >>> from pocs.utils.horizon import Horizon
+            >>> horizon = Horizon(obstructions=[[[40, 30], [40, 75]]])
+            >>> horizon.is_above([35, 35, 45], [20, 50, 50])
+            array([ True, False,  True])
+
+        Args:
+            alt (float, array or `astropy.units.Quantity`): Altitude(s), in degrees
+                if not a `Quantity`.
+            az (float, array or `astropy.units.Quantity`): Azimuth(s), the same shape
+                as `alt`.
+
+        Returns:
+            bool or `numpy.ndarray`: True where `alt` is at or above the horizon.
+        """
+        if isinstance(alt, u.Quantity):
+            alt = alt.to_value(u.degree)
+        return np.asarray(alt) >= self.altitude(az)
@@ -2,16 +2,12 @@ import os
 import subprocess
 import shutil
 from contextlib import suppress
+from functools import lru_cache
 
 from warnings import warn
 
-from matplotlib import cm as colormap
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from matplotlib.figure import Figure
-
 from astropy.wcs import WCS
 from astropy.io.fits import open as open_fits
-from astropy.visualization import (PercentileInterval, LogStretch, ImageNormalize)
 
 from glob import glob
 from copy import copy
@@ -22,10 +18,21 @@ from pocs.utils import error
 from pocs.utils.images import fits as fits_utils
 from pocs.utils.images import focus as focus_utils
 
-palette = copy(colormap.inferno)
-palette.set_over('w', 1.0)
-palette.set_under('k', 1.0)
-palette.set_bad('g', 1.0)
+
+@lru_cache(maxsize=None)
+def get_palette():
+    """The colour map used for images, with colours set for bad and out of range values.
+
+    matplotlib is only imported the first time this is called, so that importing
+    this module (and so `pocs.core`) doesn't need it.
+    """
+    from matplotlib import cm as colormap
+
+    palette = copy(colormap.inferno)
+    palette.set_over('w', 1.0)
+    palette.set_under('k', 1.0)
+    palette.set_bad('g', 1.0)
+    return palette
 
 
 def make_images_dir():
@@ -136,6 +143,9 @@ def _make_pretty_from_fits(fname=None,
                            number_ticks=7,
                            clip_percent=99.9,
                            **kwargs):
+    from astropy.visualization import PercentileInterval, LogStretch, ImageNormalize
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+    from matplotlib.figure import Figure
 
     with open_fits(fname) as hdu:
         header = hdu[0].header
@@ -198,7 +208,7 @@ def _make_pretty_from_fits(fname=None,
         ax.set_xlabel('X / pixels')
         ax.set_ylabel('Y / pixels')
 
-    im = ax.imshow(data, norm=norm, cmap=palette, origin='lower')
+    im = ax.imshow(data, norm=norm, cmap=get_palette(), origin='lower')
     fig.colorbar(im)
     fig.suptitle(title)
 
@@ -0,0 +1,77 @@
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+import numpy as np
+
+
+class BufferRing(object):
+    """A ring of preallocated image data arrays that are reused across exposures.
+
+    Cameras acquire an array from the ring to read an image into, hand it to the
+    writer and release it back to the ring once the image has been written, so
+    that a long sequence of exposures doesn't allocate (and free) a new array for
+    every frame. Arrays are handed out in the order they were released.
+
+    If every array is in use a new, temporary array is returned instead of
+    blocking. Temporary arrays are not added to the ring when released.
+
+    Args:
+        shape (tuple): shape of the image data arrays.
+        dtype (numpy.dtype, optional): data type of the arrays, default uint16.
+        size (int, optional): number of arrays to preallocate, default 2.
+    """
+
+    def __init__(self, shape, dtype=np.uint16, size=2):
+        if size < 1:
+            raise ValueError("size should be 1 or greater, got {}!".format(size))
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.size = size
+
+        self._buffers = [np.zeros(self.shape, dtype=self.dtype) for i in range(size)]
+        self._free = deque(self._buffers)
+        self._lock = Lock()
+
+    @property
+    def n_free(self):
+        """ Number of preallocated arrays not currently in use """
+        return len(self._free)
+
+    def matches(self, shape, dtype=np.uint16):
+        """ Whether the arrays in the ring have the given shape and data type """
+        return tuple(shape) == self.shape and np.dtype(dtype) == self.dtype
+
+    def acquire(self):
+        """Get an array from the ring.
+
+        Returns:
+            numpy.ndarray: an array of the ring's shape and data type. Its contents
+                are whatever was last written to it.
+        """
+        with self._lock:
+            try:
+                return self._free.popleft()
+            except IndexError:
+                pass
+        return np.zeros(self.shape, dtype=self.dtype)
+
+    def release(self, data):
+        """Return an array to the ring once it is no longer needed.
+
+        Args:
+            data (numpy.ndarray): an array previously returned by `acquire`.
+        """
+        with self._lock:
+            if any(data is buffer for buffer in self._buffers) and \
+                    not any(data is buffer for buffer in self._free):
+                self._free.append(data)
+
+    @contextmanager
+    def buffer(self):
+        """Context manager that acquires an array and releases it on exit."""
+        data = self.acquire()
+        try:
+            yield data
+        finally:
+            self.release(data)
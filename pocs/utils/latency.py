@@ -0,0 +1,97 @@
+import bisect
+import math
+
+
+class LatencyHistogram(object):
+    """A histogram of latencies (e.g. command round trip times) with fixed, log spaced bins.
+
+    Samples are counted in bins rather than stored, so a histogram can be kept for
+    every command a device understands for the life of the process.
+
+    .. doctest::
+
+        >>> from pocs.utils.latency import LatencyHistogram
+        >>> latencies = LatencyHistogram()
+        >>> for seconds in (0.015, 0.018, 0.04, 0.3):
+        ...     latencies.add(seconds)
+        >>> latencies.count
+        4
+        >>> round(latencies.mean, 4)
+        0.0932
+        >>> latencies.percentile(50)
+        0.02
+        >>> latencies.max
+        0.3
+
+    Args:
+        edges (list, optional): Upper edges of the bins in seconds, in increasing
+            order. Samples larger than the last edge are counted in an overflow bin.
+            Defaults to 1, 2 and 5 steps from 1 ms to 10 s.
+    """
+
+    default_edges = [m * 10 ** e for e in range(-3, 1) for m in (1, 2, 5)] + [10.]
+
+    def __init__(self, edges=None):
+        if edges is None:
+            edges = self.default_edges
+        self.edges = sorted(float(edge) for edge in edges)
+        self.counts = [0] * (len(self.edges) + 1)
+
+        self.count = 0
+        self.total = 0.
+        self.min = None
+        self.max = None
+
+    @property
+    def mean(self):
+        """ float: Mean of the samples in seconds, NaN if there are none. """
+        if self.count == 0:
+            return math.nan
+        return self.total / self.count
+
+    def add(self, seconds):
+        """Add a sample to the histogram.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        self.counts[bisect.bisect_left(self.edges, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, q):
+        """Approximate percentile of the samples.
+
+        Args:
+            q (float): Percentile to compute, between 0 and 100.
+
+        Returns:
+            float: The upper edge of the bin containing the percentile (or the
+                largest sample if in the overflow bin), NaN if there are no samples.
+        """
+        if self.count == 0:
+            return math.nan
+
+        target = q / 100 * self.count
+        cumulative = 0
+        for edge, count in zip(self.edges, self.counts):
+            cumulative += count
+            if cumulative >= target and cumulative > 0:
+                return min(edge, self.max)
+        return self.max
+
+    def to_dict(self):
+        """ Summary of the histogram, suitable for logging or storing in the db. """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'edges': list(self.edges),
+            'counts': list(self.counts),
+        }
@@ -1,9 +1,14 @@
+import atexit
 import collections
+import copy
 import datetime
+import functools
 import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import re
 import string
 import sys
@@ -18,6 +23,9 @@ from pocs.utils.config import load_config
 #    (profile, json_serialized_logger_config).
 all_loggers = {}
 
+# The listener writing the records queued by the root logger, if `use_queue` is set.
+_queue_listener = None
+
 
 def field_name_to_key(field_name):
     """Given a field_name from Formatter.parse(), extract the argument key.
@@ -54,15 +62,22 @@ def format_has_reference_keys(fmt, args):
         entry in args by a string key. False otherwise.
     """
     assert isinstance(args, dict)
+    return any(key in args for key in _format_reference_keys(fmt))
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_reference_keys(fmt):
+    """The string keys referenced by the fields of fmt, parsed once per format string."""
+    keys = set()
     try:
         for literal_text, field_name, format_spec, conversion in string.Formatter().parse(fmt):
             if field_name:
                 key = field_name_to_key(field_name)
-                if isinstance(key, str) and key in args:
-                    return True
+                if isinstance(key, str):
+                    keys.add(key)
     except Exception:
         pass
-    return False
+    return frozenset(keys)
 
 
 def format_has_legacy_style(fmt):
@@ -119,13 +134,38 @@ def logger_msg_formatter(fmt, args):
 
     # There are args, so fmt must be a format string. Select the
     # formatting methods to try based on the contents.
+    args_are_mapping = isinstance(args, collections.Mapping)
+    has_reference_keys = args_are_mapping and format_has_reference_keys(fmt, args)
+    for method_name in _formatting_method_names(fmt, args_are_mapping, has_reference_keys):
+        try:
+            method = formatting_methods[method_name]
+            return method(fmt, args)
+        except Exception:
+            pass
+
+    warn(f'Unable to format log.')
+    warn(f'Log message (format string): {fmt!r}')
+    warn('Log args type: %s' % type(args))
+    try:
+        warn(f'Log args: {args!r}')
+    except Exception:  # pragma: no cover
+        warn('Unable to represent log args in string form.')
+    return fmt
+
+
+@functools.lru_cache(maxsize=1024)
+def _formatting_method_names(fmt, args_are_mapping, has_reference_keys):
+    """The formatting methods to try for fmt, in order.
+
+    Only depends on the format string and the kind of args, so is worked out
+    once for each of the (relatively few) format strings used in log calls.
+    """
     method_names = []
     may_have_legacy_subst = format_has_legacy_style(fmt)
-    args_are_mapping = isinstance(args, collections.Mapping)
     if '{' in fmt:
         # Looks modern.
         if args_are_mapping:
-            if format_has_reference_keys(fmt, args):
+            if has_reference_keys:
                 method_names.append('modern_kwargs')
             else:
                 method_names.append('modern_direct')
@@ -146,22 +186,7 @@ def logger_msg_formatter(fmt, args):
     elif '%' in fmt:
         add_fallback('legacy_direct')
 
-    # Now try to format:
-    for method_name in method_names:
-        try:
-            method = formatting_methods[method_name]
-            return method(fmt, args)
-        except Exception:
-            pass
-
-    warn(f'Unable to format log.')
-    warn(f'Log message (format string): {fmt!r}')
-    warn('Log args type: %s' % type(args))
-    try:
-        warn(f'Log args: {args!r}')
-    except Exception:  # pragma: no cover
-        warn('Unable to represent log args in string form.')
-    return fmt
+    return tuple(method_names)
 
 
 class StrFormatLogRecord(logging.LogRecord):
@@ -173,11 +198,49 @@ class StrFormatLogRecord(logging.LogRecord):
 
     Originally inspired by https://goo.gl/Cyt5NH but much changed since
     then.
+
+    The message is only formatted once, however many handlers the record is
+    passed to.
     """
 
     def getMessage(self):
-        msg = str(self.msg)
-        return logger_msg_formatter(msg, self.args)
+        try:
+            return self._message
+        except AttributeError:
+            msg = str(self.msg)
+            self._message = logger_msg_formatter(msg, self.args)
+            return self._message
+
+
+class PanQueueHandler(logging.handlers.QueueHandler):
+    """Queue records for a `logging.handlers.QueueListener` in the same process.
+
+    Unlike `logging.handlers.QueueHandler`, the record isn't formatted before it
+    is queued, so the formatting is done by the thread writing the records and
+    not by the thread that logged it.
+
+    The listener thread doesn't exist in a process forked from the one that
+    created the handler, so there records are passed straight to the listener's
+    handlers instead.
+
+    Args:
+        queue (queue.Queue): The queue read by `listener`.
+        listener (logging.handlers.QueueListener): The listener.
+    """
+
+    def __init__(self, queue, listener):
+        super().__init__(queue)
+        self.listener = listener
+        self._pid = os.getpid()
+
+    def prepare(self, record):
+        return record
+
+    def emit(self, record):
+        if os.getpid() == self._pid:
+            super().emit(record)
+        else:
+            self.listener.handle(record)
 
 
 def get_root_logger(profile='panoptes', log_config=None):
@@ -196,7 +259,7 @@ def get_root_logger(profile='panoptes', log_config=None):
     """
 
     # Get log info from config
-    log_config = log_config if log_config else load_config('log').get('logger', {})
+    log_config = log_config if log_config else load_config('log', read_only=True).get('logger', {})
 
     # If we already created a logger for this profile and log_config, return that.
     logger_key = (profile, json.dumps(log_config, sort_keys=True))
@@ -205,6 +268,9 @@ def get_root_logger(profile='panoptes', log_config=None):
     except KeyError:
         pass
 
+    # The file names etc are added below, so work on a copy.
+    log_config = copy.deepcopy(log_config)
+
     # Alter the log_config to use UTC times
     if log_config.get('use_utc', True):
         # TODO(jamessynge): Figure out why 'formatters' is sometimes
@@ -259,8 +325,12 @@ def get_root_logger(profile='panoptes', log_config=None):
             os.symlink(log_symlink_target, log_symlink)
 
     # Configure the logger
+    _stop_queue_listener()
     logging.config.dictConfig(log_config)
 
+    if log_config.get('use_queue', False):
+        _start_queue_listener(log_config.get('handlers', {}))
+
     # Get the logger and set as attribute to class
     logger = logging.getLogger(profile)
 
@@ -276,3 +346,42 @@ def get_root_logger(profile='panoptes', log_config=None):
     # when the log rotates too!
     all_loggers[logger_key] = logger
     return logger
+
+
+def _start_queue_listener(handler_names):
+    """Write the records of the root logger from a thread reading a queue.
+
+    The configured handlers of the root logger are moved to a `QueueListener`,
+    leaving the root logger with a `PanQueueHandler`, so that logging doesn't
+    wait on the formatting of the record or on the log files.
+
+    Args:
+        handler_names (iterable): Names of the handlers in the logging config.
+    """
+    global _queue_listener
+
+    root_logger = logging.getLogger()
+    handlers = [handler for handler in root_logger.handlers if handler.name in handler_names]
+    record_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(record_queue, *handlers,
+                                              respect_handler_level=True)
+    queue_handler = PanQueueHandler(record_queue, listener)
+
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+
+    listener.start()
+    _queue_listener = listener
+
+
+def _stop_queue_listener():
+    """Write any queued records and stop the listener thread."""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
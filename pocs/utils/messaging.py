@@ -13,6 +13,7 @@ from json import loads
 from pocs.utils import current_time
 from pocs.utils import CountdownTimer
 from pocs.utils.logger import get_root_logger
+from pocs.utils.profiling import profiled
 
 
 class PanMessaging(object):
@@ -42,8 +43,9 @@ class PanMessaging(object):
       * POCS (sent by class POCS)
       * POCS-CMD (sent by class POCS)
       * STATUS (sent by class POCS)
-      * weather (from peas/sensors.py)
+      * weather (from peas/weather.py)
       * environment (from peas/sensors.py)
+      * power (from peas/sensors.py)
       * telemetry:commands (in ArduinoIO... new)
       * camera:commands (in ArduinoIO... new)
 
@@ -173,6 +175,7 @@ class PanMessaging(object):
 
         return obj
 
+    @profiled('messaging')
     def send_message(self, topic, message):
         """ Responsible for actually sending message across a topic
 
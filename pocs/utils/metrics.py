@@ -0,0 +1,221 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timedelta
+
+from pocs.utils.latency import LatencyHistogram
+
+# The `Metrics` for each database, keyed by the database name, so that the objects
+# sharing a database also share their timings.
+_shared_metrics = {}
+
+
+class Metrics(object):
+    """Timings of the states, `Observatory` methods and camera stages.
+
+    Each timing is a dict with the `kind` of thing timed ('state', 'method' or
+    'camera'), its `name`, the unix `start` and `end` times, the `duration` in
+    seconds and any other information given. Timings are stored in the `metrics`
+    collection of the database and the most recent are kept in memory for
+    `duty_cycle_report`.
+
+    .. doctest::
+
+        >>> from pocs.utils.metrics import Metrics
+        >>> metrics = Metrics()
+        >>> metrics.record('state', 'observing', start=1000., duration=120.)['end']
+        1120.0
+        >>> metrics.record('state', 'analyzing', start=1120., duration=30.)['name']
+        'analyzing'
+        >>> report = metrics.duty_cycle_report()
+        >>> report['elapsed'], report['duty_cycle']
+        (150.0, 0.8)
+        >>> report['states']['analyzing']['total']
+        30.0
+
+    Args:
+        db (pocs.utils.database.AbstractPanDB, optional): Database to store the
+            timings in, default is to only keep them in memory.
+        max_records (int, optional): Number of timings to keep in memory, default 100000.
+    """
+
+    def __init__(self, db=None, max_records=100000):
+        self.db = db
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, start, duration, **info):
+        """Record a timing.
+
+        Args:
+            kind (str): What was timed, e.g. 'state', 'method' or 'camera'.
+            name (str): Name of the state, method or stage.
+            start (float): Unix time it started.
+            duration (float): Seconds it took.
+            **info: Other information to store with the timing, e.g. the camera name.
+
+        Returns:
+            dict: The timing.
+        """
+        timing = dict(info, kind=kind, name=name, start=start, end=start + duration,
+                      duration=duration)
+        with self._lock:
+            self._records.append(timing)
+
+        if self.db is not None:
+            try:
+                self.db.insert('metrics', timing)
+            except Exception as e:  # pragma: no cover
+                self.db._warn("Problem storing timing: {}".format(e))
+
+        return timing
+
+    @contextmanager
+    def timing(self, kind, name, **info):
+        """Context manager recording the time taken by its block, see `record`."""
+        start = time.time()
+        start_counter = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, start, time.perf_counter() - start_counter, **info)
+
+    def records(self, start=None, end=None, kind=None):
+        """The timings kept in memory.
+
+        Args:
+            start (float, optional): Only timings that end after this unix time.
+            end (float, optional): Only timings that start before this unix time.
+            kind (str, optional): Only timings of this kind.
+
+        Returns:
+            list: The timings.
+        """
+        with self._lock:
+            records = list(self._records)
+        return [r for r in records
+                if (start is None or r['end'] > start) and
+                (end is None or r['start'] < end) and
+                (kind is None or r['kind'] == kind)]
+
+    def duty_cycle_report(self, start=None, end=None):
+        """ Report on the timings kept in memory, see `duty_cycle_report` """
+        return duty_cycle_report(self.records(start=start, end=end), start=start, end=end)
+
+
+def get_metrics(db):
+    """The `Metrics` shared by the objects using a database.
+
+    Args:
+        db (pocs.utils.database.AbstractPanDB): The database.
+
+    Returns:
+        Metrics: The metrics for the database.
+    """
+    key = getattr(db, 'db_name', None)
+    try:
+        return _shared_metrics[key]
+    except KeyError:
+        return _shared_metrics.setdefault(key, Metrics(db=db))
+
+
+def timed(name=None, kind='method'):
+    """Decorator recording the time taken by a method of an object with a `db`.
+
+    Args:
+        name (str, optional): Name of the timing, default is the qualified name
+            of the method, e.g. 'Observatory.observe'.
+        kind (str, optional): Kind of timing, default 'method'.
+    """
+    def decorator(method):
+        timing_name = name or method.__qualname__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with get_metrics(self.db).timing(kind, timing_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def duty_cycle_report(records, start=None, end=None):
+    """Summarize timings, e.g. for a night.
+
+    The duty cycle is the fraction of the time spent in the `observing` state,
+    and `exposing` the fraction spent waiting for exposures by the busiest camera.
+
+    Args:
+        records (list): The timings, as made by `Metrics.record`.
+        start (float, optional): Unix time to report from, default is the start of
+            the first timing.
+        end (float, optional): Unix time to report until, default is the end of
+            the last timing.
+
+    Returns:
+        dict: The `start`, `end` and `elapsed` time, `duty_cycle` and `exposing`,
+            and under 'states', 'methods' and 'cameras' the `total` and `fraction`
+            of the time for each name, along with a summary of the durations (see
+            `pocs.utils.latency.LatencyHistogram.to_dict`).
+    """
+    if start is None:
+        start = min((r['start'] for r in records), default=None)
+    if end is None:
+        end = max((r['end'] for r in records), default=None)
+    elapsed = (end - start) if records else 0.
+
+    edges = [m * 10 ** e for e in range(-2, 4) for m in (1, 2, 5)]
+    histograms = defaultdict(lambda: defaultdict(lambda: LatencyHistogram(edges=edges)))
+    camera_exposing = defaultdict(float)
+    for r in records:
+        histograms[r['kind']][r['name']].add(r['duration'])
+        if r['kind'] == 'camera' and r['name'] == 'exposure':
+            camera_exposing[r.get('camera')] += r['duration']
+
+    def fraction(seconds):
+        return seconds / elapsed if elapsed > 0 else 0.
+
+    report = {
+        'start': start,
+        'end': end,
+        'elapsed': elapsed,
+        'duty_cycle': 0.,
+        'exposing': fraction(max(camera_exposing.values(), default=0.)),
+    }
+    for kind, names in histograms.items():
+        report_kind = report.setdefault(kind + 's', dict())
+        for name, histogram in names.items():
+            summary = histogram.to_dict()
+            summary['total'] = histogram.total
+            summary['fraction'] = fraction(histogram.total)
+            report_kind[name] = summary
+
+    observing = report.get('states', {}).get('observing')
+    if observing:
+        report['duty_cycle'] = observing['fraction']
+
+    return report
+
+
+def nightly_reports(records, utc_offset=0):
+    """Split timings by night and report on each, see `duty_cycle_report`.
+
+    A night runs from local noon to noon and is named by the date it starts on.
+
+    Args:
+        records (list): The timings.
+        utc_offset (float, optional): Offset of local time from UTC in hours, default 0.
+
+    Returns:
+        dict: The report for each night, keyed by the date as 'YYYY-MM-DD'.
+    """
+    nights = defaultdict(list)
+    for r in records:
+        local_time = datetime.utcfromtimestamp(r['start']) + timedelta(hours=utc_offset - 12)
+        nights[local_time.date().isoformat()].append(r)
+
+    return {night: duty_cycle_report(night_records)
+            for night, night_records in sorted(nights.items())}
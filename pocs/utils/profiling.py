@@ -0,0 +1,308 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections import defaultdict
+from contextlib import contextmanager
+
+from pocs.utils import current_time
+from pocs.utils import flatten_time
+from pocs.utils.latency import LatencyHistogram
+
+# The regions the code is instrumented with, see `profiled` and `profile_region`.
+REGIONS = ['scheduler', 'safety', 'camera', 'database', 'messaging']
+
+# The running `Profiler`, if any. Checked on every entry to a region so that
+# the instrumentation costs next to nothing while profiling is off.
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+class Profiler(object):
+    """Profile named regions of the code while POCS runs.
+
+    The cumulative time spent in each region is always recorded. In addition, in
+    'deterministic' mode each region is run under `cProfile`, while in 'sampling'
+    mode a thread records the stack of every thread that is inside a region each
+    `interval` seconds, which costs much less when the regions are entered often.
+
+    .. doctest::
+
+        >>> from pocs.utils.profiling import Profiler
+        >>> profiler = Profiler(regions=['safety'])
+        >>> with profiler.region('safety'):
+        ...     pass
+        >>> with profiler.region('scheduler'):  # Not profiled
+        ...     pass
+        >>> summary = profiler.summary()
+        >>> summary['safety']['count'], 'scheduler' in summary
+        (1, False)
+
+    Args:
+        regions (list, optional): Names of the regions to profile, default all.
+        mode (str, optional): 'deterministic' (default) or 'sampling'.
+        interval (float, optional): Seconds between stack samples, default 0.01.
+        output_dir (str, optional): Directory to dump the results in, default
+            is `$PANDIR/profiles`.
+    """
+
+    def __init__(self, regions=None, mode='deterministic', interval=0.01, output_dir=None):
+        if mode not in ('deterministic', 'sampling'):
+            raise ValueError("Profiling mode must be 'deterministic' or 'sampling', not {!r}"
+                             .format(mode))
+
+        self.regions = set(regions or REGIONS)
+        self.mode = mode
+        self.interval = interval
+        if output_dir is None:
+            output_dir = os.path.join(os.getenv('PANDIR', '/var/panoptes'), 'profiles')
+        self.output_dir = output_dir
+
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._timings = defaultdict(LatencyHistogram)
+
+        # cProfile only profiles the thread it is enabled in, so each region has
+        # as many as there are threads in it at once.
+        self._profiles = defaultdict(list)
+        self._idle_profiles = defaultdict(list)
+
+        # The regions each thread is in, innermost last, for the sampling thread.
+        self._active = dict()
+        self._samples = defaultdict(Counter)
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        if self.mode == 'sampling':
+            self._sampler = threading.Thread(target=self._sample_loop, name='ProfileSampler')
+            self._sampler.daemon = True
+            self._sampler.start()
+
+    @contextmanager
+    def region(self, name):
+        """Context manager profiling its block as the named region."""
+        if name not in self.regions:
+            yield
+            return
+
+        thread_regions = self._enter_region(name)
+
+        profile = None
+        if self.mode == 'deterministic' and len(thread_regions) == 1:
+            # Nested regions show up in the profile of the outermost one.
+            profile = self._get_profile(name)
+            profile.enable()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                self._timings[name].add(duration)
+                if profile is not None:
+                    self._idle_profiles[name].append(profile)
+            self._exit_region()
+
+    def summary(self):
+        """Cumulative time in each region.
+
+        Returns:
+            dict: For each region entered, the `total` seconds spent in it and its
+                fraction of the time since profiling started, along with a summary
+                of the durations (see `pocs.utils.latency.LatencyHistogram.to_dict`).
+        """
+        elapsed = time.time() - self.started
+        summary = dict()
+        with self._lock:
+            for name, histogram in self._timings.items():
+                region_summary = histogram.to_dict()
+                region_summary['total'] = histogram.total
+                region_summary['fraction'] = histogram.total / elapsed if elapsed > 0 else 0.
+                summary[name] = region_summary
+        return summary
+
+    def stop(self):
+        """Stop sampling, if running, and dump the results, see `dump`."""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        return self.dump()
+
+    def dump(self):
+        """Write the results to a new directory under `output_dir`.
+
+        The directory has a `summary.json` file with the cumulative time in each
+        region (see `summary`). In 'deterministic' mode there is also a
+        `<region>.prof` file, for `pstats` or snakeviz, and a `<region>.txt` file
+        with the functions taking the most cumulative time. In 'sampling' mode
+        there is a `<region>.stacks` file with a count of each stack sampled, one
+        per line in the format used by flamegraph.pl.
+
+        Returns:
+            str: The directory the results were written to.
+        """
+        profile_dir = os.path.join(self.output_dir, flatten_time(current_time()))
+        os.makedirs(profile_dir, exist_ok=True)
+
+        with open(os.path.join(profile_dir, 'summary.json'), 'w') as f:
+            json.dump({
+                'mode': self.mode,
+                'started': self.started,
+                'stopped': time.time(),
+                'regions': self.summary(),
+            }, f, indent=4, sort_keys=True)
+
+        with self._lock:
+            profiles = {name: list(region_profiles)
+                        for name, region_profiles in self._profiles.items()}
+            samples = {name: Counter(counts) for name, counts in self._samples.items()}
+
+        for name, region_profiles in profiles.items():
+            stats = pstats.Stats(*region_profiles)
+            stats.dump_stats(os.path.join(profile_dir, '{}.prof'.format(name)))
+
+            report = io.StringIO()
+            stats.stream = report
+            stats.sort_stats('cumulative').print_stats(50)
+            with open(os.path.join(profile_dir, '{}.txt'.format(name)), 'w') as f:
+                f.write(report.getvalue())
+
+        for name, counts in samples.items():
+            with open(os.path.join(profile_dir, '{}.stacks'.format(name)), 'w') as f:
+                for stack, count in counts.most_common():
+                    f.write('{} {}\n'.format(stack, count))
+
+        return profile_dir
+
+##################################################################################################
+# Private Methods
+##################################################################################################
+
+    def _enter_region(self, name):
+        """ Add a region to those the thread is in, returning them. """
+        thread_regions = getattr(self._local, 'regions', None)
+        if not thread_regions:
+            # Threads come and go (e.g. one per exposure), so only those in a
+            # region are kept track of.
+            thread_regions = self._local.regions = [name]
+            with self._lock:
+                self._active[threading.get_ident()] = thread_regions
+        else:
+            thread_regions.append(name)
+        return thread_regions
+
+    def _exit_region(self):
+        thread_regions = self._local.regions
+        thread_regions.pop()
+        if not thread_regions:
+            with self._lock:
+                self._active.pop(threading.get_ident(), None)
+
+    def _get_profile(self, name):
+        with self._lock:
+            try:
+                return self._idle_profiles[name].pop()
+            except IndexError:
+                profile = cProfile.Profile()
+                self._profiles[name].append(profile)
+                return profile
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop_sampling.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                active = [(thread_id, regions[-1])
+                          for thread_id, regions in self._active.items()
+                          if regions and thread_id != own_id]
+                for thread_id, name in active:
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        self._samples[name][_collapse_stack(frame)] += 1
+
+
+def _collapse_stack(frame):
+    """The stack of a frame as 'module:function' names separated by ';', outermost first."""
+    names = list()
+    while frame is not None:
+        code = frame.f_code
+        names.append('{}:{}'.format(frame.f_globals.get('__name__', code.co_filename),
+                                    code.co_name))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def start_profiling(regions=None, mode='deterministic', interval=0.01, output_dir=None):
+    """Start profiling the named regions, see `Profiler`.
+
+    Returns:
+        Profiler: The new profiler, or the one already running.
+    """
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = Profiler(regions=regions, mode=mode, interval=interval,
+                                 output_dir=output_dir)
+        return _profiler
+
+
+def stop_profiling():
+    """Stop profiling and dump the results, see `Profiler.dump`.
+
+    Returns:
+        str: The directory the results were written to, or None if not profiling.
+    """
+    global _profiler
+    with _profiler_lock:
+        profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    return profiler.stop()
+
+
+def get_profiler():
+    """ The running `Profiler`, or None. """
+    return _profiler
+
+
+@contextmanager
+def profile_region(name):
+    """Context manager profiling its block as the named region, if profiling.
+
+    Args:
+        name (str): Name of the region, one of `REGIONS`.
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield
+    else:
+        with profiler.region(name):
+            yield
+
+
+def profiled(region):
+    """Decorator profiling a function as the named region, if profiling.
+
+    Args:
+        region (str): Name of the region, one of `REGIONS`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.region(region):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -94,6 +94,7 @@ class SerialData(object):
                  open_delay=0.0,
                  retry_limit=5,
                  retry_delay=0.5,
+                 latest_only=False,
                  logger=None,
                  ):
         """Create a SerialData instance and attempt to open a connection.
@@ -112,6 +113,9 @@ class SerialData(object):
             open_delay: Seconds to wait after opening the port.
             retry_limit: Number of times to try readline() calls in read().
             retry_delay: Delay between readline() calls in read().
+            latest_only (bool, optional): If True `get_and_parse_reading` drains the input
+                buffer and returns only the newest complete line, dropping any backlog.
+                See `read_latest`. Defaults to False.
             logger (`logging.logger` or None, optional): A logger instance. If left as None
                 then `pocs.utils.logger.get_root_logger` will be called.
 
@@ -129,6 +133,14 @@ class SerialData(object):
         self.name = name or port
         self.retry_limit = retry_limit
         self.retry_delay = retry_delay
+        self.latest_only = latest_only
+
+        # Used by read_latest: a trailing partial line left in the drained input,
+        # a count of the lines skipped over and an estimate of how far behind the
+        # device we were when last reading.
+        self._partial_line = b''
+        self.lines_dropped = 0
+        self.read_lag = 0.0
 
         self.ser = serial.serial_for_url(port, do_not_open=True)
 
@@ -252,6 +264,48 @@ class SerialData(object):
             time.sleep(retry_delay)
         return ''
 
+    def read_latest(self, retry_limit=None, retry_delay=None):
+        """Drains the input buffer and returns the newest complete lines.
+
+        Everything waiting in the input buffer is read in one call, so that a consumer
+        that has fallen behind catches up rather than working through stale lines in
+        order. A trailing partial line is kept for the next call. If no complete line
+        is waiting, waits for the next one as `read` does.
+
+        `read_lag` is set to the time it took the device to send the data that was
+        waiting, an estimate of how far behind the device the reader was.
+
+        Returns:
+            A list of the complete lines read, oldest first, possibly empty. Callers
+            normally use only the last one, see `get_and_parse_reading`.
+        """
+        assert self.ser
+        assert self.ser.isOpen()
+
+        if retry_limit is None:
+            retry_limit = self.retry_limit
+        if retry_delay is None:
+            retry_delay = self.retry_delay
+
+        n_waiting = self.ser.in_waiting
+        data = self._partial_line
+        if n_waiting:
+            data += self.ser.read(n_waiting)
+        # 10 bits per byte on the line, with a start and a stop bit.
+        self.read_lag = n_waiting * 10 / self.ser.baudrate
+
+        for _ in range(retry_limit):
+            if b'\n' in data:
+                break
+            line = self.ser.readline()
+            if line:
+                data += line
+            else:
+                time.sleep(retry_delay)
+
+        *lines, self._partial_line = data.split(b'\n')
+        return [line.decode(encoding='ascii') + '\n' for line in lines]
+
     def get_reading(self):
         """Reads and returns a line, along with the timestamp of the read.
 
@@ -269,6 +323,9 @@ class SerialData(object):
     def get_and_parse_reading(self, retry_limit=5):
         """Reads a line of JSON text and returns the decoded value, along with the current time.
 
+        If `latest_only` is set, any backlog of lines is skipped and the newest line that
+        parses is returned, see `read_latest`.
+
         Args:
             retry_limit: Number of lines to read in an attempt to get one that parses as JSON.
 
@@ -276,6 +333,9 @@ class SerialData(object):
             A pair (tuple) of (timestamp, decoded JSON line). The timestamp is the time of
             completion of the readline operation.
         """
+        if self.latest_only:
+            return self.get_and_parse_latest_reading(retry_limit=retry_limit)
+
         for _ in range(max(1, retry_limit)):
             (ts, line) = self.get_reading()
             if not line:
@@ -285,6 +345,29 @@ class SerialData(object):
                 return (ts, data)
         return None
 
+    def get_and_parse_latest_reading(self, retry_limit=5, block=True):
+        """Like `get_and_parse_reading`, but skips to the newest line that parses.
+
+        Lines older than the one returned are counted in `lines_dropped`.
+
+        Args:
+            retry_limit: Number of times to read in an attempt to get a line that parses.
+            block (bool, optional): If False only the lines already waiting in the input
+                buffer are considered, and None is returned immediately if there are no
+                complete lines. Default True.
+        """
+        for _ in range(max(1, retry_limit) if block else 1):
+            lines = self.read_latest(retry_limit=None if block else 0)
+            ts = time.strftime('%Y-%m-%dT%H:%M:%S %Z', time.gmtime())
+            # Work back from the newest line, the oldest may be a fragment.
+            for i, line in enumerate(reversed(lines)):
+                data = _parse_json(line, self.logger)
+                if data:
+                    self.lines_dropped += len(lines) - i - 1
+                    return (ts, data)
+            self.lines_dropped += len(lines)
+        return None
+
     def reset_input_buffer(self):
         """Clear buffered data from connected port/device.
 
@@ -294,6 +377,7 @@ class SerialData(object):
         requires tossing out a fragment of a line).
         """
         self.ser.reset_input_buffer()
+        self._partial_line = b''
 
     def __del__(self):
         """Close the serial device on delete.
@@ -1,6 +1,3 @@
-from bson import json_util
-
-
 def dumps(obj):
     """Dump an object to JSON.
 
@@ -10,6 +7,8 @@ def dumps(obj):
     Returns:
         str: Serialized representation of object.
     """
+    # Imported here as `bson.json_util` imports all of pymongo.
+    from bson import json_util
     return json_util.dumps(obj)
 
 
@@ -22,6 +21,7 @@ def loads(msg):
     Returns:
         dict: The loaded object.
     """
+    from bson import json_util
     return json_util.loads(msg)
 
 
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+import json
+import os
+import resource
+import threading
+import time
+
+from astropy import units as u
+from astropy.time import Time
+
+from pocs import hardware
+from pocs.camera import create_cameras_from_config
+from pocs.core import POCS
+from pocs.observatory import Observatory
+from pocs.utils.config import load_config
+from pocs.utils.metrics import get_metrics
+
+
+def get_rss():
+    """ Resident memory of this process in MB, or the peak if not on Linux. """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except (OSError, IndexError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def run_clock(pocs, start, end, speedup, memory, done, interval=0.1, memory_interval=10.,
+              grace=30.):
+    """Advance `$POCSTIME` from `start` at `speedup` times real time.
+
+    Stops POCS once the simulated time reaches `end`, recording the resident
+    memory in `memory` every `memory_interval` seconds until then. Some states
+    sleep in real time (e.g. 30 minutes when parked without observations), so
+    if the run isn't `done` within `grace` seconds POCS is powered down.
+    """
+    real_start = time.monotonic()
+    next_memory = real_start
+    while True:
+        real_now = time.monotonic()
+        sim_now = start + (real_now - real_start) * speedup * u.second
+
+        # `current_time` also advances POCSTIME, so never go back in time.
+        try:
+            sim_now = max(sim_now, Time(os.environ['POCSTIME']))
+        except (KeyError, ValueError):
+            pass
+        os.environ['POCSTIME'] = sim_now.isot
+
+        if real_now >= next_memory:
+            memory.append((real_now - real_start, get_rss()))
+            next_memory += memory_interval
+
+        if sim_now >= end or not pocs.connected:
+            break
+        time.sleep(interval)
+
+    # Wake POCS up if it is waiting on anything and stop at the end of the state.
+    pocs.stop_states()
+    pocs._interrupt.set()
+    if not done.wait(grace):
+        pocs.logger.info("Still running at the end of the night, powering down")
+        pocs.power_down()
+
+
+def main(start='2016-09-09 06:00:00',
+         hours=10.,
+         speedup=60.,
+         cameras=1,
+         fields_file=None,
+         pointing_images=None,
+         dome=False,
+         db_type='memory',
+         output=None,
+         **kwargs):
+    """Run POCS with simulated hardware for a night and report on its performance.
+
+    See argparse help string below for details about parameters.
+    """
+    start = Time(start)
+    end = start + hours * u.hour
+    os.environ['POCSTIME'] = start.isot
+
+    simulator = hardware.get_all_names(without=[] if dome else ['dome'])
+    config = load_config(simulator=simulator)
+    # The cameras, observatory and POCS should share a database, and so metrics.
+    config['db']['type'] = db_type
+    config['cameras']['devices'] = [{'model': 'simulator'} for _ in range(cameras)]
+    if dome:
+        config['dome'] = {'brand': 'Simulacrum', 'driver': 'simulator'}
+    if fields_file is not None:
+        config['scheduler']['fields_file'] = fields_file
+    if pointing_images is not None:
+        config['pointing']['max_iterations'] = pointing_images
+
+    observatory = Observatory(config=config, simulator=simulator, db_type=db_type)
+    # Created after the observatory so that they use the same (runtime) config.
+    for cam_name, camera in create_cameras_from_config(config).items():
+        observatory.add_camera(cam_name, camera)
+    pocs = POCS(observatory, config=config, simulator=simulator, db_type=db_type)
+    pocs.initialize()
+
+    memory = list()
+    done = threading.Event()
+    clock = threading.Thread(target=run_clock,
+                             args=(pocs, start, end, speedup, memory, done),
+                             name='SimulatedClock',
+                             daemon=True)
+
+    real_start = time.time()
+    cpu_start = time.process_time()
+    clock.start()
+    try:
+        pocs.run(exit_when_done=True)
+    finally:
+        done.set()
+        real_elapsed = time.time() - real_start
+        cpu_elapsed = time.process_time() - cpu_start
+        sim_elapsed = (Time(os.environ['POCSTIME']) - start).to(u.hour).value
+        memory.append((real_elapsed, get_rss()))
+        clock.join()
+        pocs.power_down()
+
+    timings = get_metrics(pocs.db).duty_cycle_report(start=real_start)
+    frames = sum(1 for r in get_metrics(pocs.db).records(start=real_start, kind='camera')
+                 if r['name'] == 'exposure')
+
+    report = {
+        'cameras': cameras,
+        'fields_file': config['scheduler'].get('fields_file'),
+        'speedup': speedup,
+        'real_seconds': real_elapsed,
+        'simulated_hours': sim_elapsed,
+        'cpu_seconds': cpu_elapsed,
+        'cpu_fraction': cpu_elapsed / real_elapsed,
+        'frames': frames,
+        'frames_per_hour': frames / sim_elapsed if sim_elapsed > 0 else 0.,
+        'frames_per_real_hour': frames / real_elapsed * 3600,
+        'duty_cycle': timings['duty_cycle'],
+        'memory_mb': memory,
+        'memory_growth_mb': memory[-1][1] - memory[0][1],
+        'states': timings.get('states', {}),
+        'methods': timings.get('methods', {}),
+    }
+
+    print("{simulated_hours:.1f} simulated hours in {real_seconds:.0f} s with {cameras} camera(s)"
+          .format(**report))
+    print("Frames: {frames} ({frames_per_hour:.1f} per simulated hour, "
+          "{frames_per_real_hour:.0f} per real hour)".format(**report))
+    print("CPU: {cpu_seconds:.1f} s ({cpu_fraction:.1%})".format(**report))
+    print("Memory: {:.1f} MB to {:.1f} MB ({:+.1f} MB)".format(
+        memory[0][1], memory[-1][1], report['memory_growth_mb']))
+    print("Duty cycle: {duty_cycle:.1%}".format(**report))
+    for name, summary in sorted(report['states'].items(), key=lambda item: -item[1]['total']):
+        print("    {:<15s} {:5d} x mean {:7.3f} s, median {:7.3f} s, max {:7.3f} s".format(
+            name, summary['count'], summary['mean'], summary['p50'], summary['max']))
+
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=4, sort_keys=True)
+
+    return report
+
+
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark POCS over an accelerated night with simulated hardware")
+    parser.add_argument('--start', default='2016-09-09 06:00:00',
+                        help='UTC time the night starts at, default 2016-09-09 06:00:00.')
+    parser.add_argument('--hours', default=10., type=float,
+                        help='Length of the night in hours, default 10.')
+    parser.add_argument('--speedup', default=60., type=float,
+                        help='Simulated seconds per real second, default 60.')
+    parser.add_argument('--cameras', default=1, type=int,
+                        help='Number of simulated cameras, default 1.')
+    parser.add_argument('--fields_file', default=None,
+                        help='Targets file, relative to the targets directory, default from config.')
+    parser.add_argument('--pointing_images', default=None, type=int,
+                        help='Maximum pointing images per target, default from config. '
+                        'Use 0 to skip plate solving when astrometry is not installed.')
+    parser.add_argument('--dome', action='store_true', default=False,
+                        help='Also simulate a dome.')
+    parser.add_argument('--db_type', default='memory', choices=['memory', 'file', 'mongo'],
+                        help='Type of database, default memory.')
+    parser.add_argument('--output', default=None,
+                        help='Write the report to this JSON file.')
+
+    args = parser.parse_args()
+    main(**vars(args))
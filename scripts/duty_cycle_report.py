@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+import os
+
+from pocs.utils import serializers
+from pocs.utils.config import load_config
+from pocs.utils.metrics import nightly_reports
+
+
+def main(db_name='panoptes', night=None, verbose=False, **kwargs):
+    """Print the duty cycle for each night from the timings in a file database.
+
+    See argparse help string below for details about parameters.
+    """
+    config = load_config()
+    metrics_file = os.path.join(os.environ['PANDIR'], 'json_store', db_name, 'metrics.json')
+
+    records = list()
+    with open(metrics_file) as f:
+        for line in f:
+            records.append(serializers.loads(line)['data'])
+
+    reports = nightly_reports(records, utc_offset=config['location'].get('utc_offset', 0))
+    for report_night, report in reports.items():
+        if night and report_night != night:
+            continue
+
+        print("{}: {:.1f} hours, observing {:.1%}, exposing {:.1%}".format(
+            report_night, report['elapsed'] / 3600, report['duty_cycle'], report['exposing']))
+
+        for kind in ('states', 'methods', 'cameras'):
+            if not verbose and kind != 'states':
+                continue
+            for name, summary in sorted(report.get(kind, {}).items(),
+                                        key=lambda item: -item[1]['total']):
+                print("    {:<30s} {:6d} x {:8.2f} s = {:8.0f} s {:6.1%}".format(
+                    name, summary['count'], summary['mean'], summary['total'],
+                    summary['fraction']))
+
+    return reports
+
+
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Duty cycle report from the metrics collection")
+    parser.add_argument('--db_name', default='panoptes',
+                        help='Name of the file database, default panoptes.')
+    parser.add_argument('--night', default=None,
+                        help='Only report on the night starting on this date (YYYY-MM-DD).')
+    parser.add_argument('--verbose', action='store_true', default=False,
+                        help='Also report the Observatory method and camera timings.')
+
+    args = parser.parse_args()
+    main(**vars(args))